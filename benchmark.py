@@ -0,0 +1,319 @@
+# 헤드리스 성능 벤치마크
+# 실제 Supabase 프로젝트와 창 없이 fake_supabase의 가짜 백엔드로 CalendarLayout을 띄워서
+# 시작, load_all_events, update_calendar, 달 배치 계산, 달 이동, submit_event, 새로고침 시간을 일정 개수별로 잰다.
+# 결과는 JSON으로 남기고, 기준 결과(--baseline)보다 느려진 항목이 있으면 종료 코드 1로 끝난다.
+# 시간은 컴퓨터마다 다르므로 기준 결과는 저장소에 넣지 않고, 비교할 컴퓨터에서 변경 전 코드로 직접 만든다.
+#
+# 사용법:
+#   python benchmark.py                                   # 100 / 10000 / 100000개, 지연 0ms
+#   python benchmark.py --sizes 100 10000 --latency 30 --output results.json
+#   python benchmark.py --output bench_baseline.json      # 변경 전 코드에서 이 컴퓨터의 기준 결과를 만듦
+#   python benchmark.py --baseline bench_baseline.json --threshold 0.2   # 변경 후 같은 컴퓨터에서 비교
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Kivy는 import 시점에 환경 변수를 읽으므로 먼저 설정 (창을 띄우지 않음)
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")  # dummy 드라이버는 OpenGL 컨텍스트를 만들지 못함
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+from kivy.resources import resource_add_path, resource_find  # noqa: E402
+
+import fake_supabase  # noqa: E402
+import instrumentation  # noqa: E402
+import local_cache  # noqa: E402
+import main  # noqa: E402
+import month_layout  # noqa: E402
+from cell_text import CELL_FONT_NAME  # noqa: E402
+
+DEFAULT_SIZES = (100, 10000, 100000)  # 벤치마크할 전체 일정 개수
+DEFAULT_RUNS = 10  # 항목별 반복 횟수
+DEFAULT_OUTPUT = "benchmark_results.json"  # 결과 JSON 기본 저장 경로 (앱의 print 출력과 섞이지 않게 파일로 저장)
+DEFAULT_THRESHOLD = 0.2  # 기준보다 20% 넘게 느려지면 회귀로 판단
+MIN_REGRESSION_MS = 1.0  # 이보다 작은 차이는 측정 오차로 보고 무시
+SETTLE_TIMEOUT = 30  # 백그라운드 작업이 끝나기를 기다리는 최대 시간(초)
+BENCH_USER = "bench"
+FALLBACK_FONT = "data/fonts/Roboto-Regular.ttf"  # 한글 글꼴 파일이 없을 때 쓸 Kivy 기본 글꼴
+
+
+def drain(until=None, timeout=SETTLE_TIMEOUT):
+    """Clock을 직접 돌려서 백그라운드 결과 콜백을 처리 (until이 참이 될 때까지)"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        Clock.tick()
+        if until is None or until():
+            return
+        if time.perf_counter() > deadline:
+            raise TimeoutError("백그라운드 작업이 제한 시간 안에 끝나지 않았습니다.")
+        time.sleep(0.001)
+
+
+def settled(layout):
+    """화면에 필요한 달을 모두 받아왔고 백그라운드 조회가 없는 상태인지"""
+    return set(layout.visible_months()) <= layout.loaded_months and not layout.pending_months
+
+
+def timed_ms(func):
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def summarize(scenario, size, samples):
+    ordered = sorted(samples)
+    return {
+        'scenario': scenario,
+        'events': size,
+        'runs': len(samples),
+        'median_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+class BenchmarkRun:
+    """임시 폴더(로그인 정보/로컬 캐시)와 가짜 백엔드를 준비하고 일정 개수 하나에 대해 측정"""
+
+    def __init__(self, size, latency, runs):
+        self.size = size
+        self.runs = runs
+        self.workdir = tempfile.mkdtemp(prefix="calendar_bench_")
+        self.fake = fake_supabase.FakeSupabase(latency=latency)
+        self.fake.add_user(BENCH_USER, global_color="#B3B3B3FF")
+        # 오늘을 가운데 두고 하루에 하나씩 채움 (schedule_day가 기본 키라 날짜당 한 행)
+        first_day = (datetime.now() - timedelta(days=size // 2)).strftime('%Y-%m-%d')
+        self.fake.seed_events(size, first_day)
+        self.layouts = []
+        self.results = []
+
+    def __enter__(self):
+        self.previous_dir = os.getcwd()
+        os.chdir(self.workdir)  # LOGIN_FILE, CACHE_FILE이 상대 경로라 임시 폴더에 만들어지게 함
+        with open(main.LOGIN_FILE, "w") as f:
+            json.dump({"username": BENCH_USER, "last_login": datetime.now().isoformat()}, f)
+        fake_supabase.install(self.fake)
+        instrumentation.metrics.reset()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:  # 측정 중 오류가 났으면 대기하지 않고 원래 오류를 그대로 전달
+            drain(lambda: not any(layout.outbox_flushing for layout in self.layouts), timeout=SETTLE_TIMEOUT)
+        for layout in self.layouts:
+            layout.outbox.close()
+            layout.local_cache.close()
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def record(self, scenario, samples):
+        result = summarize(scenario, self.size, samples)
+        self.results.append(result)
+        logging.warning(f"{scenario:>22} | {self.size:>7}개 | 중간값 {result['median_ms']:9.2f}ms | "
+                        f"p95 {result['p95_ms']:9.2f}ms")
+
+    def new_layout(self):
+        layout = main.CalendarLayout()
+        self.layouts.append(layout)
+        return layout
+
+    def bench_startup(self):
+        """캐시 없이 시작(첫 화면/서버 데이터 반영)과 캐시가 있을 때 첫 화면까지의 시간"""
+        first_paint, ready = [], []
+        for _ in range(min(self.runs, 3)):
+            if os.path.exists(local_cache.CACHE_FILE):
+                for layout in self.layouts:
+                    layout.outbox.close()
+                    layout.local_cache.close()
+                self.layouts = []
+                os.remove(local_cache.CACHE_FILE)
+            started = time.perf_counter()
+            layout = self.new_layout()
+            first_paint.append((time.perf_counter() - started) * 1000)
+            drain(lambda: settled(layout))
+            ready.append((time.perf_counter() - started) * 1000)
+        self.record('startup_cold_first_paint', first_paint)
+        self.record('startup_cold_ready', ready)
+        self.record('startup_warm_first_paint', [timed_ms(self.new_layout) for _ in range(min(self.runs, 3))])
+        drain(lambda: all(settled(layout) for layout in self.layouts))
+        return self.layouts[-1]
+
+    def bench_load_all_events(self, layout):
+        samples = []
+        for _ in range(self.runs):
+            samples.append(timed_ms(layout.load_all_events))
+            drain(lambda: settled(layout))
+        self.record('load_all_events', samples)
+
+        # 전체 테이블을 한 번에 불러오는 경우 (RANGE_LOADING = False)
+        range_loading, main.RANGE_LOADING = main.RANGE_LOADING, False
+        try:
+            self.record('load_all_events_full', [timed_ms(layout.load_all_events) for _ in range(min(self.runs, 3))])
+        finally:
+            main.RANGE_LOADING = range_loading
+        layout.load_all_events()
+        drain(lambda: settled(layout))
+
+    def bench_update_calendar(self, layout):
+        self.record('update_calendar', [timed_ms(layout.update_calendar) for _ in range(self.runs)])
+
+    def bench_month_layout(self):
+        """6x7 달 배치 계산 (20년치를 처음 계산할 때와 캐시에서 꺼낼 때)"""
+        months = [(year, month) for year in range(2000, 2020) for month in range(1, 13)]
+
+        def all_months():
+            for year, month in months:
+                month_layout.month_layout(year, month)
+
+        cold = []
+        for _ in range(self.runs):
+            month_layout.month_layout.cache_clear()
+            cold.append(timed_ms(all_months))
+        self.record('month_layout_cold', cold)
+        self.record('month_layout_cached', [timed_ms(all_months) for _ in range(self.runs)])
+
+    def bench_navigation(self, layout):
+        """달 이동 (화면이 바뀌기까지의 시간과 백그라운드 조회까지 끝나는 시간)"""
+        flip, settled_samples = [], []
+        for step in [layout.go_to_next_month] * self.runs + [layout.go_to_previous_month] * self.runs:
+            started = time.perf_counter()
+            step()
+            flip.append((time.perf_counter() - started) * 1000)
+            drain(lambda: settled(layout))
+            settled_samples.append((time.perf_counter() - started) * 1000)
+        self.record('navigate_month', flip)
+        self.record('navigate_month_settled', settled_samples)
+
+    def bench_submit_event(self, layout):
+        """일정 저장 (화면 반영까지)과 대기열을 서버로 보내는 시간"""
+        samples = []
+        for index in range(self.runs):
+            popup = main.EventPopup()
+            popup.selected_date = f"{layout.year}-{layout.month:02}-{index % 28 + 1:02}"
+            popup.set_parent_layout(layout)
+            samples.append(timed_ms(lambda: popup.submit_event(f"벤치마크 {index}")))
+        self.record('submit_event', samples)
+        drain(lambda: not layout.outbox_flushing)
+        self.record('outbox_flush', [timed_ms(layout.outbox.flush)])
+
+    def bench_refresh(self, layout):
+        """다른 사용자가 바꾼 일정을 새로고침으로 받아 화면에 반영하기까지의 시간"""
+        samples = []
+        for index in range(self.runs):
+            day = f"{layout.year}-{layout.month:02}-{index % 28 + 1:02}"
+            value = f"다른 사용자 수정 {index}"
+            self.fake.edit_events([day], value)
+            started = time.perf_counter()
+            layout.refresh_calendar()
+            drain(lambda: any(event.get('schedule_value') == value for event in layout.event_index.events_for_day(day)))
+            samples.append((time.perf_counter() - started) * 1000)
+        self.record('refresh_calendar', samples)
+
+    def run(self):
+        layout = self.bench_startup()
+        self.bench_load_all_events(layout)
+        self.bench_update_calendar(layout)
+        self.bench_month_layout()
+        self.bench_navigation(layout)
+        self.bench_submit_event(layout)
+        self.bench_refresh(layout)
+        metrics = instrumentation.metrics.snapshot()
+        return {
+            'events': self.size,
+            'results': self.results,
+            'round_trips': metrics['counters'].get('supabase.round_trips', 0),
+            'backend_requests': self.fake.request_count,
+            'spans': metrics['spans'],
+        }
+
+
+def compare(results, baseline, threshold):
+    """기준 결과보다 중간값이 threshold 비율 넘게 느려진 항목 목록"""
+    base = {(row['scenario'], row['events']): row for row in baseline.get('results', [])}
+    regressions = []
+    for row in results:
+        old = base.get((row['scenario'], row['events']))
+        if old is None:
+            continue
+        slower = row['median_ms'] - old['median_ms']
+        if slower > MIN_REGRESSION_MS and row['median_ms'] > old['median_ms'] * (1 + threshold):
+            regressions.append({
+                'scenario': row['scenario'], 'events': row['events'],
+                'baseline_ms': old['median_ms'], 'current_ms': row['median_ms'],
+            })
+    return regressions
+
+
+def main_entry(argv=None):
+    parser = argparse.ArgumentParser(description="달력 앱 헤드리스 성능 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="전체 일정 개수")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 더할 지연 시간(ms)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="항목별 반복 횟수")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="결과 JSON 저장 경로 ('-'면 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 판단할 느려진 비율")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)  # 앱의 INFO 로그는 측정에서 제외
+    resource_add_path(REPO_DIR)  # 글꼴/이미지 경로
+    if resource_find(CELL_FONT_NAME) is None:
+        # 글꼴 파일은 저장소에 들어 있지 않으므로, 없으면 기본 글꼴로 측정 (글자 텍스처 시간은 조금 달라질 수 있음)
+        logging.warning(f"{CELL_FONT_NAME}을 찾지 못해 기본 글꼴로 측정합니다.")
+        LabelBase.register(CELL_FONT_NAME, resource_find(FALLBACK_FONT))
+    Builder.load_file(os.path.join(REPO_DIR, "calendar.kv"))
+
+    runs = []
+    for size in args.sizes:
+        with BenchmarkRun(size, args.latency / 1000, args.runs) as bench:
+            runs.append(bench.run())
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency_ms': args.latency,
+        'runs': args.runs,
+        'results': [row for run in runs for row in run['results']],
+        'sizes': runs,
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get('platform'), baseline.get('python'), baseline.get('latency_ms')) != (
+                report['platform'], report['python'], report['latency_ms']):
+            logging.warning("기준 결과와 플랫폼/파이썬/지연 설정이 달라 비교 결과를 믿기 어렵습니다. "
+                            "같은 컴퓨터에서 기준 결과를 다시 만드세요.")
+        report['regressions'] = compare(report['results'], baseline, args.threshold)
+        for row in report['regressions']:
+            logging.warning(f"성능 회귀: {row['scenario']} ({row['events']}개) "
+                            f"{row['baseline_ms']:.2f}ms -> {row['current_ms']:.2f}ms")
+        exit_code = 1 if report['regressions'] else 0
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        logging.warning(f"벤치마크 결과 저장: {args.output}")
+    main.data_worker.shutdown()
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main_entry())
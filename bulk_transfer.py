@@ -0,0 +1,213 @@
+# 일정 일괄 내보내기/가져오기 (CSV, iCalendar)
+# 내보내기는 키셋 페이지네이션으로 필요한 컬럼만 한 페이지씩 받아 파일에 바로 쓰고,
+# 가져오기는 파일을 한 줄씩 읽어 청크 단위 upsert를 여러 스레드로 동시에 보낸다.
+# 어느 쪽이든 메모리에는 몇 개의 페이지/청크만 올라가므로 10만 건도 수 초 안에 옮길 수 있다.
+#
+# 사용법:
+#   python bulk_transfer.py export backup.csv
+#   python bulk_transfer.py export backup.ics
+#   python bulk_transfer.py import backup.csv
+import argparse
+import csv
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+import supabase_helper
+from event_index import day_key
+
+EXPORT_PAGE_SIZE = 1000  # 내보낼 때 한 번에 받는 행 수
+IMPORT_BATCH_SIZE = 500  # 가져올 때 upsert 한 번에 보내는 행 수
+IMPORT_WORKERS = 4  # 동시에 보내는 upsert 요청 수
+CSV_FIELDS = ["schedule_day", "schedule_value", "btn_color"]
+EXPORT_COLUMNS = ",".join(CSV_FIELDS)  # 내보낼 때 받는 컬럼 (id는 파일에 쓰지 않으므로 받지 않음)
+ICS_PRODID = "-//minsik calendar//bulk_transfer//KO"
+ICS_LINE_LIMIT = 75  # iCalendar 한 줄 최대 길이(바이트), 넘으면 접어서 씀
+
+
+def _format_of(path, fmt=None):
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in ('csv', 'ics'):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (csv 또는 ics)")
+    return fmt
+
+
+# iCalendar
+def _ics_escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _ics_unescape(text):
+    result, index = [], 0
+    while index < len(text):
+        char = text[index]
+        if char == '\\' and index + 1 < len(text):
+            index += 1
+            char = '\n' if text[index] in 'nN' else text[index]
+        result.append(char)
+        index += 1
+    return ''.join(result)
+
+
+def _ics_fold(line):
+    """75바이트가 넘는 줄을 여러 줄로 접음 (이어지는 줄은 공백으로 시작, UTF-8 글자 중간에서 자르지 않음)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= ICS_LINE_LIMIT:
+        return line + "\r\n"
+    parts, start, limit = [], 0, ICS_LINE_LIMIT
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1  # 다음 바이트가 글자의 중간이면 글자 시작까지 물러남
+        parts.append(encoded[start:end].decode('utf-8'))
+        start, limit = end, ICS_LINE_LIMIT - 1  # 이어지는 줄은 앞의 공백 한 칸 포함
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_event(row):
+    day = day_key(row['schedule_day'])
+    compact = day.replace('-', '')
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{day}@minsik-calendar",
+        f"DTSTAMP:{compact}T000000Z",
+        f"DTSTART;VALUE=DATE:{compact}",
+        f"SUMMARY:{_ics_escape(row.get('schedule_value') or '')}",
+    ]
+    if row.get('btn_color'):
+        lines.append(f"X-BTN-COLOR:{_ics_escape(row['btn_color'])}")
+    lines.append("END:VEVENT")
+    return ''.join(_ics_fold(line) for line in lines)
+
+
+def _read_ics(file):
+    """VEVENT를 하나씩 일정 행으로 변환 (접힌 줄은 이어 붙임)"""
+    row, previous = None, None
+
+    def unfolded():
+        nonlocal previous
+        for raw in file:
+            raw = raw.rstrip('\r\n')
+            if raw[:1] in (' ', '\t') and previous is not None:
+                previous += raw[1:]
+                continue
+            if previous is not None:
+                yield previous
+            previous = raw
+        if previous is not None:
+            yield previous
+
+    for line in unfolded():
+        name, _, value = line.partition(':')
+        name = name.split(';', 1)[0].upper()
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            row = {'schedule_day': None, 'schedule_value': '', 'btn_color': None}
+        elif row is None:
+            continue
+        elif name == 'DTSTART':
+            date = value[:8]
+            row['schedule_day'] = f"{date[:4]}-{date[4:6]}-{date[6:8]}"
+        elif name == 'SUMMARY':
+            row['schedule_value'] = _ics_unescape(value)
+        elif name == 'X-BTN-COLOR':
+            row['btn_color'] = _ics_unescape(value) or None
+        elif name == 'END' and value.upper() == 'VEVENT':
+            if row['schedule_day']:
+                yield row
+            row = None
+
+
+# CSV
+def _read_csv(file):
+    for record in csv.DictReader(file):
+        if record.get('schedule_day'):
+            yield {
+                'schedule_day': day_key(record['schedule_day']),
+                'schedule_value': record.get('schedule_value') or '',
+                'btn_color': record.get('btn_color') or None,
+            }
+
+
+def read_events(path, fmt=None):
+    """파일의 일정을 한 행씩 반환 (파일 전체를 메모리에 올리지 않음)"""
+    fmt = _format_of(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        yield from (_read_csv(file) if fmt == 'csv' else _read_ics(file))
+
+
+@instrumentation.timed('bulk.export')
+def export_events(path, supabase_client=None, fmt=None, page_size=EXPORT_PAGE_SIZE):
+    """전체 일정을 CSV/ICS 파일로 내보내고 내보낸 건수를 반환"""
+    fmt = _format_of(path, fmt)
+    supabase_client = supabase_client or supabase_helper.create_supabase_client()
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if fmt == 'csv':
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+        else:
+            file.write(f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\n")
+        for page in supabase_helper.iter_calendar_pages(supabase_client, page_size, EXPORT_COLUMNS):
+            if fmt == 'csv':
+                writer.writerows(page)
+            else:
+                file.writelines(_ics_event(row) for row in page)
+            count += len(page)
+            logging.info(f"{count}건 내보냄")
+        if fmt == 'ics':
+            file.write("END:VCALENDAR\r\n")
+    return count
+
+
+@instrumentation.timed('bulk.import')
+def import_events(path, supabase_client=None, fmt=None, batch_size=IMPORT_BATCH_SIZE, workers=IMPORT_WORKERS):
+    """CSV/ICS 파일의 일정을 청크 단위 upsert로 가져오고 저장한 건수를 반환 (실패한 청크가 있으면 예외)"""
+    supabase_client = supabase_client or supabase_helper.create_supabase_client()
+    in_flight = threading.BoundedSemaphore(workers * 2)  # 동시에 메모리에 두는 청크 수 제한
+    futures = []
+
+    def send(batch):
+        try:
+            return supabase_helper.bulk_upsert_events(batch, supabase_client)
+        finally:
+            in_flight.release()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk_import") as executor:
+        batch = {}
+        for row in read_events(path, fmt):
+            batch[row['schedule_day']] = row  # 같은 청크 안에 같은 날짜가 두 번 있으면 upsert가 실패하므로 마지막 것만
+            if len(batch) >= batch_size:
+                in_flight.acquire()
+                futures.append(executor.submit(send, list(batch.values())))
+                batch = {}
+        if batch:
+            in_flight.acquire()
+            futures.append(executor.submit(send, list(batch.values())))
+
+    count = sum(future.result() for future in futures)
+    logging.info(f"{count}건 가져옴")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="일정 일괄 내보내기/가져오기 (CSV, iCalendar)")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="파일 경로 (.csv 또는 .ics)")
+    parser.add_argument("--format", choices=["csv", "ics"], help="확장자와 다른 형식을 쓸 때 지정")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "export":
+        count = export_events(args.path, fmt=args.format)
+    else:
+        count = import_events(args.path, fmt=args.format, batch_size=args.batch_size, workers=args.workers)
+    print(f"{args.command}: {count}건 완료")
+
+
+if __name__ == '__main__':
+    main()
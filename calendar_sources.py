@@ -0,0 +1,81 @@
+# 여러 달력 겹쳐 보기
+# 내 달력(supabase_helper.CALENDAR_TABLE) 외에 calendars.json에 적은 다른 사람의 달력 테이블을
+# 읽기 전용으로 함께 불러와서 날짜 칸에 달력별 색 표시와 글자로 겹쳐 그린다.
+# 달력마다 따로 백그라운드 작업으로 동시에 받아오므로, 달력을 늘려도 가장 느린 달력만큼만 걸린다.
+#
+# calendars.json 예:
+#   [{"name": "지수", "table": "jisu_calender", "color": "#4A90E2FF"}]
+import json
+import os
+from collections import namedtuple
+
+import color_codec
+from event_index import EventIndex
+
+SOURCES_FILE = "calendars.json"  # 겹쳐 볼 달력 목록 (없으면 내 달력만 표시)
+DEFAULT_SOURCE_COLOR = "#4A90E2FF"  # 색을 적지 않은 달력의 표시 색
+
+# 겹쳐 볼 달력 하나: 화면에 표시할 이름, Supabase 테이블 이름, 표시 색(RGBA 튜플)
+CalendarSource = namedtuple('CalendarSource', ['name', 'table', 'color'])
+
+
+def load_sources(path=SOURCES_FILE):
+    """calendars.json에서 겹쳐 볼 달력 목록을 읽음 (파일이 없거나 잘못됐으면 빈 목록)"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return [CalendarSource(entry['name'], entry['table'],
+                               tuple(color_codec.decode_color(entry.get('color') or DEFAULT_SOURCE_COLOR)))
+                for entry in entries]
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"달력 목록 파일을 읽지 못해 내 달력만 표시합니다: {e}")
+        return []
+
+
+class OverlayIndex:
+    """겹쳐 볼 달력별 일정 인덱스와 달력별로 불러온/불러오는 중인 달"""
+
+    def __init__(self, sources):
+        self.sources = list(sources)
+        self.indexes = {source.name: EventIndex() for source in self.sources}
+        self.loaded_months = {source.name: set() for source in self.sources}
+        self.pending_months = {source.name: set() for source in self.sources}
+        self.listener = None  # 일정이 바뀌면 listener(days, months) 호출 (EventIndex와 같은 형식)
+        for index in self.indexes.values():
+            index.listener = self._notify
+
+    def __bool__(self):
+        return bool(self.sources)
+
+    def _notify(self, days, months):
+        if self.listener is not None:
+            self.listener(days, months)
+
+    def missing_months(self, source, months):
+        """아직 불러오지 않았고 불러오는 중도 아닌 달"""
+        return [month for month in months
+                if month not in self.loaded_months[source.name] and month not in self.pending_months[source.name]]
+
+    def mark_pending(self, source, months):
+        self.pending_months[source.name].update(months)
+
+    def store_months(self, source, months, rows):
+        """달력 하나에서 받은 달의 일정으로 교체 (rows가 None이면 실패로 보고 다음에 다시 요청)"""
+        self.pending_months[source.name].difference_update(months)
+        if rows is None:
+            return
+        self.indexes[source.name].replace_months(months, rows)
+        self.loaded_months[source.name].update(months)
+
+    def reset(self):
+        """새로고침 시 불러온 달 기록을 지움 (인덱스는 새 결과가 올 때까지 그대로 표시)"""
+        for source in self.sources:
+            self.loaded_months[source.name] = set()
+            self.pending_months[source.name] = set()
+
+    def events_for_day(self, schedule_day):
+        """해당 날짜의 겹쳐 볼 일정 [(달력, 일정), ...] (달력 목록 순서대로)"""
+        return [(source, event) for source in self.sources
+                for event in self.indexes[source.name].events_for_day(schedule_day)]
@@ -0,0 +1,40 @@
+# 날짜 칸 글자 텍스처 캐시
+# 날짜 칸마다 Label이 글자를 따로 렌더링하지 않도록, (글자, 칸 크기, 글자색)별로 만든 텍스처를 재사용한다.
+# 달을 넘겨도 '1'~'31' 같은 글자는 그대로 재사용되고, 창 크기를 바꿨다 되돌려도 다시 렌더링하지 않는다.
+from collections import OrderedDict
+
+from kivy.core.text import Label as CoreLabel
+
+import instrumentation
+
+TEXT_TEXTURE_CACHE_SIZE = 512  # 보관할 최대 텍스처 수 (오래 안 쓴 것부터 버림)
+CELL_FONT_NAME = "NanumGothic.ttf"
+CELL_FONT_SIZE = 18
+CELL_PADDING = 10  # 칸 가장자리와 글자 사이 간격
+
+_textures = OrderedDict()
+
+
+def text_texture(text, width, height, color):
+    """칸 크기(width, height) 안에 왼쪽 위 정렬로 그린 글자 텍스처 (패딩 제외 영역 기준)"""
+    key = (text, int(width), int(height), tuple(color))
+    texture = _textures.get(key)
+    if texture is not None:
+        _textures.move_to_end(key)
+        instrumentation.count('cell_text.hits')
+        return texture
+    instrumentation.count('cell_text.misses')
+    label = CoreLabel(text=text, font_name=CELL_FONT_NAME, font_size=CELL_FONT_SIZE,
+                      text_size=(max(int(width), 1), max(int(height), 1)),
+                      halign='left', valign='top', color=tuple(color))
+    label.refresh()
+    texture = label.texture
+    _textures[key] = texture
+    while len(_textures) > TEXT_TEXTURE_CACHE_SIZE:
+        _textures.popitem(last=False)
+    return texture
+
+
+def clear():
+    """캐시된 텍스처를 모두 버림 (글꼴을 바꿨을 때 등)"""
+    _textures.clear()
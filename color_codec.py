@@ -0,0 +1,81 @@
+# 색상 코덱
+# btn_color / global_color를 '#RRGGBBAA' 16진수 문자열로 저장하고,
+# 예전 형식('(0.1, 0.2, 0.3, 1)' 같은 파이썬 repr 문자열)도 그대로 읽는다.
+# 파싱 결과와 칸 렌더링에 필요한 파생 색상은 메모이즈해서 매 렌더링마다 다시 계산하지 않는다.
+import ast
+from collections import namedtuple
+from functools import lru_cache
+
+DEFAULT_COLOR = (1, 1, 1, 1)  # 변환 실패 시 기본 흰색
+DIM_FACTOR = 0.7  # 이전/다음 달 칸에 쓰는 어두운 색 비율
+
+# 칸 하나를 그리는 데 필요한 색상 묶음
+ColorStyle = namedtuple('ColorStyle', ['background', 'text_color', 'dimmed', 'dimmed_text_color', 'border'])
+
+
+def _clamp(value):
+    return min(max(float(value), 0.0), 1.0)
+
+
+def encode_color(rgba):
+    """(r, g, b[, a]) 0~1 실수를 '#RRGGBBAA' 문자열로 변환"""
+    channels = list(rgba)[:4]
+    if len(channels) == 3:
+        channels.append(1)
+    return '#' + ''.join(f"{round(_clamp(c) * 255):02X}" for c in channels)
+
+
+@lru_cache(maxsize=1024)
+def _decode_text(text):
+    text = text.strip()
+    if text.startswith('#') and len(text) in (7, 9):
+        try:
+            channels = [int(text[i:i + 2], 16) / 255 for i in range(1, len(text), 2)]
+        except ValueError:
+            return DEFAULT_COLOR
+        if len(channels) == 3:
+            channels.append(1.0)
+        return tuple(channels)
+    # 예전 형식: 파이썬 repr 문자열
+    try:
+        value = ast.literal_eval(text)  # 문자열을 tuple로 변환
+    except (ValueError, SyntaxError):
+        return DEFAULT_COLOR
+    if isinstance(value, (list, tuple)) and len(value) in (3, 4):
+        return tuple(value) if len(value) == 4 else tuple(value) + (1,)
+    return DEFAULT_COLOR
+
+
+def decode_color(value):
+    """저장된 색상 값(16진수/예전 repr 문자열/리스트)을 (r, g, b, a) 튜플로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return tuple(value)  # 로컬에서 반영한 색상은 이미 리스트 형태
+    return _decode_text(str(value))
+
+
+def brightness(color):
+    """RGB 색상을 기반으로 밝기를 계산"""
+    r, g, b = color[:3]
+    return 0.299 * r + 0.587 * g + 0.114 * b
+
+
+def text_color_for(color):
+    """배경색의 밝기에 따라 글자 색상 결정"""
+    return (0, 0, 0, 1) if brightness(color) > 0.5 else (1, 1, 1, 1)  # 밝으면 검정, 어두우면 흰색
+
+
+@lru_cache(maxsize=256)
+def _style(rgba):
+    dimmed = tuple(c * DIM_FACTOR for c in rgba)
+    border = tuple(1 - c for c in rgba[:3]) + (rgba[3],)  # RGB 각 색상의 정반대 색상
+    return ColorStyle(rgba, text_color_for(rgba), dimmed, text_color_for(dimmed), border)
+
+
+def color_style(color):
+    """배경색에 대한 글자색/어두운 색/테두리 색을 한 번만 계산해서 재사용"""
+    rgba = tuple(color)
+    if len(rgba) == 3:
+        rgba += (1,)
+    return _style(rgba)
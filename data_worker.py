@@ -0,0 +1,36 @@
+# 백그라운드 데이터 작업
+# Supabase 호출처럼 오래 걸리는 작업을 작업 스레드 풀에서 실행하고,
+# 결과는 Clock으로 메인(UI) 스레드에 넘겨서 화면이 네트워크를 기다리지 않게 한다.
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+
+MAX_WORKERS = 4  # 동시에 실행할 네트워크 작업 수
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="supabase")
+
+
+def run_in_background(func, *args, on_success=None, on_error=None, **kwargs):
+    """func(*args, **kwargs)를 작업 스레드에서 실행하고, 결과나 오류 콜백은 메인 스레드에서 호출"""
+    future = _executor.submit(func, *args, **kwargs)
+
+    def done(finished):
+        try:
+            result = finished.result()
+        except Exception as e:
+            if on_error is not None:
+                Clock.schedule_once(lambda dt, e=e: on_error(e))  # except 블록이 끝나면 e가 지워지므로 바로 묶어 둠
+            else:
+                logging.error(f"백그라운드 작업 중 오류 발생: {e}")
+            return
+        if on_success is not None:
+            Clock.schedule_once(lambda dt: on_success(result))
+
+    future.add_done_callback(done)
+    return future
+
+
+def shutdown():
+    """앱 종료 시 대기 중인 작업은 버리고 스레드 풀 정리"""
+    _executor.shutdown(wait=False, cancel_futures=True)
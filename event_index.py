@@ -0,0 +1,175 @@
+# 날짜별 일정 인덱스
+# CalendarLayout이 매 렌더링마다 전체 일정을 선형 탐색하지 않도록
+# 일정을 'YYYY-MM-DD' 키로 묶고, 다시 (연도, 월) 단위로 버킷팅해서 보관한다.
+# 일정은 서버 행(dict)을 그대로 들고 있지 않고 필요한 컬럼만 담은 EventRecord로 바꿔서 보관한다.
+import sys
+
+import instrumentation
+
+_colors = {}  # btn_color 문자열 -> 공유하는 문자열 객체 (같은 색을 쓰는 일정이 문자열 하나를 함께 씀)
+
+
+def day_key(schedule_day):
+    """schedule_day 값(날짜 또는 타임스탬프 문자열)을 'YYYY-MM-DD' 키로 변환"""
+    return str(schedule_day)[:10]
+
+
+def month_of(day):
+    """'YYYY-MM-DD' 키에서 (연도, 월) 튜플을 추출 (strptime 없이 슬라이싱)"""
+    return int(day[:4]), int(day[5:7])
+
+
+def shift_month(year, month, offset):
+    """(연도, 월)에서 offset개월 이동한 (연도, 월) 반환"""
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+
+def month_start(year, month):
+    """해당 월 1일의 'YYYY-MM-DD' 문자열"""
+    return f"{year}-{month:02}-01"
+
+
+def _shared_color(btn_color):
+    if not btn_color:
+        return None
+    return _colors.setdefault(btn_color, btn_color)
+
+
+class EventRecord:
+    """인덱스에 보관하는 일정 하나 (__slots__로 행마다 dict를 두지 않음)
+    서버 행처럼 event['schedule_value'], event.get('btn_color')로 읽을 수 있다."""
+
+    __slots__ = ('schedule_day', 'schedule_value', 'btn_color', 'id')
+
+    def __init__(self, schedule_day, schedule_value, btn_color=None, id=None):
+        self.schedule_day = schedule_day  # 'YYYY-MM-DD' (인덱스의 날짜 키와 같은 문자열 객체)
+        self.schedule_value = schedule_value
+        self.btn_color = _shared_color(btn_color)
+        self.id = id  # 서버 행의 기본 키 (기본 키만 오는 실시간 DELETE를 날짜로 찾을 때 사용)
+
+    @classmethod
+    def from_row(cls, row, day=None):
+        """서버/캐시 행에서 필요한 컬럼만 꺼내 만듦 (이미 EventRecord면 그대로 반환)"""
+        if isinstance(row, cls):
+            return row
+        return cls(day or day_key(row['schedule_day']), row.get('schedule_value'), row.get('btn_color'), row.get('id'))
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def as_row(self):
+        """서버/캐시에 보낼 dict 행으로 변환 (id는 서버에서 받은 경우에만 포함)"""
+        row = {'schedule_day': self.schedule_day, 'schedule_value': self.schedule_value, 'btn_color': self.btn_color}
+        if self.id is not None:
+            row['id'] = self.id
+        return row
+
+    def __repr__(self):
+        return f"EventRecord({self.schedule_day!r}, {self.schedule_value!r}, {self.btn_color!r}, id={self.id!r})"
+
+
+class EventIndex:
+    """일정을 날짜 키와 월 버킷으로 관리하는 인메모리 인덱스"""
+
+    def __init__(self, events=None):
+        self.by_day = {}  # 'YYYY-MM-DD' -> 해당 날짜 일정 리스트
+        self.by_month = {}  # (연도, 월) -> {'YYYY-MM-DD': 일정 리스트}
+        self.by_id = {}  # 서버 행 id -> 'YYYY-MM-DD'
+        self.listener = None  # 변경 알림 listener(days, months): 둘 다 None이면 전체가 바뀐 것
+        if events:
+            self.build(events)
+
+    def __len__(self):
+        return sum(len(day_events) for day_events in self.by_day.values())
+
+    @instrumentation.timed('index.build')
+    def build(self, events):
+        """전체 일정 리스트로 인덱스를 새로 구성 (load_all_events에서 한 번 호출)"""
+        self.by_day = {}
+        self.by_month = {}
+        self.by_id = {}
+        for event in events:
+            self._add(event)
+        self._notify()
+
+    def _notify(self, days=None, months=None):
+        if self.listener is not None:
+            self.listener(days, months)
+
+    def _add(self, event):
+        day = sys.intern(day_key(event['schedule_day']))  # 날짜 키와 EventRecord.schedule_day가 같은 문자열을 공유
+        day_events = self.by_day.get(day)
+        if day_events is None:
+            day_events = self.by_day[day] = []
+            self.by_month.setdefault(month_of(day), {})[day] = day_events
+        record = EventRecord.from_row(event, day)
+        day_events.append(record)
+        if record.id is not None:
+            self.by_id[record.id] = day
+
+    def _forget_ids(self, day_events):
+        for event in day_events:
+            if event.id is not None and self.by_id.get(event.id) == event.schedule_day:
+                del self.by_id[event.id]
+
+    def upsert(self, event):
+        """해당 날짜의 일정을 새 일정으로 교체 (schedule_day 기준 upsert와 동일한 의미)"""
+        self.remove_day(event['schedule_day'])
+        self._add(event)
+        self._notify(days=[day_key(event['schedule_day'])])
+
+    def replace_day(self, schedule_day, events):
+        """해당 날짜의 일정을 주어진 일정 리스트로 교체"""
+        self.remove_day(schedule_day)
+        for event in events:
+            self._add(event)
+        self._notify(days=[day_key(schedule_day)])
+
+    @instrumentation.timed('index.replace_months')
+    def replace_months(self, months, events):
+        """지정한 (연도, 월)들의 일정을 새로 받아온 일정으로 통째로 교체"""
+        for month in months:
+            for day, day_events in self.by_month.pop(month, {}).items():
+                self.by_day.pop(day, None)
+                self._forget_ids(day_events)
+        for event in events:
+            self._add(event)
+        self._notify(months=set(months) | {month_of(day_key(event['schedule_day'])) for event in events})
+
+    def remove_day(self, schedule_day):
+        """해당 날짜의 일정을 인덱스에서 제거"""
+        day = day_key(schedule_day)
+        day_events = self.by_day.pop(day, None)
+        if day_events is None:
+            return False
+        self._forget_ids(day_events)
+        month = month_of(day)
+        bucket = self.by_month.get(month)
+        if bucket is not None:
+            bucket.pop(day, None)
+            if not bucket:
+                del self.by_month[month]
+        self._notify(days=[day])
+        return True
+
+    def events_for_day(self, schedule_day):
+        """특정 날짜의 일정 리스트 반환 (없으면 빈 리스트)"""
+        return self.by_day.get(day_key(schedule_day), [])
+
+    def day_of_id(self, row_id):
+        """서버 행 id의 날짜 (인덱스에 없으면 None)"""
+        return self.by_id.get(row_id)
+
+    def events_for_month(self, year, month):
+        """특정 연도/월의 {날짜: 일정 리스트} 버킷 반환 (없으면 빈 dict)"""
+        return self.by_month.get((year, month), {})
+
+    def all_events(self):
+        """인덱스에 들어있는 전체 일정(EventRecord)을 리스트로 반환"""
+        return [event for day_events in self.by_day.values() for event in day_events]
@@ -0,0 +1,373 @@
+# 메모리 안의 가짜 Supabase 백엔드 (벤치마크/오프라인 개발용)
+# supabase_helper가 쓰는 쿼리 빌더(select/eq/gte/lt/in_/or_/match/order/limit,
+# insert/upsert/update/delete, execute)만 흉내 내서 minsik_calender, global_setting, minsik_calender_rule 테이블을 흉내 낸다.
+# minsik_calender에서 지운 행은 실제 DB의 삭제 트리거처럼 minsik_calender_deleted에 삭제 기록을 남긴다.
+# latency를 주면 요청(execute)마다 그만큼 기다려서 네트워크 왕복 시간을 흉내 낸다.
+# inject_faults로 네트워크 오류/응답 없음을 주입해서 resilience의 재시도와 서킷 브레이커를 확인할 수 있다.
+import random
+import bisect
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+import supabase_helper
+
+# 테이블별 기본 키 (upsert on_conflict, 조회 최적화에 사용)
+PRIMARY_KEYS = {
+    'minsik_calender': 'schedule_day',
+    'global_setting': 'user_name',
+    'minsik_calender_rule': 'id',
+    'minsik_calender_deleted': 'schedule_day',
+}
+SERIAL_ID_TABLES = {'minsik_calender'}  # schedule_day로 upsert하지만 id(identity) 컬럼도 있는 테이블
+UPDATED_AT_BASE = datetime(2024, 1, 1)  # updated_at 시각의 기준 (요청마다 1마이크로초씩 증가)
+
+
+class FakeResponse:
+    """postgrest 응답처럼 data 속성만 가진 객체"""
+
+    def __init__(self, data):
+        self.data = data
+
+
+def _parse_or(text):
+    """'col.is.null, col.eq.""' 형태의 or_ 조건을 [(컬럼, 연산, 값), ...]으로 변환"""
+    conditions = []
+    for part in text.split(','):
+        column, op, value = part.strip().split('.', 2)
+        if op == 'is' and value == 'null':
+            value = None
+        else:
+            value = value.strip('"')
+        conditions.append((column, op, value))
+    return conditions
+
+
+def _matches(row, column, op, value):
+    cell = row.get(column)
+    if op == 'eq':
+        return cell == value
+    if op == 'is':
+        return cell is value
+    if op == 'gte':
+        return cell is not None and str(cell) >= str(value)
+    if op == 'gt':
+        return cell is not None and str(cell) > str(value)
+    if op == 'lt':
+        return cell is not None and str(cell) < str(value)
+    if op == 'in':
+        return cell in value
+    if op == 'or':
+        return any(_matches(row, *condition) for condition in value)
+    raise ValueError(f"지원하지 않는 조건: {op}")
+
+
+class FakeTable:
+    """기본 키 -> 행 딕셔너리와, 기본 키 범위 조회용 정렬된 키 목록
+    serial_id면 새 행마다 실제 테이블의 identity 컬럼처럼 id를 1부터 붙인다."""
+
+    def __init__(self, primary_key, serial_id=False):
+        self.primary_key = primary_key
+        self.rows = {}
+        self._sorted_keys = None  # 행이 추가/삭제되면 다시 정렬
+        self.serial_id = serial_id
+        self.last_id = 0
+
+    def sorted_keys(self):
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.rows)
+        return self._sorted_keys
+
+    def put(self, row):
+        key = row[self.primary_key]
+        if key not in self.rows:
+            self._sorted_keys = None
+        if self.serial_id and row.get('id') is None:
+            self.last_id += 1
+            row['id'] = self.last_id
+        self.rows[key] = row
+
+    def remove(self, key):
+        self._sorted_keys = None
+        return self.rows.pop(key)
+
+
+class FakeQuery:
+    """supabase-py 쿼리 빌더를 흉내 낸 객체 (execute 전까지는 조건만 모음)"""
+
+    def __init__(self, backend, table_name):
+        self.backend = backend
+        self.table_name = table_name
+        self.action = 'select'
+        self.columns = '*'
+        self.filters = []
+        self.payload = None
+        self.order_by = None
+        self.limit_count = None
+        self.returning = "representation"
+
+    # 작업 종류
+    def select(self, columns='*'):
+        self.action, self.columns = 'select', columns
+        return self
+
+    def insert(self, data):
+        self.action, self.payload = 'insert', data
+        return self
+
+    def upsert(self, data, on_conflict=None, returning="representation"):
+        self.action, self.payload = 'upsert', data
+        self.returning = returning
+        return self
+
+    def update(self, values):
+        self.action, self.payload = 'update', values
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    # 조건
+    def eq(self, column, value):
+        self.filters.append((column, 'eq', value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append((column, 'gte', value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append((column, 'gt', value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append((column, 'lt', value))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, 'in', set(values)))
+        return self
+
+    def or_(self, text):
+        self.filters.append((None, 'or', _parse_or(text)))
+        return self
+
+    def match(self, conditions):
+        for column, value in conditions.items():
+            self.eq(column, value)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def execute(self):
+        self.backend.apply_fault()
+        if self.backend.latency:
+            time.sleep(self.backend.latency)  # 네트워크 왕복 시간 흉내
+        with self.backend.lock:
+            self.backend.request_count += 1
+            return FakeResponse(getattr(self, f"_{self.action}")(self.backend.tables[self.table_name]))
+
+    # 실행
+    def _key_ordered(self):
+        """후보 행이 기본 키 순서로 나오는지 (기본 키 범위 조건으로 조회한 경우)"""
+        key = self.backend.tables[self.table_name].primary_key
+        ops = {op for column, op, value in self.filters if column == key}
+        return bool(ops & {'gte', 'gt', 'lt'}) and not ops & {'eq', 'in'}
+
+    def _candidates(self, table):
+        """기본 키 조건이 있으면 해당 범위만, 없으면 전체 행을 후보로 사용"""
+        key = table.primary_key
+        for column, op, value in self.filters:
+            if column == key and op == 'eq':
+                return [table.rows[value]] if value in table.rows else []
+            if column == key and op == 'in':
+                return [table.rows[day] for day in value if day in table.rows]
+        low = next((value for column, op, value in self.filters if column == key and op == 'gte'), None)
+        after = next((value for column, op, value in self.filters if column == key and op == 'gt'), None)
+        high = next((value for column, op, value in self.filters if column == key and op == 'lt'), None)
+        if low is None and after is None and high is None:
+            return list(table.rows.values())
+        keys = table.sorted_keys()
+        if after is not None:
+            start = bisect.bisect_right(keys, after)
+        else:
+            start = bisect.bisect_left(keys, low) if low is not None else 0
+        end = bisect.bisect_left(keys, high) if high is not None else len(keys)
+        return (table.rows[keys[index]] for index in range(start, end))  # 기본 키 순서대로 (페이지 조회 시 끝까지 만들지 않음)
+
+    def _filtered(self, table):
+        rows = (row for row in self._candidates(table)
+                if all(_matches(row, column, op, value) for column, op, value in self.filters))
+        if self.order_by == (table.primary_key, False) and self.limit_count is not None and self._key_ordered():
+            # 기본 키 오름차순 페이지 조회: 후보가 이미 정렬돼 있으므로 필요한 만큼만 꺼냄
+            return list(itertools.islice(rows, self.limit_count))
+        rows = list(rows)
+        if self.order_by:
+            column, desc = self.order_by
+            rows.sort(key=lambda row: str(row.get(column) or ''), reverse=desc)
+        if self.limit_count is not None:
+            rows = rows[:self.limit_count]
+        return rows
+
+    def _project(self, row):
+        if self.columns == '*':
+            return dict(row)
+        return {column.strip(): row.get(column.strip()) for column in self.columns.split(',')}
+
+    def _select(self, table):
+        return [self._project(row) for row in self._filtered(table)]
+
+    def _insert(self, table):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        for row in rows:
+            if row[table.primary_key] in table.rows:
+                raise ValueError(f"중복된 키: {row[table.primary_key]}")
+        return self._upsert(table)
+
+    def _upsert(self, table):
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        saved = []
+        for row in rows:
+            merged = dict(table.rows.get(row[table.primary_key], {}), **row)
+            merged['updated_at'] = self.backend.next_timestamp()
+            table.put(merged)
+            saved.append(dict(merged))
+        return saved if self.returning != "minimal" else []
+
+    def _update(self, table):
+        updated = []
+        for row in self._filtered(table):
+            row.update(self.payload)
+            row['updated_at'] = self.backend.next_timestamp()
+            updated.append(dict(row))
+        return updated
+
+    def _delete(self, table):
+        removed = [table.remove(row[table.primary_key]) for row in self._filtered(table)]
+        if self.table_name == supabase_helper.CALENDAR_TABLE:
+            for row in removed:  # 삭제 트리거 흉내
+                self.backend.tables[supabase_helper.DELETED_TABLE].put(
+                    {'schedule_day': row['schedule_day'], 'deleted_at': self.backend.next_timestamp()})
+        return removed
+
+
+class FakeSupabase:
+    """supabase Client 대신 쓰는 가짜 클라이언트 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency  # 요청마다 기다릴 시간(초)
+        self.lock = threading.Lock()
+        self.tables = {name: FakeTable(key, serial_id=name in SERIAL_ID_TABLES) for name, key in PRIMARY_KEYS.items()}
+        self.request_count = 0
+        self.tick = 0
+        self.pending_errors = 0  # 앞으로 실패시킬 요청 수
+        self.pending_hangs = 0  # 앞으로 응답을 늦출 요청 수
+        self.hang_seconds = 0.0
+        self.error_rate = 0.0  # 요청마다 이 확률로 실패
+        self.fault_count = 0  # 지금까지 주입한 오류/지연 수
+
+    def table(self, name):
+        with self.lock:
+            if name not in self.tables:
+                # 겹쳐 보는 다른 사람 달력 테이블 (minsik_calender와 같은 구조)
+                self.tables[name] = FakeTable(PRIMARY_KEYS['minsik_calender'], serial_id=True)
+        return FakeQuery(self, name)
+
+    def inject_faults(self, errors=0, hangs=0, hang_seconds=30.0, error_rate=None):
+        """다음 errors개 요청은 ConnectionError, 그다음 hangs개 요청은 hang_seconds초 동안 응답 없음
+        error_rate를 주면 이후 요청마다 그 확률로 ConnectionError"""
+        with self.lock:
+            self.pending_errors += errors
+            self.pending_hangs += hangs
+            self.hang_seconds = hang_seconds
+            if error_rate is not None:
+                self.error_rate = error_rate
+
+    def clear_faults(self):
+        with self.lock:
+            self.pending_errors = self.pending_hangs = 0
+            self.error_rate = 0.0
+
+    def apply_fault(self):
+        """주입된 장애가 있으면 요청 하나에 적용 (execute 시작 시 호출)"""
+        with self.lock:
+            if self.pending_errors:
+                self.pending_errors -= 1
+                fault = 'error'
+            elif self.pending_hangs:
+                self.pending_hangs -= 1
+                fault = 'hang'
+            elif self.error_rate and random.random() < self.error_rate:
+                fault = 'error'
+            else:
+                return
+            self.fault_count += 1
+        if fault == 'error':
+            raise ConnectionError("주입된 네트워크 오류")
+        time.sleep(self.hang_seconds)
+
+    def next_timestamp(self):
+        """요청마다 증가하는 updated_at 값 (lock 안에서 호출)"""
+        self.tick += 1
+        return (UPDATED_AT_BASE + timedelta(microseconds=self.tick)).isoformat()
+
+    def add_user(self, username, password='', global_color=None):
+        """global_setting에 사용자 행 추가"""
+        with self.lock:
+            self.tables['global_setting'].put({
+                'user_name': username, 'password': password, 'global_color': global_color,
+                'updated_at': self.next_timestamp()})
+
+    def seed_events(self, count, first_day, value="일정 {index}", btn_color=None, table_name='minsik_calender'):
+        """first_day('YYYY-MM-DD')부터 하루에 하나씩 count개의 일정을 채움 (table_name으로 다른 달력 테이블 지정)"""
+        start = datetime.strptime(first_day, '%Y-%m-%d')
+        self.table(table_name)  # 없는 테이블이면 만듦
+        with self.lock:
+            table = self.tables[table_name]
+            for index in range(count):
+                table.put({
+                    'schedule_day': (start + timedelta(days=index)).strftime('%Y-%m-%d'),
+                    'schedule_value': value.format(index=index),
+                    'btn_color': btn_color,
+                    'updated_at': self.next_timestamp(),
+                })
+
+    def add_rule(self, rule_id, start_day, freq='weekly', value="반복 일정", **fields):
+        """minsik_calender_rule에 반복 규칙 행 추가 (repeat_interval, until_day, count, btn_color는 fields로)"""
+        with self.lock:
+            self.tables['minsik_calender_rule'].put(dict(
+                {'id': rule_id, 'start_day': start_day, 'freq': freq, 'schedule_value': value},
+                updated_at=self.next_timestamp(), **fields))
+
+    def edit_events(self, days, value):
+        """다른 사용자가 수정한 것처럼 해당 날짜들의 일정을 서버 쪽에서 바로 바꿈"""
+        with self.lock:
+            table = self.tables['minsik_calender']
+            for day in days:
+                row = dict(table.rows.get(day, {'schedule_day': day, 'btn_color': None}))
+                row.update(schedule_value=value, updated_at=self.next_timestamp())
+                table.put(row)
+
+    def delete_events(self, days):
+        """다른 사용자가 지운 것처럼 해당 날짜들의 일정을 서버 쪽에서 바로 지움 (삭제 기록도 남김)"""
+        with self.lock:
+            table = self.tables['minsik_calender']
+            for day in days:
+                if day in table.rows:
+                    table.remove(day)
+                    self.tables['minsik_calender_deleted'].put({'schedule_day': day, 'deleted_at': self.next_timestamp()})
+
+
+def install(fake):
+    """supabase_helper의 공유 세션이 가짜 클라이언트를 쓰도록 교체"""
+    with supabase_helper.session._lock:
+        supabase_helper.session._client = fake
+    return fake
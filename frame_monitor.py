@@ -0,0 +1,125 @@
+# 프레임 시간/끊김(jank) 모니터
+# Kivy Clock에 매 프레임 콜백을 걸어 프레임 사이 간격을 재고, STALL_MS가 넘는 멈춤은
+# 직전에 시작된 동작(달 이동, 저장, 새로고침, 색상 변경)에 돌려서 기록한다.
+# 동작별 프레임 시간 분포와 최근 멈춤 목록을 FRAME_STATS_FILE에 주기적으로 덮어써서 실제 기기에서 확인할 수 있다.
+#
+# 환경 변수 CALENDAR_FRAME_MONITOR=1로 실행했을 때만 켜짐 (mark()는 꺼져 있어도 부담 없이 호출 가능)
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from kivy.clock import Clock
+
+from instrumentation import Histogram
+
+FRAME_STATS_FILE = "frame_stats.json"  # 요약을 저장할 파일
+FRAME_BUDGET_MS = 1000 / 60  # 60fps 기준 프레임 예산
+STALL_MS = 100  # 이보다 긴 프레임은 멈춤으로 기록
+ACTION_WINDOW = 1.0  # 동작 시작 후 이 시간(초) 안의 프레임은 그 동작 탓으로 봄 (결과 반영이 다음 프레임에 오므로)
+MAX_STALLS = 100  # 보관할 최근 멈춤 수
+WRITE_INTERVAL = 10  # 요약 파일을 다시 쓰는 주기(초)
+IDLE = 'idle'
+
+ENABLED = os.environ.get("CALENDAR_FRAME_MONITOR", "") not in ("", "0")
+
+
+class FrameMonitor:
+    """프레임 간격을 동작별로 모으는 모니터 (메인 스레드에서만 사용)"""
+
+    def __init__(self, path=FRAME_STATS_FILE, stall_ms=STALL_MS, budget_ms=FRAME_BUDGET_MS):
+        self.path = path
+        self.stall_ms = stall_ms
+        self.budget_ms = budget_ms
+        self.running = False
+        self.action = None  # 마지막으로 시작된 동작 이름
+        self.action_started = 0.0
+        self.last_frame = None
+        self.frames = {}  # 동작 이름 -> 프레임 시간 Histogram
+        self.over_budget = {}  # 동작 이름 -> 예산을 넘긴 프레임 수
+        self.stall_counts = {}  # 동작 이름 -> 멈춤 수
+        self.stalls = deque(maxlen=MAX_STALLS)  # 최근 멈춤 (시각, 길이ms, 동작)
+        self.started_at = None
+        self._events = []
+
+    def start(self):
+        """매 프레임 콜백과 주기적인 파일 저장 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.time()
+        self.last_frame = time.perf_counter()
+        self._events = [Clock.schedule_interval(self._on_frame, 0),
+                        Clock.schedule_interval(lambda dt: self.write(), WRITE_INTERVAL)]
+        logging.info(f"프레임 모니터 시작: 멈춤 기준 {self.stall_ms}ms, 요약 파일 {self.path}")
+
+    def stop(self):
+        for event in self._events:
+            event.cancel()
+        self._events = []
+        if self.running:
+            self.running = False
+            self.write()
+
+    def mark(self, action):
+        """동작 시작을 알림 (이후 ACTION_WINDOW 동안의 프레임을 이 동작에 돌림)"""
+        self.action = action
+        self.action_started = time.perf_counter()
+
+    def current_action(self, at):
+        """at 시각(perf_counter)에 진행 중으로 보는 동작 (없으면 idle)"""
+        if self.action is not None and at - self.action_started <= ACTION_WINDOW:
+            return self.action
+        return IDLE
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        frame_start, self.last_frame = self.last_frame, now
+        ms = (now - frame_start) * 1000
+        if self.action is not None and self.action_started >= frame_start:
+            action = self.action  # 이 프레임 안에서 시작된 동작이 프레임을 길게 만든 것
+        else:
+            action = self.current_action(frame_start)
+        histogram = self.frames.get(action)
+        if histogram is None:
+            histogram = self.frames[action] = Histogram()
+        histogram.add(ms)
+        if ms > self.budget_ms:
+            self.over_budget[action] = self.over_budget.get(action, 0) + 1
+        if ms > self.stall_ms:
+            self.stall_counts[action] = self.stall_counts.get(action, 0) + 1
+            self.stalls.append((round(time.time(), 3), round(ms, 1), action))
+            logging.warning(f"프레임 멈춤 {ms:.0f}ms ({action})")
+
+    def summary(self):
+        """동작별 프레임 시간 요약과 최근 멈춤 목록"""
+        return {
+            'started_at': self.started_at,
+            'written_at': round(time.time(), 3),
+            'budget_ms': round(self.budget_ms, 2),
+            'stall_ms': self.stall_ms,
+            'actions': {action: dict(histogram.summary(), over_budget=self.over_budget.get(action, 0),
+                                     stalls=self.stall_counts.get(action, 0))
+                        for action, histogram in self.frames.items()},
+            'recent_stalls': [{'at': at, 'ms': ms, 'action': action} for at, ms, action in self.stalls],
+        }
+
+    def write(self):
+        """요약을 파일에 덮어씀 (임시 파일에 쓰고 교체해서 읽는 쪽이 반쯤 쓴 파일을 보지 않게 함)"""
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"프레임 요약을 저장하지 못했습니다: {e}")
+
+
+monitor = FrameMonitor()
+
+
+def mark(action):
+    """동작 시작 표시 (모니터가 꺼져 있으면 아무것도 하지 않음)"""
+    if monitor.running:
+        monitor.mark(action)
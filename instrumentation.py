@@ -0,0 +1,175 @@
+# 성능 계측 (타이밍 구간, 카운터, 히스토그램)
+# 달 넘기기/불러오기가 느릴 때 어디서 시간이 드는지 보기 위한 가벼운 계측 도구.
+# span()/timed()로 감싼 구간의 소요 시간을 이름별 히스토그램에 모으고,
+# dump()로 요약을 로그에 남기거나 export_trace()로 chrome://tracing 형식 파일로 저장한다.
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+TRACE_FILE = "calendar_trace.json"  # export_trace 기본 저장 파일
+MAX_TRACE_EVENTS = 10000  # 보관할 최대 트레이스 이벤트 수 (오래된 것부터 버림)
+# 히스토그램 구간 경계(ms): 마지막 구간은 그 이상 전부
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# 환경 변수 CALENDAR_TRACE=1이면 구간마다 트레이스 이벤트도 기록 (집계는 항상 켜져 있음)
+TRACE_ENABLED = os.environ.get("CALENDAR_TRACE", "") not in ("", "0")
+
+
+class Histogram:
+    """소요 시간 분포 (구간별 개수와 합계/최소/최대)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, ms):
+        index = 0
+        while index < len(HISTOGRAM_BOUNDS_MS) and ms > HISTOGRAM_BOUNDS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, ratio):
+        """구간 경계 기준 근사 백분위(ms)"""
+        if not self.count:
+            return 0.0
+        target = self.count * ratio
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min(HISTOGRAM_BOUNDS_MS[index], self.max) if index < len(HISTOGRAM_BOUNDS_MS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.min or 0.0, 3),
+            'max_ms': round(self.max or 0.0, 3),
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets': dict(zip([f"<={bound}" for bound in HISTOGRAM_BOUNDS_MS] + ['>'], self.buckets)),
+        }
+
+
+class Metrics:
+    """이름별 카운터와 소요 시간 히스토그램, 트레이스 이벤트를 모으는 저장소 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, trace_enabled=TRACE_ENABLED, max_trace_events=MAX_TRACE_EVENTS):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.trace_enabled = trace_enabled
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.origin = time.perf_counter()
+
+    def count(self, name, amount=1):
+        """카운터 증가"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, started, ended, args=None):
+        """perf_counter 기준 시작/끝 시각으로 구간 하나를 기록"""
+        ms = (ended - started) * 1000
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(ms)
+            if self.trace_enabled:
+                event = {
+                    'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'ts': round((started - self.origin) * 1e6), 'dur': round(ms * 1000),
+                }
+                if args:
+                    event['args'] = args
+                self.trace_events.append(event)
+
+    @contextmanager
+    def span(self, name, **args):
+        """with 블록의 소요 시간을 name으로 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, started, time.perf_counter(), args)
+
+    def timed(self, name=None):
+        """함수 호출마다 소요 시간을 기록하는 데코레이터 (이름을 안 주면 모듈.함수 이름 사용)"""
+        def decorator(func):
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(span_name, started, time.perf_counter())
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """현재까지 모은 카운터와 히스토그램 요약 반환"""
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'spans': {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def report(self):
+        """사람이 읽기 쉬운 요약 문자열 (총 소요 시간이 큰 구간부터)"""
+        data = self.snapshot()
+        lines = ["[계측] 구간별 소요 시간"]
+        for name, s in sorted(data['spans'].items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"  {name}: {s['count']}회, 합계 {s['total_ms']:.1f}ms, 평균 {s['avg_ms']:.2f}ms, "
+                         f"p95 {s['p95_ms']:.1f}ms, 최대 {s['max_ms']:.1f}ms")
+        if data['counters']:
+            lines.append("[계측] 카운터")
+            for name, value in sorted(data['counters'].items()):
+                lines.append(f"  {name}: {value}")
+        return "\n".join(lines)
+
+    def dump(self):
+        """요약을 로그로 출력"""
+        logging.info(self.report())
+
+    def export_trace(self, path=TRACE_FILE):
+        """트레이스 이벤트를 chrome://tracing(Perfetto)에서 열 수 있는 JSON으로 저장하고 경로 반환"""
+        with self.lock:
+            events = list(self.trace_events)
+            counters = dict(self.counters)
+        data = {'traceEvents': events, 'otherData': {'counters': counters}}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        return path
+
+    def reset(self):
+        """모은 값을 모두 비움"""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.trace_events.clear()
+            self.origin = time.perf_counter()
+
+
+# 앱 전체가 공유하는 계측 저장소
+metrics = Metrics()
+span = metrics.span
+timed = metrics.timed
+count = metrics.count
+dump = metrics.dump
+export_trace = metrics.export_trace
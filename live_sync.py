@@ -0,0 +1,132 @@
+# 실시간 동기화 (Supabase Realtime)
+# supabase에 같이 설치되는 realtime 클라이언트로 minsik_calender 테이블의
+# INSERT/UPDATE/DELETE를 구독해서, 새로고침 없이 다른 사용자의 변경을 받는다.
+import asyncio
+import logging
+import random
+import threading
+
+import supabase_helper
+
+# Realtime 웹소켓 주소 (로컬 테스트 서버를 쓸 때는 LiveSync(url=...)로 바꿔서 사용)
+REALTIME_URL = supabase_helper.supabase_url.replace("https://", "wss://") + "/realtime/v1"
+
+
+def normalize_change(payload):
+    """realtime 콜백 payload를 (이벤트 종류, 새 행, 이전 행)으로 정리 (버전에 따라 모양이 다름)"""
+    data = payload.get('data', payload)
+    event_type = data.get('type') or data.get('eventType')
+    record = data.get('record') or data.get('new') or None
+    old_record = data.get('old_record') or data.get('old') or None
+    return event_type, record, old_record
+
+
+class LiveSync:
+    """테이블 변경을 백그라운드 스레드에서 구독하고, 끊기면 지수 백오프로 다시 연결"""
+
+    def __init__(self, on_change, url=REALTIME_URL, token=supabase_helper.supabase_key,
+                 table=supabase_helper.CALENDAR_TABLE, min_backoff=1.0, max_backoff=60.0):
+        self.on_change = on_change  # on_change(이벤트 종류, 새 행, 이전 행): 구독 스레드에서 호출됨
+        self.url = url
+        self.token = token
+        self.table = table
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.connected = False
+        self.reconnect_count = 0
+        self.loop = None
+        self.thread = None
+        self.client = None
+        self._stopped = threading.Event()
+        self._wake = None  # 재연결 대기 중에 stop()이 깨우는 asyncio.Event (구독 스레드의 루프에서 만듦)
+
+    def start(self):
+        """구독 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self._thread_main, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """구독을 끊고 스레드 종료 (재연결을 기다리는 중이면 바로 깨움)"""
+        self._stopped.set()
+        loop = self.loop
+        if loop is None:
+            return
+        try:
+            if self._wake is not None:
+                loop.call_soon_threadsafe(self._wake.set)
+            if self.client is not None:
+                asyncio.run_coroutine_threadsafe(self._close_client(), loop)
+        except RuntimeError:
+            pass  # 그 사이 스레드가 끝나 루프가 닫힌 경우
+
+    def _thread_main(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+            self.loop = None
+
+    async def _run(self):
+        self._wake = asyncio.Event()
+        backoff = self.min_backoff
+        while not self._stopped.is_set():
+            try:
+                await self._listen_once()
+            except Exception as e:
+                logging.warning(f"실시간 동기화 연결 오류: {e}")
+            if self.connected:
+                backoff = self.min_backoff  # 한 번이라도 연결됐었다면 대기 시간 초기화
+            self.connected = False
+            if self._stopped.is_set():
+                break
+            # 여러 기기가 동시에 재접속하지 않도록 대기 시간에 지터를 섞음
+            delay = random.uniform(backoff / 2, backoff)
+            logging.info(f"{delay:.1f}초 후 실시간 동기화 재연결")
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)  # stop()이 부르면 바로 끝남
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.max_backoff)
+            self.reconnect_count += 1
+
+    async def _listen_once(self):
+        """한 번 연결해서 끊길 때까지 변경 이벤트를 받음"""
+        from realtime import AsyncRealtimeClient  # supabase 의존성으로 설치되는 패키지
+
+        self.client = AsyncRealtimeClient(self.url, self.token, auto_reconnect=False)
+        try:
+            await self.client.connect()
+            channel = self.client.channel(f"public:{self.table}")  # 클라이언트가 앞에 "realtime:"을 붙임
+            await channel.on_postgres_changes("*", schema="public", table=self.table, callback=self._handle).subscribe()
+            self.connected = True
+            logging.info(f"실시간 동기화 구독 시작: {self.table}")
+            await self._wait_until_closed()
+        finally:
+            await self._close_client()
+
+    async def _wait_until_closed(self):
+        """연결이 끊길 때까지 대기
+        realtime 2.x는 connect()가 수신 작업(_listen_task)을 따로 띄우고 listen()은 아무것도 하지 않으므로 그 작업을 기다림"""
+        listen_task = getattr(self.client, '_listen_task', None)
+        if listen_task is None:
+            await self.client.listen()  # 수신 루프가 listen() 안에서 도는 예전 버전
+            return
+        try:
+            await listen_task
+        except asyncio.CancelledError:
+            pass  # stop()에서 연결을 닫은 경우
+
+    async def _close_client(self):
+        try:
+            await self.client.close()
+        except Exception as e:
+            logging.warning(f"실시간 동기화 연결 종료 중 오류: {e}")
+
+    def _handle(self, payload):
+        event_type, record, old_record = normalize_change(payload)
+        if event_type in ('INSERT', 'UPDATE', 'DELETE'):
+            self.on_change(event_type, record, old_record)
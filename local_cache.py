@@ -0,0 +1,121 @@
+# 로컬 일정 캐시 (SQLite)
+# 앱을 켜자마자 네트워크 없이 달력을 그리고, 오프라인에서도 볼 수 있도록
+# 불러온 일정과 설정값을 login_info.json 옆의 SQLite 파일에 저장한다.
+import sqlite3
+import threading
+import time
+
+from event_index import EventRecord, day_key, month_of
+
+CACHE_FILE = "calendar_cache.db"  # 로컬 캐시 파일
+SCHEMA_VERSION = 3  # 스키마가 바뀌면 올림 (버전이 다르면 캐시를 비우고 새로 만듦)
+MAX_CACHED_MONTHS = 36  # 캐시에 보관할 최대 개월 수 (오래 안 본 달부터 삭제)
+
+
+def _month_text(month):
+    """(연도, 월) 튜플을 'YYYY-MM' 문자열로 변환"""
+    return f"{month[0]}-{month[1]:02}"
+
+
+class LocalCache:
+    """일정과 설정값을 보관하는 SQLite 캐시 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, path=CACHE_FILE, max_months=MAX_CACHED_MONTHS):
+        self.path = path
+        self.max_months = max_months
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._migrate()
+
+    def _migrate(self):
+        """스키마 버전을 확인하고, 다르면 캐시 테이블을 새로 만듦 (캐시는 언제든 다시 받을 수 있음)"""
+        with self.lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                return
+            self.conn.execute("DROP TABLE IF EXISTS events")
+            self.conn.execute("DROP TABLE IF EXISTS months")
+            self.conn.execute("DROP TABLE IF EXISTS settings")
+            self.conn.execute(
+                "CREATE TABLE events (schedule_day TEXT NOT NULL, month TEXT NOT NULL, "
+                "schedule_value TEXT, btn_color TEXT, id)")
+            self.conn.execute("CREATE INDEX events_month ON events (month)")
+            self.conn.execute("CREATE INDEX events_day ON events (schedule_day)")
+            self.conn.execute(
+                "CREATE TABLE months (month TEXT PRIMARY KEY, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            self.conn.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def load_months(self, months):
+        """캐시에 있는 달의 일정을 반환: (EventRecord 리스트, 캐시에 있던 (연도, 월) 리스트)"""
+        month_texts = {_month_text(month): month for month in months}
+        if not month_texts:
+            return [], []
+        placeholders = ",".join("?" * len(month_texts))
+        with self.lock, self.conn:
+            cached = [row[0] for row in self.conn.execute(
+                f"SELECT month FROM months WHERE month IN ({placeholders})", list(month_texts))]
+            rows = []
+            if cached:
+                # 컬럼 값으로 바로 EventRecord를 만듦 (JSON을 dict로 풀었다가 다시 옮기지 않음)
+                rows = [EventRecord(*row) for row in self.conn.execute(
+                    f"SELECT schedule_day, schedule_value, btn_color, id FROM events WHERE month IN ({','.join('?' * len(cached))})",
+                    cached)]
+            self.conn.execute(
+                f"UPDATE months SET accessed_at = ? WHERE month IN ({placeholders})",
+                [time.time()] + list(month_texts))
+        return rows, [month_texts[text] for text in cached]
+
+    def store_months(self, months, rows):
+        """서버에서 받아온 달의 일정으로 캐시를 교체하고, 한도를 넘으면 오래된 달을 삭제"""
+        month_texts = [_month_text(month) for month in months]
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM events WHERE month = ?", [(text,) for text in month_texts])
+            self.conn.executemany(
+                "INSERT INTO events (schedule_day, month, schedule_value, btn_color, id) VALUES (?, ?, ?, ?, ?)",
+                [self._event_params(row) for row in rows])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO months (month, fetched_at, accessed_at) VALUES (?, ?, ?)",
+                [(text, now, now) for text in month_texts])
+            self._evict()
+
+    def _event_params(self, row):
+        day = day_key(row['schedule_day'])
+        return day, _month_text(month_of(day)), row.get('schedule_value'), row.get('btn_color'), row.get('id')
+
+    def _evict(self):
+        """가장 오래 안 본 달부터 max_months 개만 남기고 삭제 (lock 안에서 호출)"""
+        stale = [row[0] for row in self.conn.execute(
+            "SELECT month FROM months ORDER BY accessed_at DESC LIMIT -1 OFFSET ?", (self.max_months,))]
+        if stale:
+            self.conn.executemany("DELETE FROM events WHERE month = ?", [(text,) for text in stale])
+            self.conn.executemany("DELETE FROM months WHERE month = ?", [(text,) for text in stale])
+
+    def upsert_event(self, row):
+        """저장한 일정을 캐시에도 반영 (해당 날짜의 기존 일정을 교체)"""
+        params = self._event_params(row)
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM events WHERE schedule_day = ?", (params[0],))
+            self.conn.execute(
+                "INSERT INTO events (schedule_day, month, schedule_value, btn_color, id) VALUES (?, ?, ?, ?, ?)", params)
+
+    def delete_day(self, schedule_day):
+        """삭제한 날짜의 일정을 캐시에서도 제거"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM events WHERE schedule_day = ?", (day_key(schedule_day),))
+
+    def get_setting(self, key, default=None):
+        """캐시에 저장된 설정값 반환"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_setting(self, key, value):
+        """설정값을 캐시에 저장"""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
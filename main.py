@@ -1,48 +1,84 @@
-import logging
-import os
+import time
+IMPORT_STARTED = time.perf_counter()  # 시작 시간 측정 기준 (main 모듈 import 시작 시각)
 import json
-from datetime import datetime, timedelta
-from kivy.app import App
-from kivy.core.window import Window
-from kivy.graphics import Color, Rectangle, Line  # Color와 Rectangle 임포트
-from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.button import Button
-from kivy.uix.label import Label
-from kivy.uix.colorpicker import ColorPicker
-from kivy.uix.textinput import TextInput
-from kivy.uix.modalview import ModalView
-from kivy.uix.popup import Popup
-from kivy.properties import NumericProperty, ListProperty
-from supabase import Client
-import supabase_helper
-import ast  # 문자열을 tuple로 변환하기 위해 사용
+import logging
+import sys
+import threading
+import uuid
+from datetime import datetime
+import instrumentation
+# ColorPicker, TextInput, supabase처럼 대부분의 실행에서 바로 필요 없는 무거운 모듈은 처음 쓸 때 import
+with instrumentation.span('startup.import_kivy'):
+    from kivy.app import App
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.graphics import Color, Rectangle, Line, InstructionGroup  # Color와 Rectangle 임포트
+    from kivy.uix.boxlayout import BoxLayout
+    from kivy.uix.button import Button
+    from kivy.uix.label import Label
+    from kivy.uix.modalview import ModalView
+    from kivy.properties import NumericProperty, ListProperty
+with instrumentation.span('startup.import_app_modules'):
+    import supabase_helper
+    import resilience
+    from event_index import EventIndex, day_key, month_of, shift_month, month_start
+    from local_cache import LocalCache
+    from outbox import Outbox
+    from live_sync import LiveSync
+    import data_worker
+    from data_worker import run_in_background
+    import color_codec
+    from month_cache import MonthCache, MonthModel, CellState
+    from recurrence import RecurrenceIndex
+    from search_index import SearchIndex
+    from month_layout import month_layout
+    from calendar_sources import OverlayIndex, load_sources
+    import frame_monitor
+    import cell_text
+    from cell_text import CELL_PADDING
+    from user_session import UserSession, LOGIN_FILE
+
+instrumentation.metrics.observe('startup.import_main', IMPORT_STARTED, time.perf_counter())
 
 # 로그 설정 (INFO 레벨로 설정)
 logging.basicConfig(level=logging.INFO)
 
-LOGIN_FILE = "login_info.json"  # 로그인 정보를 저장할 파일
+RANGE_LOADING = True  # True면 화면에 보이는 기간만 불러옴, False면 전체 테이블을 불러옴
+PREFETCH_MONTHS = 2  # 화면에 보이는 3개월 바깥으로 미리 불러올 개월 수
+LIVE_SYNC = False  # True면 새로고침 없이 다른 사용자의 변경을 실시간으로 받음
+LIVE_RENDER_DEBOUNCE = 0.2  # 실시간 변경이 몰려올 때 다시 그리기까지 모아두는 시간(초)
+OUTBOX_FLUSH_INTERVAL = 2  # 모아 둔 일정 저장/삭제를 서버로 보내는 주기(초)
+MARKER_SIZE = 8  # 겹쳐 보는 달력의 일정이 있는 날 칸 오른쪽 위에 그리는 색 표시 크기
+METRICS_DUMP_KEY = 293  # F12: 계측 요약을 로그로 출력하고 트레이스 파일 저장
+STARTUP_WARMUP = True  # True면 첫 화면을 그린 뒤 백그라운드에서 supabase import와 클라이언트 생성을 미리 해 둠 (False면 처음 쓸 때)
+IMPORT_BUDGET_MS = 1000  # main 모듈 import 허용 시간
+FIRST_FRAME_BUDGET_MS = 2500  # 첫 화면까지 허용 시간 (저사양 모바일 기준)
+# 첫 화면 전에 불러오지 않아야 하는 무거운 모듈 (시작 보고서에 이미 불러와졌는지 표시)
+RULES_CACHE_KEY = "recurrence_rules"  # 반복 규칙 목록을 로컬 캐시 설정에 저장할 때 쓰는 키 (JSON)
+DEFERRED_MODULES = ('supabase', 'httpx', 'gotrue', 'postgrest', 'realtime', 'storage3', 'supafunc',
+                    'kivy.uix.colorpicker', 'kivy.uix.textinput')
 global_color = [1, 1, 1, 1]  # 기본 값으로 흰색을 설정
 Window.clearcolor = (0, 0.125, 0.2, 1) # kivy 전체 백그라운드 색상
 
 class LoginModal(ModalView):
-    def __init__(self, calendar_layout, supabase_client, **kwargs):
+    def __init__(self, calendar_layout, **kwargs):
         super().__init__(**kwargs)
         self.calendar_layout = calendar_layout
-        self.supabase_client = supabase_client  # Supabase 클라이언트 저장
         self.size_hint = (0.8, 0.4)
         self.auto_dismiss = False  # 로그인 전에는 닫히지 않도록 설정
 
         layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
 
+        from kivy.uix.textinput import TextInput  # 로그인이 필요할 때만 import
         self.username_input = TextInput(hint_text='사용자 이름', multiline=False, font_name='NanumGothic.ttf')
         self.password_input = TextInput(hint_text='비밀번호', multiline=False, password=True, font_name='NanumGothic.ttf')
 
-        login_button = Button(text='로그인', on_press=self.login, font_name='NanumGothic.ttf')
+        self.login_button = Button(text='로그인', on_press=self.login, font_name='NanumGothic.ttf')
 
         layout.add_widget(Label(text='로그인', font_name='NanumGothic.ttf'))
         layout.add_widget(self.username_input)
         layout.add_widget(self.password_input)
-        layout.add_widget(login_button)
+        layout.add_widget(self.login_button)
 
         self.add_widget(layout)
 
@@ -50,28 +86,33 @@ class LoginModal(ModalView):
         username = self.username_input.text
         password = self.password_input.text
 
-        # 로그인 검증 (supabase_client를 인자로 전달)
-        if supabase_helper.verify_login(username, password, self.supabase_client):
+        # 로그인 검증은 백그라운드에서 (로그인 시점에 Supabase 클라이언트를 준비해서 전달)
+        self.login_button.disabled = True  # 응답을 기다리는 동안 중복 요청 방지
+        user_session = self.calendar_layout.user_session
+        run_in_background(
+            lambda: supabase_helper.within_budget(
+                'login', user_session.verify_login, username, password, self.calendar_layout.get_supabase_client()),
+            on_success=lambda success: self.on_login_result(username, success),
+            on_error=lambda e: self.on_login_result(username, False))
+
+    def on_login_result(self, username, success):
+        """로그인 검증 결과를 메인 스레드에서 처리"""
+        self.login_button.disabled = False
+        if success:
             print("로그인 성공")
             self.save_login_info(username)  # 로그인 성공 시 날짜 저장
             self.remove_login_popup()  # 로그인 팝업 닫기
-            self.calendar_layout.load_all_events()  # 로그인 성공 후 달력 데이터를 불러옴
+            self.calendar_layout.revalidate_in_background()  # 로그인 성공 후 달력 데이터를 불러옴
         else:
             # 로그인 실패 시 오류 메시지 표시
             print("로그인 실패")
             self.username_input.text = ""
             self.password_input.text = ""
             self.password_input.hint_text = "로그인 실패. 다시 시도하세요."
-            
 
     def save_login_info(self, username):
-        """로그인 날짜를 파일에 저장"""
-        login_data = {
-            "last_login": datetime.now().isoformat(),
-            "username": username  # 사용자 이름 저장
-        }
-        with open(LOGIN_FILE, "w") as f:
-            json.dump(login_data, f)
+        """로그인 날짜를 세션과 파일에 저장"""
+        self.calendar_layout.user_session.remember_login(username)
 
     def remove_login_popup(self):
         """부모 레이아웃에서 ModalView 제거"""
@@ -82,105 +123,600 @@ class LoginModal(ModalView):
 class ColorPickerPopup(BoxLayout):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        from kivy.uix.colorpicker import ColorPicker  # 색상 선택기를 열 때만 import
         self.color_picker = ColorPicker()
         self.color_picker.bind(color=self.on_color)  # 색상이 선택될 때 이벤트 바인딩
         self.add_widget(self.color_picker)
 
     def on_color(self, instance, value):
         # 선택한 색상을 적용할 메서드
+        frame_monitor.mark('color_change')  # 색상 선택기를 드래그하는 동안 매 프레임 불림
         self.parent.parent.update_button_color(value)  # 부모에서 update_button_color 호출
 
+class DayCell(Button):
+    """달력의 날짜 한 칸 (한 번 생성해서 계속 재사용)"""
+
+    def __init__(self, calendar_layout, **kwargs):
+        super().__init__(
+            background_normal='',  # 기본 배경 이미지 제거
+            **kwargs)
+        self.calendar_layout = calendar_layout
+        self.date_str = None  # 이 칸에 연결된 날짜 ('YYYY-MM-DD')
+        self.day_number = None  # 칸에 표시하는 일자
+        self.in_month = False  # 현재 보고 있는 달의 날짜인지 여부
+        self.cell_text = ""  # 칸에 표시할 글자 (Button.text 대신 캐시된 텍스처로 그림)
+        self.cell_text_color = (1, 1, 1, 1)
+        self.markers = ()  # 겹쳐 보는 달력 색 표시 목록
+
+        # 오늘 날짜 테두리: 미리 만들어 두고 색상의 알파값으로 표시 여부만 바꿈
+        with self.canvas.before:
+            self.border_color = Color(0, 0, 0, 0)
+            self.border_line = Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
+        # 글자: 글자색이 텍스처에 들어 있으므로 흰색 그대로 그림
+        with self.canvas.after:
+            Color(1, 1, 1, 1)
+            self.text_rect = Rectangle()
+        self.marker_group = InstructionGroup()  # 다른 달력 색 표시 (있는 칸만 채움)
+        self.canvas.after.add(self.marker_group)
+
+        # 크기/위치가 바뀔 때마다 칸별로 다시 그리지 않고, 달력 전체를 한 프레임에 한 번만 다시 배치
+        self.bind(size=calendar_layout.relayout_trigger, pos=calendar_layout.relayout_trigger)
+
+    def relayout(self):
+        """현재 크기/위치에 맞춰 글자 텍스처와 테두리를 다시 배치 (CalendarLayout._relayout_cells에서 호출)"""
+        self.border_line.rectangle = (self.x, self.y, self.width, self.height)
+        texture = cell_text.text_texture(self.cell_text, self.width - 2 * CELL_PADDING,
+                                         self.height - 2 * CELL_PADDING, self.cell_text_color)
+        self.text_rect.texture = texture
+        self.text_rect.size = texture.size
+        # 왼쪽 위 정렬: 텍스처 위쪽을 칸 위쪽 패딩에 맞춤
+        self.text_rect.pos = (self.x + CELL_PADDING, self.top - CELL_PADDING - texture.height)
+        self.marker_group.clear()
+        for index, color in enumerate(self.markers):
+            self.marker_group.add(Color(*color))
+            self.marker_group.add(Rectangle(
+                pos=(self.right - CELL_PADDING - (index + 1) * (MARKER_SIZE + 2), self.top - CELL_PADDING - MARKER_SIZE),
+                size=(MARKER_SIZE, MARKER_SIZE)))
+
+    def update_cell(self, date_str, text, background_color, text_color, border_color=None, markers=()):
+        """칸에 표시할 날짜, 글자, 색상, 테두리만 변경 (글자는 다음 프레임의 배치 때 한 번에 그림)"""
+        self.date_str = date_str
+        self.markers = markers
+        self.cell_text = text
+        self.cell_text_color = tuple(text_color)
+        self.background_color = background_color
+        self.border_color.rgba = border_color if border_color else (0, 0, 0, 0)
+        self.calendar_layout.relayout_trigger()
+
+    def on_press(self):
+        self.calendar_layout.show_event_popup(self.date_str)
+
+
 class CalendarLayout(BoxLayout):
     year = NumericProperty(datetime.now().year)
     month = NumericProperty(datetime.now().month)
     day = NumericProperty(datetime.now().day)
-    supabase_client: Client = None  # Supabase 클라이언트를 저장할 변수
-    events = []  # 전체 일정 데이터를 저장할 리스트
+    supabase_client = None  # Supabase 클라이언트를 저장할 변수 (처음 필요할 때 생성)
+    event_index: EventIndex = None  # 날짜별/월별로 묶은 일정 인덱스
     color_picker_popup = None # 팝업 인스턴스를 저장할 속성 추가
+    color_before_edit = None  # 글로벌 색상 편집 전 색상 (저장 실패 시 되돌리기용)
     selected_color = ListProperty([0.7, 0.7, 0.7, 1])  # 선택한 색상 저장, 초기값 설정
+    day_cells = None  # 재사용하는 날짜 칸 위젯 목록
+    loaded_months = None  # 이미 불러온 (연도, 월) 집합
+    pending_months = None  # 백그라운드에서 불러오는 중인 (연도, 월) 집합
+    load_generation = 0  # 새로고침마다 증가, 오래된 백그라운드 결과를 버리는 데 사용
+    local_cache: LocalCache = None  # 일정/설정을 보관하는 로컬 SQLite 캐시
+    cell_by_date = None  # 'YYYY-MM-DD' -> 화면에 표시 중인 날짜 칸
+    sync_watermark = None  # 델타 동기화 기준 시각 (이 시각 이후 바뀐 일정만 다시 받음)
+    live_sync: LiveSync = None  # 실시간 변경 구독 (LIVE_SYNC가 켜져 있을 때만 사용)
+    outbox: Outbox = None  # 서버로 보낼 일정 저장/삭제 대기열
+    outbox_flushing = False  # 대기열 전송이 진행 중인지 여부
+    user_session: UserSession = None  # 로그인한 사용자와 설정값
+    month_cache: MonthCache = None  # 계산해 둔 달 화면 모델 (LRU)
+    recurrence: RecurrenceIndex = None  # 반복 일정 규칙 (보이는 달만 펼쳐서 사용)
+    search_index: SearchIndex = None  # 불러온 일정 내용의 n-gram 검색 색인
+    search_popup = None  # 검색 팝업 (처음 열 때 만들고 재사용)
+    year_popup = None  # 연간 보기 팝업 (처음 열 때 만들고 재사용)
+    year_view = None  # 연간 히트맵 위젯
+    overlays: OverlayIndex = None  # 겹쳐 보는 다른 사람 달력들 (calendars.json)
     
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.supabase_client = supabase_helper.create_supabase_client()  # Supabase 클라이언트 생성
+        self.user_session = UserSession()  # 로그인 정보/사용자 설정은 한 번 읽어 메모리에 보관
+        self.event_index = EventIndex()
+        self.month_cache = MonthCache()
+        self.search_index = SearchIndex()
+        self.event_index.listener = self._on_events_changed
+        self.overlays = OverlayIndex(load_sources())
+        self.overlays.listener = self._on_overlays_changed
+        self.recurrence = RecurrenceIndex()
+        self.recurrence.listener = self._on_rules_changed
+        self.warm_trigger = Clock.create_trigger(self._warm_adjacent_months)
+        self.relayout_trigger = Clock.create_trigger(self._relayout_cells)  # 칸 크기/내용 변경을 프레임당 한 번으로 모음
+        self.day_cells = []
+        self.cell_by_date = {}
+        self.live_changed_days = set()
+        self.live_render_trigger = Clock.create_trigger(self._flush_live_changes, LIVE_RENDER_DEBOUNCE)
+        self.loaded_months = set()
+        self.pending_months = set()
+        self.client_lock = threading.Lock()
+        self.local_cache = LocalCache()
+        self.outbox = Outbox(send_batch=lambda upserts, deletes: supabase_helper.apply_event_batch(
+            upserts, deletes, self.get_supabase_client()))
+        for day, op, row, error in self.outbox.quarantined():
+            print(f"서버가 거부해 보내지 못한 {day} 일정이 있습니다. 다시 수정해 주세요: {error}")
+        Clock.schedule_interval(lambda dt: self.flush_outbox(), OUTBOX_FLUSH_INTERVAL)
+        # 서킷 브레이커 상태 변경은 요청 스레드에서 오므로 메인 스레드로 넘겨서 처리
+        resilience.breaker.listeners.append(
+            lambda previous, state: Clock.schedule_once(lambda dt: self.on_backend_state(previous, state)))
+        # Supabase 클라이언트는 첫 프레임을 막지 않도록 처음 필요할 때 생성
         # 로그인 팝업 표시 여부 결정
         if self.should_show_login_popup():
-            self.show_login_popup()  # 로그인 팝업을 띄우고 달력 로딩은 하지 않음
+            # 로그인 팝업을 띄우고 달력 로딩은 하지 않음
+            # 팝업(TextInput import와 생성)은 빈 달력으로 첫 화면을 그린 뒤에 띄워서 첫 프레임을 늦추지 않음
+            Window.bind(on_flip=self._show_login_after_first_frame)
         else:
-            self.load_all_events()  # 로그인 기록이 있으면 바로 달력 데이터를 불러옴
-            self.update_calendar()
+            self.load_from_cache()  # 로그인 기록이 있으면 캐시로 바로 달력을 그림
+            self.revalidate_in_background()  # 서버 데이터는 백그라운드에서 받아와 갱신
+
+    def _on_events_changed(self, days, months):
+        """일정 인덱스가 바뀌면 바뀐 날짜/달만 화면 캐시에서 지우고 검색 색인을 갱신"""
+        self.month_cache.invalidate(days, months)
+        self.search_index.sync(self.event_index, days, months)
+        self._redraw_year_view()
+
+    def _on_overlays_changed(self, days, months):
+        self.month_cache.invalidate(days, months)
+        self._redraw_year_view()
+
+    def _on_rules_changed(self):
+        # 규칙이 바뀌면 어느 달이든 바뀔 수 있으므로 캐시된 달 화면을 전부 버림
+        self.month_cache.clear()
+        self._redraw_year_view()
+
+    def _redraw_year_view(self):
+        """연간 보기가 열려 있으면 다음 프레임에 한 번 다시 그림"""
+        if self.year_popup is not None and self.year_popup.parent is not None:
+            self.year_view.redraw_trigger()
+
+    def get_supabase_client(self):
+        """Supabase 클라이언트를 반환 (없으면 이때 생성)"""
+        with self.client_lock:
+            if self.supabase_client is None:
+                self.supabase_client = supabase_helper.create_supabase_client()  # Supabase 클라이언트 생성
+            return self.supabase_client
 
     def should_show_login_popup(self):
         """로그인 팝업을 띄울지 여부를 판단"""
-        if os.path.exists(LOGIN_FILE):
-            try:
-                with open(LOGIN_FILE, "r") as f:
-                    login_data = json.load(f)
-                    last_login = datetime.fromisoformat(login_data["last_login"])
-                    # 마지막 로그인 날짜로부터 3개월이 지났는지 확인
-                    if datetime.now() < last_login + timedelta(days=90):
-                        print("3개월 이내에 로그인한 기록이 있습니다.")
-                        return False
-            except (json.JSONDecodeError, KeyError, ValueError):
-                print("로그인 정보 파일이 손상되었거나 비어 있습니다.")
-                # 파일이 손상되었거나 비어 있을 경우, 팝업을 띄우고 파일을 다시 저장합니다.
-                return True
+        # 마지막 로그인 날짜로부터 3개월이 지났는지 확인 (파일이 손상되었으면 다시 로그인)
+        if self.user_session.login_valid():
+            print("3개월 이내에 로그인한 기록이 있습니다.")
+            return False
         print("로그인 팝업을 띄웁니다.")
         return True
     
+    def _show_login_after_first_frame(self, *args):
+        Window.unbind(on_flip=self._show_login_after_first_frame)
+        Clock.schedule_once(lambda dt: self.show_login_popup())
+
     def show_login_popup(self):
         """로그인 팝업을 표시하는 함수"""
-        self.login_popup = LoginModal(calendar_layout=self, supabase_client=self.supabase_client)
+        self.login_popup = LoginModal(calendar_layout=self)
         self.login_popup.open()  # 로그인 팝업을 띄우기
 
     def parse_color(self, color_string):
-        """문자열 형식의 색상 데이터를 tuple로 변환"""
-        try:
-            return ast.literal_eval(color_string)  # 문자열을 tuple로 변환
-        except (ValueError, SyntaxError):
-            return (1, 1, 1, 1)  # 변환 실패 시 기본 흰색 반환
+        """저장된 색상 데이터('#RRGGBBAA' 또는 예전 repr 문자열)를 tuple로 변환 (결과는 메모이즈됨)"""
+        return color_codec.decode_color(color_string) or color_codec.DEFAULT_COLOR
 
+    @instrumentation.timed('calendar.load_all_events')
     def load_all_events(self):
-        """로그인 후 Supabase에서 전체 일정을 불러옴"""
+        """로그인 후 Supabase에서 일정을 불러옴 (응답이 올 때까지 기다림)"""
+        self.load_generation += 1
+        self.loaded_months = set()
+        self.pending_months = set()
+        self.overlays.reset()
+        self.fetch_overlays(self.visible_months(), connect=True)  # 겹쳐 보는 달력은 내 일정 조회와 동시에 받음
+        self._apply_snapshot(*self._fetch_snapshot(self.visible_months() if RANGE_LOADING else None))
+
+    @instrumentation.timed('calendar.fetch_snapshot')
+    def _fetch_snapshot(self, months):
+        """글로벌 색상과 일정을 서버에서 조회 (위젯을 건드리지 않아 백그라운드 스레드에서도 호출 가능)"""
         # 로그인된 사용자 이름 가져오기 (예시로 저장된 사용자 이름 사용)
         username = self.get_logged_in_username()
         logging.info(f"username: {username}")
+        supabase_client = self.get_supabase_client()
+
+        # 일정을 받기 전에 동기화 기준 시각을 먼저 잡아둠 (그 사이 바뀐 일정은 다음 새로고침에 다시 받음)
+        try:
+            watermark = supabase_helper.get_latest_change_time(supabase_client)
+        except Exception as e:
+            print(f"updated_at 컬럼이 없어 델타 동기화를 사용할 수 없습니다: {e}")
+            watermark = None
+
+        # 글로벌 색상 가져오기 (로그인 때 받았거나 TTL 안에 확인한 값이면 다시 조회하지 않음)
+        global_color = self.user_session.global_color(supabase_client)
+
+        # 반복 일정 규칙 (실패하면 None을 돌려 캐시된 규칙을 그대로 사용)
+        rules = self._fetch_rules(supabase_client)
+
+        # Supabase에서 일정 데이터를 불러옴
+        if months is not None:
+            # 화면에 보이는 이전/현재/다음 달만 불러오고, 나머지는 백그라운드로 미리 불러옴
+            rows = self._fetch_months(months)
+        else:
+            rows = supabase_helper.get_calendar_data(supabase_client)
+        logging.info(f"전체 {len(rows)}개 일정 로드")  # 전체 일정 로드 로그 출력
+        return username, global_color, months, rows, watermark, rules
 
-        # 글로벌 색상 가져오기
-        global_color = supabase_helper.get_global_setting(username, self.supabase_client)
+    def _fetch_rules(self, supabase_client):
+        """반복 일정 규칙 조회 (규칙 테이블이 없거나 실패하면 None)"""
+        try:
+            return supabase_helper.get_recurrence_rules(supabase_client)
+        except Exception as e:
+            print(f"반복 일정 규칙을 가져오지 못했습니다: {e}")
+            return None
+
+    def _apply_rules(self, rules):
+        """서버에서 받은 반복 규칙으로 교체하고 로컬 캐시에도 저장 (바뀐 게 없으면 화면 캐시를 유지)"""
+        if rules is None or sorted(rules, key=lambda rule: str(rule.get('id'))) == sorted(
+                self.recurrence.rows(), key=lambda rule: str(rule.get('id'))):
+            return False
+        self.recurrence.replace(rules)
+        self.local_cache.set_setting(RULES_CACHE_KEY, json.dumps(rules))
+        return True
+
+    @instrumentation.timed('calendar.apply_snapshot')
+    def _apply_snapshot(self, username, global_color, months, rows, watermark, rules=None):
+        """서버에서 받은 글로벌 색상과 일정을 화면과 로컬 캐시에 반영 (메인 스레드)"""
+        self.sync_watermark = watermark
+        self._apply_rules(rules)
         if global_color:
             self.selected_color = self.parse_color(global_color)  # 글로벌 색상 적용
+            self.local_cache.set_setting(f"global_color:{username}", global_color)
             logging.info(f"글로벌 색상이 적용되었습니다: {self.selected_color}")
         else :
             logging.info(f"username: {username}, global_color가 없습니다")
 
-        # Supabase에서 일정 데이터를 불러옴
-        response = supabase_helper.get_calendar_data(self.supabase_client)
-        self.events = response  # 전체 일정을 변수에 저장
-        logging.info(f"전체 {len(self.events)}개 일정 로드")  # 전체 일정 로드 로그 출력
+        if months is None:
+            self.event_index.build(rows)  # 전체 일정으로 날짜 인덱스를 한 번만 구성
+            self.local_cache.store_months({month_of(day) for day in self.event_index.by_day}, rows)
+        else:
+            self._store_months(months, rows)
         self.update_calendar()  # 로그인 후 달력 업데이트
+        self.fetch_overlays(self.visible_months())
+        self.prefetch_adjacent_months()
+        self.start_live_sync()
+
+    def load_from_cache(self):
+        """로컬 캐시에 있는 글로벌 색상과 일정으로 네트워크 없이 바로 달력을 그림"""
+        username = self.get_logged_in_username()
+        cached_color = self.local_cache.get_setting(f"global_color:{username}")
+        if cached_color:
+            self.selected_color = self.parse_color(cached_color)
+        cached_rules = self.local_cache.get_setting(RULES_CACHE_KEY)
+        if cached_rules:
+            self.recurrence.replace(json.loads(cached_rules))
+        self._load_months_from_cache(self.visible_months())
+        self.update_calendar()
+
+    def revalidate_in_background(self):
+        """캐시로 그린 화면을 백그라운드에서 서버 데이터와 맞춤 (stale-while-revalidate)"""
+        self.load_generation += 1
+        self.loaded_months = set()
+        self.pending_months = set()
+        self.overlays.reset()
+        generation = self.load_generation
+        run_in_background(
+            supabase_helper.within_budget, 'startup', self._fetch_snapshot, self.visible_months() if RANGE_LOADING else None,
+            on_success=lambda snapshot: self._apply_revalidation(generation, snapshot),
+            on_error=lambda e: print(f"서버와 동기화하지 못해 캐시된 일정을 표시합니다: {e}"))
+        # 겹쳐 보는 달력은 스냅샷이 끝나기를 기다리지 않고 함께 요청 (가장 느린 달력만큼만 걸림)
+        self.fetch_overlays(self.visible_months(), connect=True)
+
+    def _apply_revalidation(self, generation, snapshot):
+        """백그라운드에서 받은 서버 데이터를 메인 스레드에서 반영"""
+        if generation != self.load_generation:
+            return  # 그 사이 새로고침된 경우 오래된 결과는 버림
+        username, global_color, months, rows, watermark, rules = snapshot
+        if months is not None and months != self.visible_months():
+            # 그 사이 달을 넘긴 경우 받아온 달만 반영하고 화면에 필요한 달은 다시 확인
+            self._store_months(months, rows)
+            self.ensure_months_loaded(self.visible_months())
+            months, rows = [], []
+        self._apply_snapshot(username, global_color, months, rows, watermark, rules)
+
+    def visible_months(self):
+        """update_calendar가 그리는 6x7 칸에 걸친 (연도, 월) 목록 (1일이 일요일이면 이전 달은 없음)"""
+        return list(month_layout(self.year, self.month).months)
+
+    def _month_runs(self, months):
+        """(연도, 월) 목록을 연속된 구간 [(시작 월, 개월 수), ...]으로 묶음"""
+        runs = []
+        for month in sorted(months):
+            if runs and shift_month(*runs[-1][0], runs[-1][1]) == month:
+                runs[-1][1] += 1
+            else:
+                runs.append([month, 1])
+        return runs
+
+    def _fetch_months(self, months):
+        """(연도, 월) 목록에 해당하는 일정을 구간별 gte/lt 쿼리로 조회"""
+        rows = []
+        for (year, month), count in self._month_runs(months):
+            start_date = month_start(year, month)
+            end_date = month_start(*shift_month(year, month, count))
+            rows.extend(supabase_helper.get_calendar_data_range(self.supabase_client, start_date, end_date))
+            logging.info(f"{start_date} ~ {end_date} 기간 일정 조회")
+        return rows
+
+    def ensure_months_loaded(self, months):
+        """아직 불러오지 않은 달은 캐시로 먼저 채우고, 서버 조회는 백그라운드로 요청"""
+        self.fetch_overlays(months)
+        missing = [month for month in months if month not in self.loaded_months and month not in self.pending_months]
+        if not missing:
+            return
+        self._load_months_from_cache(missing)
+        self.fetch_months_in_background(missing)
+
+    def _store_months(self, months, rows):
+        """서버에서 받은 달의 일정을 인덱스와 로컬 캐시에 반영"""
+        self.event_index.replace_months(months, rows)
+        self.loaded_months.update(months)
+        self.pending_months.difference_update(months)
+        self.local_cache.store_months(months, rows)
+        self._overlay_pending_writes(months)
+
+    def _load_months_from_cache(self, months):
+        """로컬 캐시에 있는 달의 일정을 인덱스에 반영 (서버에서 받은 것으로 표시하지는 않음)"""
+        rows, cached_months = self.local_cache.load_months(months)
+        self.event_index.replace_months(cached_months, rows)
+        self._overlay_pending_writes(cached_months)
+
+    def _overlay_pending_writes(self, months):
+        """아직 서버로 보내지 못한 저장/삭제를 인덱스에 다시 덮어씀 (서버/캐시 데이터가 더 오래된 상태이므로)"""
+        months = set(months)
+        for day, (op, row) in self.outbox.pending().items():
+            if month_of(day) not in months:
+                continue
+            if op == 'delete':
+                self.event_index.remove_day(day)
+            else:
+                self.event_index.upsert(row)
+
+    def prefetch_adjacent_months(self):
+        """현재 화면 바깥의 이웃 달을 백그라운드에서 미리 불러옴"""
+        if not RANGE_LOADING:
+            return
+        reach = 1 + PREFETCH_MONTHS
+        months = [shift_month(self.year, self.month, offset) for offset in range(-reach, reach + 1)]
+        missing = [month for month in months if month not in self.loaded_months and month not in self.pending_months]
+        if missing:
+            self.fetch_months_in_background(missing)
+        self.fetch_overlays(months)
+
+    def fetch_months_in_background(self, months):
+        """(연도, 월) 목록을 작업 스레드에서 조회하고, 결과는 메인 스레드에서 인덱스에 반영"""
+        if self.supabase_client is None:
+            return  # 서버 연결 전에는 백그라운드 동기화가 끝난 뒤 다시 요청됨
+        self.pending_months.update(months)
+        generation = self.load_generation
+        run_in_background(
+            self._fetch_months, months,
+            on_success=lambda rows: self._apply_prefetch(generation, months, rows),
+            on_error=lambda e: self._apply_prefetch(generation, months, None, e))
+
+    def _apply_prefetch(self, generation, months, rows, error=None):
+        """백그라운드에서 불러온 결과를 메인 스레드에서 인덱스에 반영"""
+        if generation != self.load_generation:
+            return  # 그 사이 새로고침된 경우 오래된 결과는 버림
+        self.pending_months.difference_update(months)
+        if rows is None:
+            print(f"일정을 불러오지 못해 캐시된 일정을 표시합니다: {error}")
+            return
+        months = [month for month in months if month not in self.loaded_months]  # 그 사이 직접 불러온 달은 건너뜀
+        self._store_months(months, [row for row in rows if month_of(day_key(row['schedule_day'])) in months])
+        if set(months) & set(self.visible_months()):
+            self.update_calendar()
+
+    def fetch_overlays(self, months, connect=False):
+        """겹쳐 보는 달력마다 아직 없는 달을 각각 백그라운드 작업으로 동시에 요청
+        connect면 Supabase 클라이언트가 아직 없어도 작업 스레드에서 만들어서 요청 (시작 시 내 일정 조회와 동시에 보냄)"""
+        if not self.overlays or (self.supabase_client is None and not connect):
+            return
+        generation = self.load_generation
+        for source in self.overlays.sources:
+            missing = self.overlays.missing_months(source, months)
+            if not missing:
+                continue
+            self.overlays.mark_pending(source, missing)
+            run_in_background(
+                self._fetch_source_months, source, missing,
+                on_success=lambda rows, source=source, missing=missing: self._apply_overlay(generation, source, missing, rows),
+                on_error=lambda e, source=source, missing=missing: self._apply_overlay(generation, source, missing, None, e))
+
+    def _fetch_source_months(self, source, months):
+        """다른 달력 테이블 하나에서 (연도, 월) 목록의 일정을 조회 (작업 스레드에서 실행)"""
+        rows = []
+        for (year, month), count in self._month_runs(months):
+            rows.extend(supabase_helper.get_calendar_data_range(
+                self.get_supabase_client(), month_start(year, month), month_start(*shift_month(year, month, count)),
+                table=source.table))
+        return rows
+
+    def _apply_overlay(self, generation, source, months, rows, error=None):
+        """다른 달력에서 받은 결과를 반영하고, 보이는 달이면 다시 그림 (메인 스레드)"""
+        if generation != self.load_generation:
+            return  # 그 사이 새로고침된 경우 오래된 결과는 버림
+        if rows is None:
+            print(f"{source.name} 달력을 불러오지 못했습니다: {error}")
+        self.overlays.store_months(source, months, rows)
+        if rows is not None and set(months) & set(self.visible_months()):
+            self.update_calendar()
 
     def get_logged_in_username(self):
-        """로그인한 사용자 이름을 가져오는 함수 (저장된 로그인 정보를 사용)"""
-        if os.path.exists(LOGIN_FILE):
-            try:
-                with open(LOGIN_FILE, "r") as f:
-                    login_data = json.load(f)
-                    return login_data.get("username", None)
-            except (json.JSONDecodeError, FileNotFoundError):
-                print("로그인 정보 파일이 손상되었거나 비어 있습니다.")
-                return None  # 파일이 손상되었으면 그냥 None 반환
-        return None
+        """로그인한 사용자 이름을 가져오는 함수 (세션이 처음 한 번 읽은 로그인 정보를 사용)"""
+        return self.user_session.get_username()
 
 
     def refresh_calendar(self):
-        """새로고침 버튼을 클릭했을 때 데이터를 다시 불러오고 달력을 갱신하는 메서드"""
+        """새로고침 버튼을 클릭했을 때 바뀐 일정만 백그라운드에서 받아와 해당 날짜만 다시 그리는 메서드"""
+        frame_monitor.mark('refresh')
         logging.info("데이터 새로고침 중...")
-        self.load_all_events()  # 새 데이터를 불러옴
-        self.update_calendar()  # 달력을 새로 그리기
+        if self.sync_watermark is None or self.supabase_client is None:
+            self.revalidate_in_background()  # 기준 시각이 없으면 전체를 다시 불러옴 (달력도 다시 그림)
+            return
+        synced_months = set(self.loaded_months) if RANGE_LOADING else None
+        # 삭제 기록 테이블이 없을 때만 쓰는 날짜 목록 조회 범위 (전체 로딩이어도 일정이 있는 달로 제한)
+        scan_months = synced_months if synced_months is not None else set(self.event_index.by_month)
+        generation = self.load_generation
+        run_in_background(
+            supabase_helper.within_budget, 'refresh', self._fetch_changes, self.sync_watermark, scan_months,
+            on_success=lambda changes: self._apply_changes(generation, synced_months, scan_months, changes),
+            on_error=self._on_sync_error)
+        # 다른 달력은 변경분 기준 시각이 없으므로 보이는 달을 다시 받음 (내 달력 조회와 동시에 진행)
+        self.overlays.reset()
+        self.fetch_overlays(self.visible_months())
+
+    def _on_sync_error(self, error):
+        print(f"변경분 동기화 중 오류가 발생해 전체를 다시 불러옵니다: {error}")
+        self.revalidate_in_background()
+
+    def start_live_sync(self):
+        """실시간 변경 구독 시작 (LIVE_SYNC가 켜져 있고 아직 시작하지 않았을 때만)"""
+        if not LIVE_SYNC or self.live_sync is not None:
+            return
+        # 구독 스레드에서 받은 변경은 Clock으로 메인 스레드에 넘겨서 반영
+        self.live_sync = LiveSync(on_change=lambda *change: Clock.schedule_once(
+            lambda dt: self.apply_live_change(*change)))
+        self.live_sync.start()
+
+    def stop_live_sync(self):
+        if self.live_sync is not None:
+            self.live_sync.stop()
+            self.live_sync = None
+
+    def apply_live_change(self, event_type, record, old_record):
+        """실시간으로 받은 INSERT/UPDATE/DELETE를 인덱스와 캐시에 반영하고 다시 그리기를 예약"""
+        if event_type == 'DELETE':
+            day = self._day_of_deleted_row(old_record or {})
+            if day is None or day in self.outbox or not self._is_synced_day(day):
+                return
+            self.event_index.remove_day(day)
+            self.local_cache.delete_day(day)
+        else:
+            day = day_key(record['schedule_day'])
+            if self.sync_watermark and record.get('updated_at'):
+                self.sync_watermark = max(self.sync_watermark, record['updated_at'])
+            if day in self.outbox or not self._is_synced_day(day):
+                return
+            self.event_index.upsert(record)
+            self.local_cache.upsert_event(record)
+        self.live_changed_days.add(day)
+        self.live_render_trigger()  # 여러 변경을 모아서 한 번만 다시 그림
+
+    def _day_of_deleted_row(self, old_record):
+        """삭제된 행의 날짜 (기본 키만 오는 경우 id로 인덱스에서 찾음)"""
+        if old_record.get('schedule_day'):
+            return day_key(old_record['schedule_day'])
+        row_id = old_record.get('id')
+        if row_id is None:
+            return None
+        return self.event_index.day_of_id(row_id)
+
+    def _flush_live_changes(self, dt):
+        changed_days, self.live_changed_days = self.live_changed_days, set()
+        logging.info(f"실시간 변경 {len(changed_days)}일치 반영")
+        self.refresh_days(changed_days)
+
+    def _is_synced_day(self, day, synced_months=None):
+        """서버와 동기화 중인 날짜인지 (전체 로딩이면 모든 날짜, 기간 로딩이면 불러온 달의 날짜)"""
+        if not RANGE_LOADING:
+            return True
+        return month_of(day) in (self.loaded_months if synced_months is None else synced_months)
+
+    def _fetch_changes(self, watermark, scan_months):
+        """기준 시각 이후 바뀐 행과 삭제 기록, 글로벌 색상, 반복 규칙을 조회 (작업 스레드에서 실행)
+        삭제 기록 테이블이 없으면 scan_months의 날짜 목록을 대신 받음"""
+        supabase_client = self.supabase_client
+
+        # 1) 추가/수정된 일정: updated_at이 기준 시각 이후인 행만 받음
+        rows = supabase_helper.get_calendar_changes_since(supabase_client, watermark)
+
+        # 2) 삭제된 일정: deleted_at이 기준 시각 이후인 삭제 기록만 받음 (변경 수에 비례)
+        server_days = None
+        try:
+            deleted = supabase_helper.get_deleted_days_since(supabase_client, watermark)
+        except Exception as e:
+            if resilience.is_transient(e):
+                raise
+            print(f"삭제 기록 테이블을 읽지 못해 불러온 달의 날짜 목록으로 삭제를 확인합니다: {e}")
+            deleted = None
+            server_days = set()
+            for (year, month), count in self._month_runs(scan_months):
+                server_days.update(day_key(day) for day in supabase_helper.get_calendar_days(
+                    supabase_client, month_start(year, month), month_start(*shift_month(year, month, count))))
+
+        # 3) 글로벌 색상
+        username = self.get_logged_in_username()
+        global_color = self.user_session.global_color(supabase_client)  # TTL이 지났으면 다른 기기의 변경 확인
+
+        # 4) 반복 일정 규칙 (규칙 수만큼만 받으므로 통째로 다시 받음)
+        rules = self._fetch_rules(supabase_client)
+        return username, rows, deleted, server_days, global_color, rules
+
+    def _apply_changes(self, generation, synced_months, scan_months, changes):
+        """조회한 변경분을 인덱스와 캐시에 반영하고 바뀐 날짜만 다시 그림 (메인 스레드)"""
+        if generation != self.load_generation:
+            return  # 그 사이 전체를 다시 불러온 경우 오래된 결과는 버림
+        username, rows, deleted, server_days, global_color, rules = changes
+        changed_days = set()
+
+        rows_by_day = {}
+        for row in rows:
+            rows_by_day.setdefault(day_key(row['schedule_day']), []).append(row)
+        for day, day_rows in rows_by_day.items():
+            self.sync_watermark = max([self.sync_watermark] + [row.get('updated_at') or self.sync_watermark for row in day_rows])
+            if day in self.outbox or not self._is_synced_day(day, synced_months):
+                continue  # 아직 전송하지 않은 날짜는 전송 후의 새로고침에 맡김
+            self.event_index.replace_day(day, day_rows)
+            for row in day_rows:
+                self.local_cache.upsert_event(row)
+            changed_days.add(day)
+
+        if deleted is not None:
+            # 삭제 기록보다 나중에 다시 저장된 날짜는 지우지 않음
+            latest = {day: max(row.get('updated_at') or '' for row in day_rows) for day, day_rows in rows_by_day.items()}
+            candidates = [day_key(day) for day, deleted_at in deleted.items() if deleted_at > latest.get(day_key(day), '')]
+            self.sync_watermark = max([self.sync_watermark, *deleted.values()])
+        else:
+            candidates = [day for day in self.event_index.by_day
+                          if month_of(day) in scan_months and day not in server_days]
+        deleted_days = [day for day in candidates
+                        if day in self.event_index.by_day and day not in self.outbox
+                        and self._is_synced_day(day, synced_months)]
+        for day in deleted_days:
+            self.event_index.remove_day(day)
+            self.local_cache.delete_day(day)
+            changed_days.add(day)
+
+        # 글로벌 색상이 바뀌었으면 모든 칸의 색이 바뀌므로 전체를 다시 그림
+        if global_color and color_codec.encode_color(self.parse_color(global_color)) != color_codec.encode_color(self.selected_color):
+            self.selected_color = self.parse_color(global_color)
+            self.local_cache.set_setting(f"global_color:{username}", global_color)
+            changed_days.update(self.cell_by_date)
+
+        # 반복 규칙이 바뀌었으면 어느 날짜에 걸리는지 알 수 없으므로 화면 전체를 다시 그림
+        if self._apply_rules(rules):
+            changed_days.update(self.cell_by_date)
+
+        logging.info(f"{len(changed_days)}일치 일정 변경 반영")
+        self.refresh_days(changed_days)
 
     def setGlobalColor(self):
         """글로벌 색상 선택 팝업을 열기 위한 메서드"""
+        self.color_before_edit = list(self.selected_color)  # 저장 실패 시 되돌릴 색상
+        from kivy.uix.colorpicker import ColorPicker  # 색상 선택기를 열 때만 import
         color_picker = ColorPicker()
 
         # 색상 선택기에서 색상 변경 시 호출되는 메서드
@@ -202,242 +738,426 @@ class CalendarLayout(BoxLayout):
         # 팝업 열기
         self.color_popup.open()
 
+    def open_search_popup(self):
+        """일정 내용 검색 팝업을 열기 (입력할 때마다 색인에서 찾아 결과 목록을 갱신)"""
+        if self.search_popup is None:
+            from kivy.uix.textinput import TextInput  # 검색 팝업을 처음 열 때만 import
+            from kivy.uix.scrollview import ScrollView
+            from kivy.uix.gridlayout import GridLayout
+            self.search_popup = ModalView(size_hint=(0.8, 0.8), padding=20)
+            popup_layout = BoxLayout(orientation='vertical', spacing=10)
+            self.search_input = TextInput(hint_text="검색할 일정 내용", font_name="NanumGothic.ttf",
+                                          multiline=False, size_hint_y=None, height=50)
+            self.search_input.bind(text=lambda instance, text: self.show_search_results(text))
+            self.search_results = GridLayout(cols=1, spacing=5, size_hint_y=None)
+            self.search_results.bind(minimum_height=self.search_results.setter('height'))
+            scroll_view = ScrollView()
+            scroll_view.add_widget(self.search_results)
+            popup_layout.add_widget(self.search_input)
+            popup_layout.add_widget(scroll_view)
+            popup_layout.add_widget(Button(text="닫기", font_name="NanumGothic.ttf", size_hint_y=None, height=40,
+                                           on_press=lambda instance: self.search_popup.dismiss()))
+            self.search_popup.add_widget(popup_layout)
+        self.search_popup.open()
+        self.show_search_results(self.search_input.text)
+
+    def show_search_results(self, query):
+        """검색 결과 날짜를 버튼 목록으로 표시 (누르면 해당 달로 이동)"""
+        self.search_results.clear_widgets()
+        days = self.search_index.search(query)
+        logging.debug("검색 '%s': %s건", query, len(days))
+        for day in days:
+            summary = " / ".join(event['schedule_value'] for event in self.event_index.events_for_day(day))
+            self.search_results.add_widget(Button(
+                text=f"{day}  {summary[:40]}", font_name="NanumGothic.ttf", size_hint_y=None, height=40,
+                on_press=lambda instance, day=day: self.go_to_search_result(day)))
+
+    def open_year_view(self):
+        """보고 있는 해의 연간 히트맵을 열기 (위젯 하나에 365일을 그림)"""
+        if self.year_popup is None:
+            from year_view import YearHeatmap  # 연간 보기를 처음 열 때만 import
+            self.year_popup = ModalView(size_hint=(0.95, 0.7), padding=10)
+            popup_layout = BoxLayout(orientation='vertical', spacing=10)
+            header = BoxLayout(size_hint_y=None, height=40, spacing=10)
+            self.year_view = YearHeatmap(calendar_layout=self)
+            year_label = Label(font_name="NanumGothic.ttf")
+            self.year_view.bind(year=lambda instance, year: setattr(year_label, 'text', f"{int(year)}년"))
+            header.add_widget(Button(text='<', size_hint_x=0.15, on_press=lambda instance: self.show_year(self.year_view.year - 1)))
+            header.add_widget(year_label)
+            header.add_widget(Button(text='>', size_hint_x=0.15, on_press=lambda instance: self.show_year(self.year_view.year + 1)))
+            header.add_widget(Button(text="닫기", font_name="NanumGothic.ttf", size_hint_x=0.2,
+                                     on_press=lambda instance: self.year_popup.dismiss()))
+            popup_layout.add_widget(header)
+            popup_layout.add_widget(self.year_view)
+            self.year_popup.add_widget(popup_layout)
+        self.year_popup.open()
+        self.show_year(self.year)
+
+    def show_year(self, year):
+        """연간 보기를 해당 해로 바꾸고, 아직 불러오지 않은 달은 캐시로 채운 뒤 백그라운드로 요청"""
+        self.year_view.year = int(year)
+        self.year_view.property('year').dispatch(self.year_view)  # 같은 해를 다시 열어도 라벨/그림 갱신
+        if RANGE_LOADING:
+            self.ensure_months_loaded([(int(year), month) for month in range(1, 13)])
+
+    def go_to_search_result(self, day):
+        """검색 결과 날짜가 있는 달로 바로 이동"""
+        self.search_popup.dismiss()
+        self.go_to_month(*month_of(day))
+
     def on_color(self, instance, value):
         """선택된 색상을 모든 버튼에 적용하는 메서드"""
+        frame_monitor.mark('color_change')  # 색상 선택기를 드래그하는 동안 매 프레임 불려서 달력 전체를 다시 그림
         self.selected_color = value  # 선택한 색상을 저장
         logging.info(f"새로 선택된 글로벌 색상: {self.selected_color}")
         self.update_calendar()  # 색상 선택 후 즉시 업데이트
 
     def on_save_color(self, instance):
         """선택한 색상을 Supabase에 저장하는 메서드"""
+        frame_monitor.mark('color_change')
         username = self.get_logged_in_username()  # 로그인된 사용자 이름 가져오기
 
         if username:
-            # Supabase에 글로벌 색상 저장
-            color_value = str(self.selected_color)  # 색상 값을 문자열로 변환
-            success = supabase_helper.save_global_color(username, color_value, self.supabase_client)
-
-            if success:
-                logging.info(f"{username}의 글로벌 색상이 성공적으로 저장되었습니다: {color_value}")
-                self.color_popup.dismiss()  # 저장 후 팝업 닫기
-                self.update_calendar()  # 색상 업데이트
-            else:
-                logging.error("글로벌 색상 저장에 실패했습니다.")
+            # 화면과 캐시에 먼저 반영하고, Supabase 저장은 백그라운드에서 진행
+            color_value = color_codec.encode_color(self.selected_color)  # 색상 값을 '#RRGGBBAA' 문자열로 변환
+            previous_color = self.color_before_edit
+            self.local_cache.set_setting(f"global_color:{username}", color_value)
+            self.color_popup.dismiss()  # 저장 후 팝업 닫기
+            self.update_calendar()  # 색상 업데이트
+
+            def on_result(success):
+                if success:
+                    logging.info(f"{username}의 글로벌 색상이 성공적으로 저장되었습니다: {color_value}")
+                else:
+                    self.rollback_global_color(username, previous_color)
+
+            run_in_background(
+                lambda: supabase_helper.within_budget(
+                    'save_color', self.user_session.save_global_color, color_value, self.get_supabase_client()),
+                on_success=on_result,
+                on_error=lambda e: self.rollback_global_color(username, previous_color))
         else:
             logging.error("로그인된 사용자가 없습니다.")
 
+    def rollback_global_color(self, username, previous_color):
+        """글로벌 색상 저장에 실패하면 이전 색상으로 되돌림"""
+        logging.error("글로벌 색상 저장에 실패했습니다.")
+        self.selected_color = previous_color
+        self.local_cache.set_setting(f"global_color:{username}", color_codec.encode_color(previous_color))
+        self.update_calendar()
+
     def calculate_brightness(self, color):
         # RGB 색상을 기반으로 밝기를 계산
-        r, g, b = color[:3]  # color는 [R, G, B, A] 형식이므로 앞의 세 값을 사용
-        brightness = 0.299 * r + 0.587 * g + 0.114 * b
-        return brightness
+        return color_codec.brightness(color)
 
 
     def get_events_for_month(self, year, month):
-        """특정 연도와 월에 해당하는 일정을 필터링"""
-        month_start = datetime(year, month, 1)  # 해당 월의 1일
-        next_month = (month_start + timedelta(days=32)).replace(day=1)  # 다음 달의 1일
-        month_end = next_month - timedelta(days=1)  # 해당 월의 마지막 날
-
-        # 해당 월의 일정만 필터링 (날짜 부분만 비교, 시간은 무시)
-        filtered_events = [event for event in self.events if month_start <= datetime.strptime(event['schedule_day'][:10], "%Y-%m-%d") <= month_end]
-        logging.info(f"{year}년 {month}월에 대한 {len(filtered_events)}개 일정 필터링")  # 필터링된 일정 로그 출력
-        return filtered_events
-
-    def update_calendar(self):
-        # 달력을 업데이트하기 전에 글로벌 색상 로그를 남김
-        logging.info(f"Updating calendar with global color: {self.selected_color}")
-    
-        # 수동으로 calendar_grid를 참조 (ids를 통해 kv 파일의 id로 연결)
-        calendar_grid = self.ids['calendar_grid']
-        calendar_grid.clear_widgets()
-        
+        """특정 연도와 월에 해당하는 일정을 {날짜: 일정 리스트} 형태로 반환"""
+        month_events = self.event_index.events_for_month(year, month)  # 인덱스에서 월 버킷을 바로 조회
+        logging.debug("%s년 %s월에 대한 %s일치 일정 조회", year, month, len(month_events))  # 조회된 일정 로그 출력
+        return month_events
+
+    def apply_event_upsert(self, event):
+        """저장한 일정을 인덱스와 로컬 캐시에 반영"""
+        self.event_index.upsert(event)
+        self.local_cache.upsert_event(event)
+
+    def apply_event_delete(self, date):
+        """삭제한 날짜의 일정을 인덱스와 로컬 캐시에서 제거"""
+        self.event_index.remove_day(date)
+        self.local_cache.delete_day(date)
+
+    def queue_event_upsert(self, event):
+        """일정 저장을 화면에 바로 반영하고 서버 전송은 대기열에 넣음"""
+        self.apply_event_upsert(event)
+        self.outbox.put_upsert(event)
+        self._flush_outbox_if_full()
+
+    def queue_event_delete(self, date):
+        """일정 삭제를 화면에 바로 반영하고 서버 전송은 대기열에 넣음"""
+        self.apply_event_delete(date)
+        self.outbox.put_delete(date)
+        self._flush_outbox_if_full()
+
+    def _flush_outbox_if_full(self):
+        if self.outbox.pending_count() >= self.outbox.batch_size:
+            self.flush_outbox()
+
+    def on_backend_state(self, previous, state):
+        """Supabase 연결이 끊겼다가 회복되면 쌓인 저장을 보내고 그동안 바뀐 일정을 받아옴"""
+        if state == resilience.OPEN:
+            print("서버 연결이 불안정해 캐시된 일정을 표시하고, 저장은 연결이 회복되면 보냅니다.")
+        elif state == resilience.CLOSED and previous != resilience.CLOSED:
+            logging.info("서버 연결이 회복되었습니다.")
+            self.flush_outbox()
+            self.refresh_calendar()
+
+    def flush_outbox(self):
+        """대기열에서 보낼 수 있는 작업을 꺼내 백그라운드에서 일괄 전송"""
+        if self.outbox_flushing or not self.outbox.pending_count():
+            return
+        if not resilience.accepting_requests():
+            return  # 회로가 열려 있는 동안은 대기열에 그대로 둠
+        batch = self.outbox.take_batch()
+        if not batch:
+            return  # 모두 재시도 대기 중
+        self.outbox_flushing = True
+
+        def on_success(result):
+            self.outbox_flushing = False
+            self.outbox.ack(batch)
+            logging.info(f"대기열 {len(batch)}건 전송 완료, 남은 작업 {self.outbox.pending_count()}건")
+            # 서버가 돌려준 저장 결과로 로컬 행을 교체 (다시 조회하지 않음)
+            saved_rows, deleted_rows = result
+            for row in saved_rows:
+                if row['schedule_day'] not in self.outbox:  # 전송 중에 다시 수정된 날짜는 건너뜀
+                    self.apply_event_upsert(row)
+            self._check_deleted_days(batch, deleted_rows)
+            if self.outbox.has_isolated():
+                self.flush_outbox()  # 거부된 묶음에서 나눈 작업은 이어서 한 건씩 보냄
+            else:
+                self._flush_outbox_if_full()
+
+        def on_error(error):
+            self.outbox_flushing = False
+            if resilience.is_transient(error):
+                self.outbox.retry_later(batch)
+                print(f"대기열 전송에 실패해 나중에 다시 시도합니다: {error}")
+                return
+            quarantined = self.outbox.reject(batch, error)
+            if len(batch) > 1:
+                logging.warning(f"서버가 대기열 {len(batch)}건을 거부해 한 건씩 나눠 다시 보냅니다: {error}")
+                self.flush_outbox()
+            elif quarantined:
+                self.report_rejected_writes(quarantined, error)
+            else:
+                print(f"{batch[0][0]} 일정 저장을 서버가 거부해 나중에 다시 시도합니다: {error}")
+
+        run_in_background(supabase_helper.within_budget, 'flush', self.outbox.send, batch,
+                          on_success=on_success, on_error=on_error)
+
+    def _check_deleted_days(self, batch, deleted_rows):
+        """삭제를 요청했는데 서버에서 지워진 행이 없는 날짜는 서버 데이터로 다시 불러옴
+        (서버에 없던 날짜면 다시 불러와도 그대로 비어 있음)"""
+        deleted_days = {day_key(row['schedule_day']) for row in deleted_rows or []}
+        missed = [day for day, op, row, seq in batch
+                  if op == 'delete' and day not in deleted_days and day not in self.outbox]
+        if missed:
+            logging.info(f"서버에서 삭제되지 않은 날짜 {len(missed)}일을 다시 불러옴: {missed}")
+            self.reload_months({month_of(day) for day in missed})
+
+    def reload_months(self, months):
+        """불러온 달 표시를 지우고 서버에서 다시 받아옴 (로컬에 남은 내용을 서버 데이터로 되돌릴 때)"""
+        self.loaded_months.difference_update(months)
+        self.fetch_months_in_background(sorted(months))
+
+    def report_rejected_writes(self, quarantined, error):
+        """서버가 계속 거부해 격리한 저장/삭제를 알리고, 해당 달을 서버 데이터로 다시 불러옴"""
+        for day, op, row in quarantined:
+            action = "삭제" if op == 'delete' else "저장"
+            print(f"{day} 일정 {action}을 서버가 계속 거부해 보내지 않습니다. 다시 수정해 주세요: {error}")
+        self.reload_months({month_of(day) for day, op, row in quarantined})  # 화면에 남은 보내지 못한 내용을 서버 데이터로 되돌림
+
+    def save_rule(self, rule):
+        """반복 규칙을 화면에 바로 반영하고 서버에는 백그라운드로 저장 (실패하면 되돌림)"""
+        previous = self.recurrence.rules.get(rule['id'])
+        self.recurrence.upsert(rule)
+        self.update_calendar()
 
-        # 해당 월의 시작 날짜와 끝 날짜 계산
-        first_day_of_month = datetime(self.year, self.month, 1)
-        next_month = (first_day_of_month + timedelta(days=32)).replace(day=1)
-        last_day_of_month = next_month - timedelta(days=1)
+        def on_success(saved):
+            self.recurrence.upsert(saved)
+            self.local_cache.set_setting(RULES_CACHE_KEY, json.dumps(self.recurrence.rows()))
 
-        # 이전 달의 마지막 날짜 계산
-        previous_month = first_day_of_month - timedelta(days=1)
-        previous_month_last_day = previous_month.day
-        first_weekday = (first_day_of_month.weekday() + 1) % 7
+        def on_error(error):
+            print(f"반복 일정 저장에 실패해 되돌립니다: {error}")
+            if previous is None:
+                self.recurrence.remove(rule['id'])
+            else:
+                self.recurrence.upsert(previous.row)
+            self.update_calendar()
 
-        # 현재 월과 이전/다음 달의 일정 필터링
-        current_month_events = self.get_events_for_month(self.year, self.month)
-        previous_month_events = self.get_events_for_month(self.year if self.month > 1 else self.year - 1, 12 if self.month == 1 else self.month - 1)
-        next_month_events = self.get_events_for_month(self.year if self.month < 12 else self.year + 1, 1 if self.month == 12 else self.month + 1)
+        run_in_background(supabase_helper.save_recurrence_rule, rule, self.get_supabase_client(),
+                          on_success=on_success, on_error=on_error)
 
+    def delete_rule(self, rule_id):
+        """반복 규칙을 화면에서 바로 빼고 서버에서는 백그라운드로 삭제 (실패하면 되돌림)"""
+        previous = self.recurrence.rules.get(rule_id)
+        if previous is None:
+            return
+        self.recurrence.remove(rule_id)
+        self.update_calendar()
 
-        # 오늘 날짜 가져오기
-        today = datetime.today()
-        today_str = today.strftime('%Y-%m-%d')  # YYYY-MM-DD 형식으로 변환
+        def on_success(result):
+            self.local_cache.set_setting(RULES_CACHE_KEY, json.dumps(self.recurrence.rows()))
 
+        def on_error(error):
+            print(f"반복 일정 삭제에 실패해 되돌립니다: {error}")
+            self.recurrence.upsert(previous.row)
+            self.update_calendar()
 
-        # 요일 맞추기 위해 이전 달의 날짜와 일정 채우기
-        for day in range(first_weekday):
-            prev_day = previous_month_last_day - first_weekday + day + 1
-            date_str = f"{self.year if self.month > 1 else self.year - 1}-{12 if self.month == 1 else self.month - 1:02}-{prev_day:02}"
-            day_events = [event for event in previous_month_events if event['schedule_day'][:10] == date_str]
-            # 다음 달 버튼: 글로벌 색상을 기반으로 채도 낮춘 색상 적용
-            darker_color = [c * 0.7 for c in self.selected_color]
+        run_in_background(supabase_helper.delete_recurrence_rule, rule_id, self.get_supabase_client(),
+                          on_success=on_success, on_error=on_error)
 
+    def _ensure_day_cells(self, count):
+        """필요한 개수만큼 날짜 칸 위젯을 준비 (새로 만드는 건 부족할 때 한 번뿐)"""
+        # 수동으로 calendar_grid를 참조 (ids를 통해 kv 파일의 id로 연결)
+        calendar_grid = self.ids['calendar_grid']
+        while len(self.day_cells) < count:
+            self.day_cells.append(DayCell(calendar_layout=self))
+
+        # 필요한 칸 수만큼만 붙이고, 남는 칸은 떼어 두었다가 재사용
+        for index, cell in enumerate(self.day_cells):
+            if index < count and cell.parent is None:
+                calendar_grid.add_widget(cell)
+            elif index >= count and cell.parent is not None:
+                calendar_grid.remove_widget(cell)
+        return self.day_cells[:count]
+
+    @instrumentation.timed('calendar.relayout_cells')
+    def _relayout_cells(self, dt):
+        """화면에 붙어 있는 날짜 칸의 글자/테두리를 한 번에 다시 배치"""
+        for cell in self.day_cells:
+            if cell.parent is not None:
+                cell.relayout()
+
+    @instrumentation.timed('calendar.build_month_model')
+    def build_month_model(self, year, month):
+        """해당 달 화면의 모든 칸 상태를 계산 (위젯은 건드리지 않음)"""
+        today = datetime.today().strftime('%Y-%m-%d')
+        layout = month_layout(year, month)  # 6x7 칸 배치는 달마다 한 번만 계산됨
+        cells = [self._cell_state(date_str, day_number, in_month, today)
+                 for date_str, day_number, in_month in layout.cells]
+        return MonthModel((year, month), cells, layout.months, today)
+
+    def month_model(self, year, month):
+        """캐시된 달 화면 모델을 반환하고, 없으면 계산해서 캐시에 넣음"""
+        model = self.month_cache.get((year, month), datetime.today().strftime('%Y-%m-%d'))
+        if model is None:
+            model = self.build_month_model(year, month)
+            self.month_cache.put(model)
+        return model
+
+    def _warm_adjacent_months(self, dt):
+        """화면 앞뒤 달의 모델을 한 프레임에 하나씩 미리 계산 (달을 넘기면 바로 교체만 하도록)"""
+        for offset in (1, -1):
+            year, month = shift_month(self.year, self.month, offset)
+            if (year, month) not in self.month_cache:
+                self.month_cache.put(self.build_month_model(year, month))
+                self.warm_trigger()  # 남은 달은 다음 프레임에
+                return
+
+    def on_selected_color(self, instance, value):
+        # 글로벌 색상이 바뀌면 모든 칸의 색이 바뀌므로 캐시된 달 화면을 모두 버림
+        if self.month_cache is not None:
+            self.month_cache.clear()
+            self._redraw_year_view()
+
+    @instrumentation.timed('calendar.update_calendar')
+    def update_calendar(self):
+        # 달력을 업데이트하기 전에 글로벌 색상 로그를 남김 (DEBUG 레벨이 아니면 문자열을 만들지 않음)
+        logging.debug("Updating calendar with global color: %s", self.selected_color)
+
+        # 캐시된 달이면 계산 없이 칸 상태만 교체
+        model = self.month_model(self.year, self.month)
+
+        # 날짜 칸 위젯은 한 번만 만들고, 이후에는 내용만 바꿔서 재사용
+        cells = self._ensure_day_cells(len(model.cells))
+        self.cell_by_date = {}
+        for cell, state in zip(cells, model.cells):
+            cell.day_number = state.day_number
+            cell.in_month = state.in_month
+            self.cell_by_date[state.date_str] = cell
+            self._apply_cell_state(cell, state)
+        self.warm_trigger()
+
+    @instrumentation.timed('calendar.refresh_days')
+    def refresh_days(self, days):
+        """바뀐 날짜의 칸만 다시 그림 (화면에 없는 날짜는 무시)"""
+        for day in days:
+            cell = self.cell_by_date.get(day)
+            if cell is not None:
+                self._render_cell(cell, day)
+
+    def _render_cell(self, cell, date_str):
+        """날짜 칸 하나의 글자, 색상, 오늘 테두리를 인덱스 기준으로 갱신"""
+        self._apply_cell_state(cell, self._cell_state(
+            date_str, cell.day_number, cell.in_month, datetime.today().strftime('%Y-%m-%d')))
+
+    def _apply_cell_state(self, cell, state):
+        cell.update_cell(state.date_str, state.text, state.background, state.text_color, state.border, state.markers)
+
+    def _cell_state(self, date_str, day_number, in_month, today):
+        """날짜 칸 하나의 글자, 색상, 오늘 테두리를 인덱스 기준으로 계산"""
+        instrumentation.count('calendar.cells_rendered')
+        # 하루짜리 일정을 앞에 두어 색상은 하루짜리 일정이 우선, 반복 일정은 해당 달을 펼친 결과에서 가져옴
+        day_events = self.event_index.events_for_day(date_str)
+        recurring_events = self.recurrence.events_for_day(date_str) if self.recurrence else None
+        if recurring_events:
+            day_events = day_events + recurring_events
+        # 겹쳐 보는 달력의 일정은 이름을 붙여 뒤에 이어 쓰고, 달력 색 표시를 칸 오른쪽 위에 그림
+        markers = ()
+        overlay_events = self.overlays.events_for_day(date_str) if self.overlays else None
+        if overlay_events:
+            day_events = day_events + [{'schedule_value': f"[{source.name}] {event['schedule_value']}", 'btn_color': None}
+                                       for source, event in overlay_events]
+            markers = tuple(dict.fromkeys(source.color for source, event in overlay_events))
+
+        if not in_month:
+            # 이전/다음 달 버튼: 글로벌 색상을 기반으로 채도 낮춘 색상 적용 (미리 계산된 값 사용)
+            global_style = color_codec.color_style(self.selected_color)
             if day_events:
                 event_texts = "\n\n".join([event['schedule_value'] for event in day_events])
-                event_text = f"{prev_day}\n\n{event_texts}"
-                logging.info(f"{date_str}에 대한 이전 달 일정 추가: {event_texts}")  # 일정 로그
+                event_text = f"{day_number}\n\n{event_texts}"
+                logging.debug("%s에 대한 이전/다음 달 일정 추가: %s", date_str, event_texts)  # 일정 로그
             else:
-                event_text = str(prev_day)
-                logging.info(f"{date_str}에 이전 달 일정 없음")  # 일정 없음 로그
+                event_text = str(day_number)
+                logging.debug("%s에 이전/다음 달 일정 없음", date_str)  # 일정 없음 로그
+            return CellState(date_str, day_number, in_month, event_text,
+                             global_style.dimmed, global_style.dimmed_text_color, None, markers)
 
-            # 버튼 배경색의 밝기에 따라 글자 색상 변경
-            brightness = self.calculate_brightness(darker_color)
-            if brightness > 0.5:
-                text_color = (0, 0, 0, 1)  # 밝으면 검정 글씨
-            else:
-                text_color = (1, 1, 1, 1)  # 어두우면 흰색 글씨
-
-            btn = Button(
-                text=event_text,
-                background_normal='',  # 기본 배경 이미지 제거
-                font_size='18',
-                halign='left',
-                valign='top',
-                padding=(10, 10),
-                font_name="NanumGothic.ttf",
-                background_color=darker_color,  # 채도를 낮춘 배경색 설정
-                color=text_color,  # 글자색 설정
-                text_size=(self.width, None),
-                on_press=lambda instance, m=self.month - 1: self.show_event_popup(instance, m))
-
-            btn.bind(size=lambda instance, size: setattr(instance, 'text_size', size))
-            calendar_grid.add_widget(btn)
-
-        # 해당 월의 날짜와 일정 추가
-        for day in range(1, last_day_of_month.day + 1):
-            date_str = f"{self.year}-{self.month:02}-{day:02}"
-            day_events = [event for event in current_month_events if event['schedule_day'][:10] == date_str]
+        if day_events:
+            event_texts = "\n\n".join([event['schedule_value'] for event in day_events])
+            event_text = f"{day_number}\n\n{event_texts}"
 
-            if day_events:
-                event_texts = "\n\n".join([event['schedule_value'] for event in day_events])
-                event_text = f"{day}\n\n{event_texts}"
+            # supabase에서 받아온 btn_color 값이 있으면 해당 값을 사용하고, 없으면 None 반환
+            btn_color_raw = day_events[0].get('btn_color', None)
+            # btn_color_raw가 None이거나 빈 문자열일 경우
+            btn_color = color_codec.decode_color(btn_color_raw) if btn_color_raw else None
 
-                # supabase에서 받아온 btn_color 값이 있으면 해당 값을 사용하고, 없으면 None 반환
-                btn_color_raw = day_events[0].get('btn_color', None)
-                # btn_color_raw가 None이거나 빈 문자열일 경우
-                if not btn_color_raw:
-                    btn_color = None
-                else:
-                    btn_color = self.parse_color(btn_color_raw)
+            # btn_color가 None일 경우 global_color로 대체
+            if btn_color is None:
+                btn_color = self.selected_color  # global_color 사용
+                logging.debug("Supabase에서 btn_color가 None 또는 빈 값으로 반환됨. Global color 사용: %s", btn_color)
 
-                # btn_color가 None일 경우 global_color로 대체
-                if btn_color is None:
-                    btn_color = self.selected_color  # global_color 사용
-                    logging.info(f"Supabase에서 btn_color가 None 또는 빈 값으로 반환됨. Global color 사용: {btn_color}")
+            logging.debug("%s에 대한 일정 추가: %s", date_str, event_texts)  # 일정 로그
+        else:
+            event_text = str(day_number)
+            btn_color = self.selected_color  # global color 적용
+            logging.debug("%s에 일정 없음. 기본 색상 사용.", date_str)  # 일정 없음 로그
 
-                logging.info(f"{date_str}에 대한 일정 추가: {event_texts}")  # 일정 로그
-            else:
-                event_text = str(day)
-                btn_color = self.selected_color  # global color 적용
-                logging.info(f"{date_str}에 일정 없음. 기본 색상 사용.")  # 일정 없음 로그
-
-            # 버튼 배경색의 밝기에 따라 글자 색상 변경
-            brightness = self.calculate_brightness(btn_color)
-            if brightness > 0.5:
-                text_color = (0, 0, 0, 1)  # 밝으면 검정 글씨
-            else:
-                text_color = (1, 1, 1, 1)  # 어두우면 흰색 글씨
-
-            btn = Button(
-                text=event_text,
-                background_normal='',  # 기본 배경 이미지 제거
-                font_size='18',
-                halign='left',
-                valign='top',
-                padding=(10, 10),
-                font_name="NanumGothic.ttf",
-                background_color=btn_color,  # 배경색 설정
-                color=text_color,  # 글자색 설정
-                text_size=(self.width, None),
-                on_press=lambda instance, m=self.month: self.show_event_popup(instance, m))
-
-
-            btn.bind(size=lambda instance, size: setattr(instance, 'text_size', size))
-
-            # 현재 날짜와 같은 날짜 버튼에 얇은 하얀색 테두리 추가
-            if date_str == today_str:
-                with btn.canvas.before:
-                    # btn_color의 정반대 색상 계산
-                    opposite_color = [1 - c for c in btn_color[:3]] + [btn_color[3]]  # RGB 각 색상의 정반대 색상 계산
-                    Color(*opposite_color)  # 동적 색상 변환
-                    # 초기 테두리 생성
-                    line = Line(rectangle=(btn.x, btn.y, btn.width, btn.height), width=2)
-
-                # 버튼 크기 변경 시 테두리 업데이트
-                btn.bind(size=lambda instance, size: setattr(line, 'rectangle', (instance.x, instance.y, instance.width, instance.height)))
-
-            calendar_grid.add_widget(btn)
-
-        # 다음 달의 날짜와 일정 추가
-        total_days_displayed = first_weekday + last_day_of_month.day
-        next_month_day = 1
-        while total_days_displayed < 35:  # 7 * 5 그리드를 위해 총 35칸 필요
-            date_str = f"{self.year if self.month < 12 else self.year + 1}-{1 if self.month == 12 else self.month + 1:02}-{next_month_day:02}"
-            day_events = [event for event in next_month_events if event['schedule_day'][:10] == date_str]
-            # 다음 달 버튼: 글로벌 색상을 기반으로 채도 낮춘 색상 적용
-            darker_color = [c * 0.7 for c in self.selected_color]
+        # 글자색/테두리색은 색상별로 한 번만 계산된 값을 사용
+        style = color_codec.color_style(btn_color)
 
-            if day_events:
-                event_texts = "\n\n".join([event['schedule_value'] for event in day_events])
-                event_text = f"{next_month_day}\n\n{event_texts}"
-                logging.info(f"{date_str}에 대한 다음 달 일정 추가: {event_texts}")  # 일정 로그
-            else:
-                event_text = str(next_month_day)
-                logging.info(f"{date_str}에 다음 달 일정 없음")  # 일정 없음 로그
-            
-            # 버튼 배경색의 밝기에 따라 글자 색상 변경
-            brightness = self.calculate_brightness(darker_color)
-            if brightness > 0.5:
-                text_color = (0, 0, 0, 1)  # 밝으면 검정 글씨
-            else:
-                text_color = (1, 1, 1, 1)  # 어두우면 흰색 글씨
-
-            btn = Button(
-                text=event_text,
-                background_normal='',  # 기본 배경 이미지 제거
-                font_size='18',
-                halign='left',
-                valign='top',
-                padding=(10, 10),
-                font_name="NanumGothic.ttf",
-                background_color=darker_color,  # 채도를 낮춘 배경색 설정
-                color=text_color,  # 글자색 설정
-                text_size=(self.width, None),
-                on_press=lambda instance, m=self.month + 1: self.show_event_popup(instance, m))
-
-            btn.bind(size=lambda instance, size: setattr(instance, 'text_size', size))
-            calendar_grid.add_widget(btn)
-
-            next_month_day += 1
-            total_days_displayed += 1
-
-    def show_event_popup(self, instance, month):
-        # instance.text에서 일자 부분만 추출하여 두 글자까지 자름
-        selected_day_str = instance.text.split("\n")[0][:2].strip()  # 버튼 텍스트의 첫 번째 줄만 두 글자로 자름
-        selected_day = int(selected_day_str)  # int로 변환하여 날짜로 사용
-
-        # 선택된 날짜를 기반으로 포맷
-        selected_date = datetime(self.year, month, selected_day)
-        formatted_date = selected_date.strftime("%Y-%m-%d")
+        # 현재 날짜와 같은 날짜 버튼에는 btn_color의 정반대 색상으로 테두리 표시
+        border_color = None
+        if date_str == today:
+            border_color = style.border
+
+        return CellState(date_str, day_number, in_month, event_text, style.background, style.text_color, border_color, markers)
 
+    def show_event_popup(self, formatted_date):
+        """선택한 날짜('YYYY-MM-DD')의 일정 입력 팝업을 표시"""
         logging.info(formatted_date)
 
         # 선택된 날짜에 해당하는 이벤트를 찾아 미리 content_input에 입력
-        day_events = [event for event in self.events if event['schedule_day'][:10] == formatted_date]
+        day_events = self.event_index.events_for_day(formatted_date)
 
         # 팝업 내용 설정
         popup_content = EventPopup()
         popup_content.ids.date_label.text = f"선택한 날짜: {formatted_date}"
+        recurring_events = self.recurrence.events_for_day(formatted_date)
+        if recurring_events:
+            popup_content.ids.date_label.text += f" (반복: {', '.join(event['schedule_value'] for event in recurring_events)})"
 
         # 선택한 날짜를 팝업에 전달
         popup_content.selected_date = formatted_date
@@ -461,25 +1181,45 @@ class CalendarLayout(BoxLayout):
         # 팝업 열기
         popup.open()
 
+    def go_to_month(self, year, month):
+        """지정한 (연도, 월)로 바로 이동"""
+        if (year, month) == (self.year, self.month):
+            return
+        frame_monitor.mark('navigation')
+        self.year, self.month = year, month
+        logging.info(f"{self.year}-{self.month}로 이동")
+        if RANGE_LOADING:
+            self.ensure_months_loaded(self.visible_months())  # 네트워크를 기다리지 않고 캐시/미리 불러온 일정으로 그림
+        self.update_calendar()
+        self.prefetch_adjacent_months()
+
     def go_to_next_month(self):
         """다음 달로 이동"""
+        frame_monitor.mark('navigation')
         if self.month == 12:
             self.month = 1
             self.year += 1
         else:
             self.month += 1
         logging.info(f"다음 달로 이동: {self.year}-{self.month}")  # 다음 달 이동 로그
+        if RANGE_LOADING:
+            self.ensure_months_loaded(self.visible_months())  # 네트워크를 기다리지 않고 캐시/미리 불러온 일정으로 그림
         self.update_calendar()
+        self.prefetch_adjacent_months()
 
     def go_to_previous_month(self):
         """이전 달로 이동"""
+        frame_monitor.mark('navigation')
         if self.month == 1:
             self.month = 12
             self.year -= 1
         else:
             self.month -= 1
         logging.info(f"이전 달로 이동: {self.year}-{self.month}")  # 이전 달 이동 로그
+        if RANGE_LOADING:
+            self.ensure_months_loaded(self.visible_months())  # 네트워크를 기다리지 않고 캐시/미리 불러온 일정으로 그림
         self.update_calendar()
+        self.prefetch_adjacent_months()
 
 class EventPopup(BoxLayout):
     popup = None  # Popup 객체를 저장할 속성
@@ -494,43 +1234,67 @@ class EventPopup(BoxLayout):
         self.parent_layout = layout_instance
 
     def submit_event(self, content):
+        frame_monitor.mark('save')
         # selected_date는 이미 문자열이므로 변환 없이 사용
         formatted_selected_date = self.selected_date
+        layout = self.parent_layout
         print(f"content 타입: {type(content)}")
-        # 기존 이벤트를 가져오는 로직
-        existing_event = supabase_helper.get_event_by_date(formatted_selected_date, self.parent_layout.supabase_client)
+        # 기존 이벤트는 화면에 표시 중인 인덱스에서 가져옴 (서버를 다시 조회하지 않음)
+        day_events = layout.event_index.events_for_day(formatted_selected_date)
+        existing_event = day_events[0] if day_events else None
 
         # 색상을 선택하지 않았을 경우, 기존 색상을 유지
         if self.rounded_color is None and existing_event and existing_event.get("btn_color"):
             self.rounded_color = existing_event["btn_color"]
-        
+
+        # 화면에 먼저 반영하고, Supabase 전송은 대기열에 모았다가 일괄로 보냄
         # 이벤트 추가/업데이트 후, schedule_value와 btn_color가 비었는지 확인
         if not content.strip() and not self.rounded_color:
             # 디버깅: 조건이 만족되는지 확인
             print("조건 만족: content와 rounded_color가 비어 있음, row 삭제")
             # 만약 content와 btn_color가 모두 비었으면, Supabase에서 해당 날짜의 row 삭제
-            supabase_helper.delete_empty_rows_for_date(
-                formatted_date=formatted_selected_date,
-                supabase_client=self.parent_layout.supabase_client
-            )
-            print(f"{formatted_selected_date}의 빈 row가 삭제되었습니다.")
+            layout.queue_event_delete(formatted_selected_date)
         else:
             # Supabase에 업데이트 또는 추가
             print("조건 불만족: row 업데이트 또는 추가")
-            supabase_helper.upsert_event_to_supabase(
-                date=formatted_selected_date,
-                value=content,
-                btn_color=self.rounded_color,
-                supabase_client=self.parent_layout.supabase_client
-            )
-            print(f"일정이 성공적으로 저장되었습니다: {formatted_selected_date}")
-        self.parent_layout.refresh_calendar()
-        
+            layout.queue_event_upsert({
+                "schedule_day": formatted_selected_date,
+                "schedule_value": content,
+                "btn_color": color_codec.encode_color(color_codec.decode_color(self.rounded_color)) if self.rounded_color else None
+            })
+        layout.refresh_days([formatted_selected_date])  # 저장한 날짜만 다시 그림
+
         if self.popup:
             self.popup.dismiss()  # 팝업 창 닫기
 
 
+    def submit_recurring_event(self, content, freq='weekly'):
+        """선택한 날짜부터 freq마다 반복되는 일정 규칙을 저장 (날짜마다 행을 만들지 않음)"""
+        frame_monitor.mark('save')
+        if not content.strip():
+            print("반복 일정 내용이 비어 있습니다.")
+            return
+        self.parent_layout.save_rule({
+            "id": str(uuid.uuid4()),
+            "start_day": self.selected_date,
+            "freq": freq,
+            "repeat_interval": 1,
+            "schedule_value": content,
+            "btn_color": color_codec.encode_color(color_codec.decode_color(self.rounded_color)) if self.rounded_color else None,
+        })
+        if self.popup:
+            self.popup.dismiss()
+
+    def stopRecurringEvents(self):
+        """선택한 날짜에 걸리는 반복 일정 규칙을 삭제"""
+        layout = self.parent_layout
+        for event in layout.recurrence.events_for_day(self.selected_date):
+            layout.delete_rule(event['rule_id'])
+        if self.popup:
+            self.popup.dismiss()
+
     def setLocalColor(self):
+        from kivy.uix.colorpicker import ColorPicker  # 색상 선택기를 열 때만 import
         color_picker = ColorPicker()
         color_picker.bind(color=self.on_color)
         popup = ModalView(size_hint=(0.8, 0.8), padding=20)
@@ -539,37 +1303,103 @@ class EventPopup(BoxLayout):
 
     def on_color(self, instance, color):
         # 색상 값을 반올림하여 2자리 소수로 변환
+        frame_monitor.mark('color_change')
         self.rounded_color = [round(c, 2) for c in color]
         logging.info(f"선택한 색상: {self.rounded_color}")
         # 여기에서 선택된 색상을 다른 곳에 사용할 수 있습니다.
 
     def clearLocalColor(self):
         """버튼 색상을 초기화하고 Supabase에서 해당 날짜의 btn_color를 null로 설정"""
+        frame_monitor.mark('save')
         formatted_date = self.selected_date  # 선택한 날짜를 참조하는 속성으로 설정해야 합니다.
-        
-        # Supabase 클라이언트 생성
-        supabase_client = supabase_helper.create_supabase_client()
-        
-        # btn_color를 null로 업데이트
-        success = supabase_helper.clear_color_for_date(formatted_date, supabase_client)
-        if success:
-            print(f"{formatted_date}의 btn_color가 성공적으로 초기화되었습니다.")
-        else:
-            print("btn_color 초기화에 실패했습니다.")
+        layout = self.parent_layout
+
+        # btn_color를 null로 바꾼 행을 대기열에 넣음 (같은 날짜의 다른 수정과 합쳐서 전송)
+        for event in layout.event_index.events_for_day(formatted_date):
+            layout.queue_event_upsert(dict(event.as_row(), btn_color=None))
+        layout.refresh_days([formatted_date])
+        print(f"{formatted_date}의 btn_color 초기화를 요청했습니다.")
 
     def get_global_color_from_supabase(self):
         """Supabase에서 global_color를 가져오는 함수"""
-        username = self.parent_layout.get_logged_in_username()  # CalendarLayout에서 로그인된 사용자 이름을 가져옴
-        global_color = supabase_helper.get_global_setting(username, self.parent_layout.supabase_client)
-        if global_color and 'global_color' in global_color:
-            return self.parent_layout.parse_color(global_color['global_color'])  # global_color를 파싱하여 반환
+        # 세션에 보관 중인 설정을 사용 (서버를 다시 조회하지 않음)
+        global_color = self.parent_layout.user_session.global_color()
+        if global_color:
+            return self.parent_layout.parse_color(global_color)  # global_color를 파싱하여 반환
         else:
             logging.info("global_color를 찾을 수 없으므로 기본 색상(흰색)을 사용합니다.")
             return [1, 1, 1, 1]  # 기본 흰색 반환
 
+def startup_report():
+    """import 시간과 첫 화면까지 걸린 시간, 첫 화면 전에 불러온 무거운 모듈을 정리"""
+    spans = instrumentation.metrics.snapshot()['spans']
+
+    def span_ms(name):
+        return spans[name]['total_ms'] if name in spans else None
+
+    import_ms, first_frame_ms = span_ms('startup.import_main'), span_ms('startup.first_frame')
+    return {
+        'import_ms': import_ms,
+        'import_kivy_ms': span_ms('startup.import_kivy'),
+        'import_app_modules_ms': span_ms('startup.import_app_modules'),
+        'first_frame_ms': first_frame_ms,
+        'import_budget_ms': IMPORT_BUDGET_MS,
+        'first_frame_budget_ms': FIRST_FRAME_BUDGET_MS,
+        'over_budget': bool((import_ms or 0) > IMPORT_BUDGET_MS or (first_frame_ms or 0) > FIRST_FRAME_BUDGET_MS),
+        'loaded_before_first_frame': [name for name in DEFERRED_MODULES if name in sys.modules],
+    }
+
+
+def log_startup_report():
+    report = startup_report()
+    logging.info(f"시작 보고서: import {report['import_ms']:.0f}ms "
+                 f"(kivy {report['import_kivy_ms']:.0f}ms, 앱 모듈 {report['import_app_modules_ms']:.0f}ms), "
+                 f"첫 화면 {report['first_frame_ms']:.0f}ms")
+    if report['over_budget']:
+        logging.warning(f"시작 시간이 허용치를 넘었습니다: import {IMPORT_BUDGET_MS}ms, 첫 화면 {FIRST_FRAME_BUDGET_MS}ms")
+    if report['loaded_before_first_frame']:
+        logging.warning(f"첫 화면 전에 불러온 무거운 모듈: {', '.join(report['loaded_before_first_frame'])}")
+    return report
+
+
 class CalendarApp(App):
     def build(self):
+        Window.bind(on_key_down=self.on_key_down)
+        Window.bind(on_flip=self.on_first_frame)
+        if frame_monitor.ENABLED:
+            frame_monitor.monitor.start()  # CALENDAR_FRAME_MONITOR=1로 실행했을 때만 프레임 시간 기록
         return CalendarLayout()
 
+    def on_first_frame(self, *args):
+        """첫 화면이 그려진 직후 한 번: 시작 보고서를 남기고 네트워크 준비는 백그라운드에서"""
+        Window.unbind(on_flip=self.on_first_frame)
+        instrumentation.metrics.observe('startup.first_frame', IMPORT_STARTED, time.perf_counter())
+        log_startup_report()
+        if STARTUP_WARMUP:
+            run_in_background(supabase_helper.warm_up)
+
+    def on_key_down(self, window, key, *args):
+        if key == METRICS_DUMP_KEY:
+            self.dump_metrics()
+            return True
+        return False
+
+    def dump_metrics(self):
+        """계측 요약을 로그로 출력하고, 트레이스를 켰으면 트레이스 파일도 저장"""
+        instrumentation.dump()
+        logging.info(f"Supabase 연결 상태: {supabase_helper.health()}")
+        if frame_monitor.monitor.running:
+            frame_monitor.monitor.write()
+            logging.info(f"프레임 요약 저장: {frame_monitor.monitor.path}")
+        if instrumentation.metrics.trace_enabled:
+            logging.info(f"트레이스 저장: {instrumentation.export_trace()}")
+
+    def on_stop(self):
+        self.root.stop_live_sync()  # 앱 종료 시 실시간 구독 연결 정리
+        data_worker.shutdown()
+        frame_monitor.monitor.stop()  # 켜져 있었으면 마지막 요약을 저장
+        if instrumentation.metrics.trace_enabled:
+            self.dump_metrics()  # CALENDAR_TRACE=1로 실행했으면 종료 시 자동으로 남김
+
 if __name__ == '__main__':
     CalendarApp().run()
\ No newline at end of file
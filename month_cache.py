@@ -0,0 +1,70 @@
+# 달력 화면 모델 LRU 캐시
+# 달을 넘길 때마다 35~42칸의 글자/색상을 다시 계산하지 않도록, 한 번 계산한 달 화면 모델을
+# (연도, 월) 키로 보관한다. 일정이 바뀐 날짜가 들어 있는 달만 정확히 지우고,
+# 글로벌 색상이 바뀌면 전부 지운다.
+from collections import OrderedDict, namedtuple
+
+MONTH_CACHE_SIZE = 6  # 보관할 최대 달 수 (앞뒤로 한 분기 정도 왔다 갔다 해도 다시 계산하지 않음)
+
+# 칸 하나의 화면 상태 (markers: 겹쳐 보는 다른 달력의 표시 색 목록)
+CellState = namedtuple('CellState', ['date_str', 'day_number', 'in_month', 'text', 'background', 'text_color', 'border',
+                                     'markers'], defaults=((),))
+
+
+class MonthModel:
+    """한 달 화면에 그릴 칸 상태 목록과, 무효화 판단에 쓰는 날짜/달 집합"""
+
+    __slots__ = ('key', 'cells', 'dates', 'months', 'today')
+
+    def __init__(self, key, cells, months, today):
+        self.key = key  # (연도, 월)
+        self.cells = cells  # [CellState, ...] 화면 순서대로
+        self.dates = frozenset(cell.date_str for cell in cells)  # 화면에 보이는 날짜 (앞뒤 달 칸 포함)
+        self.months = frozenset(months)  # 화면에 걸친 (연도, 월)
+        self.today = today  # 만들 때의 오늘 날짜 (날짜가 바뀌면 테두리 때문에 다시 만듦)
+
+
+class MonthCache:
+    """(연도, 월) -> MonthModel LRU 캐시"""
+
+    def __init__(self, max_size=MONTH_CACHE_SIZE):
+        self.max_size = max_size
+        self.models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.models
+
+    def __len__(self):
+        return len(self.models)
+
+    def get(self, key, today):
+        """캐시된 모델 반환 (없거나 날짜가 바뀌었으면 None)"""
+        model = self.models.get(key)
+        if model is None or model.today != today:
+            self.misses += 1
+            return None
+        self.models.move_to_end(key)
+        self.hits += 1
+        return model
+
+    def put(self, model):
+        self.models[model.key] = model
+        self.models.move_to_end(model.key)
+        while len(self.models) > self.max_size:
+            self.models.popitem(last=False)  # 가장 오래 안 본 달부터 삭제
+
+    def invalidate(self, days=None, months=None):
+        """바뀐 날짜나 달이 화면에 걸쳐 있는 모델만 삭제 (EventIndex 변경 알림으로 호출, 둘 다 None이면 전체 삭제)"""
+        if days is None and months is None:
+            self.models.clear()
+            return
+        days = set(days or ())
+        months = set(months or ())
+        for key in [key for key, model in self.models.items()
+                    if (days and not days.isdisjoint(model.dates)) or (months and not months.isdisjoint(model.months))]:
+            del self.models[key]
+
+    def clear(self):
+        self.models.clear()
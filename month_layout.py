@@ -0,0 +1,50 @@
+# 달 화면 배치 모델 (Kivy와 일정 데이터에 의존하지 않는 순수 계산)
+# (연도, 월)마다 6주 x 7일 = 42칸의 날짜, 일자, 이번 달 여부와 앞뒤 달에서 넘어온 칸을 한 번만 계산해서
+# lru_cache로 보관한다. 렌더링(update_calendar), 달 화면 캐시, 미리 불러오기가 같은 결과를 공유한다.
+import calendar
+from collections import namedtuple
+from functools import lru_cache
+
+from event_index import month_of, shift_month
+
+GRID_WEEKS = 6  # 어떤 달이든 들어가도록 항상 6주를 그림 (31일이 금/토요일에 시작하는 달은 6주 필요)
+GRID_CELLS = GRID_WEEKS * 7
+LAYOUT_CACHE_SIZE = 240  # 보관할 최대 달 수 (20년치)
+
+# 칸 하나: 'YYYY-MM-DD', 일자, 이번 달 날짜인지 여부
+LayoutCell = namedtuple('LayoutCell', ['date_str', 'day_number', 'in_month'])
+
+# 달 하나의 배치: 42칸과, 칸에 걸친 (연도, 월) 목록, 첫 칸 날짜와 마지막 칸 다음 날짜 (기간 조회용, 끝은 미포함)
+MonthLayout = namedtuple('MonthLayout', ['year', 'month', 'cells', 'months', 'first_date', 'end_date'])
+
+
+def first_weekday(year, month):
+    """해당 달 1일의 요일 (일요일=0 ... 토요일=6, 달력 화면의 요일 순서)"""
+    return (calendar.weekday(year, month, 1) + 1) % 7
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def month_layout(year, month):
+    """(연도, 월)의 6x7 배치 (같은 달은 다시 계산하지 않음)"""
+    previous_year, previous_month = shift_month(year, month, -1)
+    next_year, next_month = shift_month(year, month, 1)
+    previous_last_day = calendar.monthrange(previous_year, previous_month)[1]
+    last_day = calendar.monthrange(year, month)[1]
+    leading = first_weekday(year, month)
+
+    cells = []
+    # 요일을 맞추기 위한 이전 달 날짜
+    for day in range(previous_last_day - leading + 1, previous_last_day + 1):
+        cells.append(LayoutCell(f"{previous_year}-{previous_month:02}-{day:02}", day, False))
+    # 해당 달 날짜
+    for day in range(1, last_day + 1):
+        cells.append(LayoutCell(f"{year}-{month:02}-{day:02}", day, True))
+    # 6주를 채우는 다음 달 날짜
+    for day in range(1, GRID_CELLS - len(cells) + 1):
+        cells.append(LayoutCell(f"{next_year}-{next_month:02}-{day:02}", day, False))
+
+    months = tuple(sorted({month_of(cells[0].date_str), (year, month), month_of(cells[-1].date_str)}))
+    trailing = cells[-1].day_number
+    end_date = f"{next_year}-{next_month:02}-{trailing + 1:02}"  # 다음 달로 넘친 칸은 최대 14일이라 월을 넘지 않음
+    return MonthLayout(year, month, tuple(cells), months, cells[0].date_str, end_date)
+
@@ -0,0 +1,200 @@
+# 쓰기 지연 아웃박스 (write-behind outbox)
+# 일정 저장/삭제를 바로 Supabase로 보내지 않고 SQLite에 모아 두었다가,
+# 같은 날짜의 연속된 수정은 마지막 것 하나로 합쳐서 일괄 upsert/delete로 보낸다.
+# 앱을 껐다 켜거나 오프라인이어도 남아 있다가 다음 전송 때 다시 시도한다.
+# 서버가 일괄 전송을 거부하면(네트워크 오류가 아닌 제약 조건/검증 오류) 묶음을 한 건씩 나눠 다시 보내서
+# 정상 작업은 그대로 저장되게 하고, 혼자서도 MAX_REJECTIONS번 거부된 작업은 격리해서 더 보내지 않는다.
+import json
+import random
+import sqlite3
+import threading
+import time
+
+from event_index import day_key
+from local_cache import CACHE_FILE
+from resilience import is_transient
+
+OUTBOX_BATCH_SIZE = 50  # 한 번에 보낼 최대 건수 (대기 건수가 이만큼 쌓이면 바로 전송)
+MAX_RETRY_DELAY = 300  # 재시도 대기 시간 상한(초)
+MAX_REJECTIONS = 3  # 한 건만 보냈는데도 서버가 이만큼 거부하면 격리
+
+
+def _retry_delay(attempts):
+    """attempts번 실패한 작업의 다음 시도까지 대기 시간 (지수 백오프, 지터 포함)"""
+    return min(2 ** attempts, MAX_RETRY_DELAY) * random.uniform(0.5, 1.0)
+
+
+class Outbox:
+    """schedule_day별로 합쳐지는 영구 쓰기 대기열 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, send_batch, path=CACHE_FILE, batch_size=OUTBOX_BATCH_SIZE):
+        self.send_batch = send_batch  # send_batch(upsert 행 리스트, 삭제할 날짜 리스트): 실패하면 예외
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # 로컬 캐시와 같은 파일을 쓰지만 캐시 스키마 버전이 바뀌어도 지워지지 않도록 따로 관리
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox (schedule_day TEXT PRIMARY KEY, op TEXT NOT NULL, "
+                "data TEXT, seq INTEGER NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_try REAL NOT NULL DEFAULT 0)")
+            # 예전 버전에서 만든 대기열에 없는 컬럼 추가 (대기 중인 작업은 그대로 둠)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(outbox)")}
+            for column, definition in (('isolated', "INTEGER NOT NULL DEFAULT 0"),
+                                       ('rejections', "INTEGER NOT NULL DEFAULT 0"),
+                                       ('quarantined', "INTEGER NOT NULL DEFAULT 0"),
+                                       ('last_error', "TEXT")):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE outbox ADD COLUMN {column} {definition}")
+        # 대기 중인 날짜 -> (작업 종류, 행, 순번)을 메모리에도 들고 있어서 조회는 DB를 거치지 않음
+        self.entries = {}
+        self.seq = 0
+        for day, op, data, seq in self.conn.execute(
+                "SELECT schedule_day, op, data, seq FROM outbox WHERE quarantined = 0"):
+            self.entries[day] = (op, json.loads(data) if data else None, seq)
+            self.seq = max(self.seq, seq)
+
+    def __contains__(self, day):
+        return day_key(day) in self.entries
+
+    def pending_count(self):
+        """전송 대기 중인 날짜 수"""
+        return len(self.entries)
+
+    def pending(self):
+        """대기 중인 {날짜: (작업 종류, 행)} 반환 (화면/인덱스에 덮어씌울 때 사용)"""
+        with self.lock:
+            return {day: (op, row) for day, (op, row, seq) in self.entries.items()}
+
+    def put_upsert(self, row):
+        """일정 저장을 대기열에 추가 (같은 날짜의 이전 대기 작업은 이 작업으로 교체)"""
+        self._put(day_key(row['schedule_day']), 'upsert', row)
+
+    def put_delete(self, schedule_day):
+        """일정 삭제를 대기열에 추가 (같은 날짜의 이전 대기 작업은 이 작업으로 교체)"""
+        self._put(day_key(schedule_day), 'delete', None)
+
+    def _put(self, day, op, row):
+        with self.lock, self.conn:
+            self.seq += 1
+            self.entries[day] = (op, row, self.seq)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO outbox (schedule_day, op, data, seq, attempts, next_try) "
+                "VALUES (?, ?, ?, ?, 0, 0)",  # 새로 수정하면 격리/거부 기록도 초기화됨
+                (day, op, json.dumps(row, ensure_ascii=False) if row else None, self.seq))
+
+    def take_batch(self):
+        """지금 보낼 수 있는 작업을 최대 batch_size개 꺼냄: [(날짜, 작업 종류, 행, 순번), ...]
+        거부된 묶음에서 나온 작업이 있으면 그 작업 하나만 꺼냄"""
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT schedule_day, op, data, seq FROM outbox "
+                "WHERE quarantined = 0 AND isolated = 1 AND next_try <= ? ORDER BY seq LIMIT 1", (now,)).fetchall()
+            if not rows:
+                rows = self.conn.execute(
+                    "SELECT schedule_day, op, data, seq FROM outbox "
+                    "WHERE quarantined = 0 AND isolated = 0 AND next_try <= ? ORDER BY seq LIMIT ?",
+                    (now, self.batch_size)).fetchall()
+        return [(day, op, json.loads(data) if data else None, seq) for day, op, data, seq in rows]
+
+    def has_isolated(self):
+        """한 건씩 나눠 보내야 하는 작업이 지금 남아 있는지 (바로 이어서 전송할지 판단)"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT 1 FROM outbox WHERE quarantined = 0 AND isolated = 1 AND next_try <= ? LIMIT 1",
+                (time.time(),)).fetchone() is not None
+
+    def ack(self, batch):
+        """전송에 성공한 작업 제거 (전송 중에 같은 날짜가 다시 수정됐으면 새 작업은 남겨둠)"""
+        with self.lock, self.conn:
+            for day, op, row, seq in batch:
+                self.conn.execute("DELETE FROM outbox WHERE schedule_day = ? AND seq = ?", (day, seq))
+                if day in self.entries and self.entries[day][2] == seq:
+                    del self.entries[day]
+
+    def retry_later(self, batch):
+        """전송에 실패한 작업은 지수 백오프(지터 포함) 후 다시 시도하도록 표시"""
+        with self.lock, self.conn:
+            for day, op, row, seq in batch:
+                attempts = self.conn.execute(
+                    "SELECT attempts FROM outbox WHERE schedule_day = ? AND seq = ?", (day, seq)).fetchone()
+                if attempts is None:
+                    continue  # 전송 중에 새 작업으로 교체된 경우
+                self.conn.execute(
+                    "UPDATE outbox SET attempts = attempts + 1, next_try = ? WHERE schedule_day = ? AND seq = ?",
+                    (time.time() + _retry_delay(attempts[0]), day, seq))
+
+    def reject(self, batch, error):
+        """서버가 거부한 전송 처리: 여러 건이면 한 건씩 나눠 바로 다시 보내도록 표시하고,
+        한 건이면 백오프 후 다시 시도하되 MAX_REJECTIONS번째 거부면 격리
+        격리한 작업 [(날짜, 작업 종류, 행), ...]을 반환"""
+        quarantined = []
+        with self.lock, self.conn:
+            if len(batch) > 1:
+                self.conn.executemany(
+                    "UPDATE outbox SET isolated = 1 WHERE schedule_day = ? AND seq = ?",
+                    [(day, seq) for day, op, row, seq in batch])
+                return quarantined
+            for day, op, row, seq in batch:
+                state = self.conn.execute(
+                    "SELECT attempts, rejections FROM outbox WHERE schedule_day = ? AND seq = ?", (day, seq)).fetchone()
+                if state is None:
+                    continue  # 전송 중에 새 작업으로 교체된 경우
+                attempts, rejections = state
+                if rejections + 1 >= MAX_REJECTIONS:
+                    self.conn.execute(
+                        "UPDATE outbox SET rejections = rejections + 1, quarantined = 1, last_error = ? "
+                        "WHERE schedule_day = ? AND seq = ?", (str(error), day, seq))
+                    if day in self.entries and self.entries[day][2] == seq:
+                        del self.entries[day]
+                    quarantined.append((day, op, row))
+                else:
+                    self.conn.execute(
+                        "UPDATE outbox SET isolated = 1, attempts = attempts + 1, rejections = rejections + 1, "
+                        "next_try = ?, last_error = ? WHERE schedule_day = ? AND seq = ?",
+                        (time.time() + _retry_delay(attempts), str(error), day, seq))
+        return quarantined
+
+    def record_failure(self, batch, error):
+        """전송 실패 처리: 네트워크 오류면 묶음 전체를 나중에 다시 보내고, 서버가 거부했으면 reject
+        격리한 작업 목록을 반환 (네트워크 오류면 빈 목록)"""
+        if is_transient(error):
+            self.retry_later(batch)
+            return []
+        return self.reject(batch, error)
+
+    def quarantined(self):
+        """격리된 작업 [(날짜, 작업 종류, 행, 마지막 오류), ...] (같은 날짜를 다시 수정하면 목록에서 빠짐)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT schedule_day, op, data, last_error FROM outbox WHERE quarantined = 1 ORDER BY seq").fetchall()
+        return [(day, op, json.loads(data) if data else None, error) for day, op, data, error in rows]
+
+    def send(self, batch):
+        """꺼낸 작업을 일괄 upsert/delete로 전송하고 send_batch의 결과를 반환 (실패하면 예외)"""
+        upserts = [row for day, op, row, seq in batch if op == 'upsert']
+        deletes = [day for day, op, row, seq in batch if op == 'delete']
+        return self.send_batch(upserts, deletes)
+
+    def flush(self):
+        """보낼 수 있는 작업을 모두 동기적으로 전송하고 전송한 건수를 반환 (테스트/종료 시 사용)
+        네트워크 오류면 예외를 그대로 올리고, 서버가 거부한 작업은 나눠 보내거나 나중으로 미룸"""
+        sent = 0
+        while True:
+            batch = self.take_batch()
+            if not batch:
+                return sent
+            try:
+                self.send(batch)
+            except Exception as e:
+                self.record_failure(batch, e)
+                if is_transient(e):
+                    raise
+                continue
+            self.ack(batch)
+            sent += len(batch)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,155 @@
+# 반복 일정
+# 매주/매달 같은 일정을 날짜마다 행으로 만들지 않고 규칙 하나(supabase_helper.RULE_TABLE)로 저장한 뒤,
+# 화면에 보이는 달의 날짜만 그때그때 펼쳐서(expand) 달 단위로 캐시한다.
+# 반복 기간이 아무리 길어도 저장/전송하는 데이터는 규칙 한 행뿐이다.
+import calendar
+from datetime import date, timedelta
+
+from event_index import day_key, shift_month, month_start
+
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+MAX_CACHED_MONTHS = 24  # 펼친 결과를 보관할 최대 달 수
+
+
+def _parse_day(text):
+    text = day_key(text)
+    return date(int(text[:4]), int(text[5:7]), int(text[8:10]))
+
+
+def _add_months(day, months, anchor_day):
+    """day에서 months개월 뒤의 같은 일자 (그 달에 없는 일자면 None, 예: 31일)"""
+    year, month = shift_month(day.year, day.month, months)
+    if anchor_day > calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, anchor_day)
+
+
+class RecurrenceRule:
+    """반복 규칙 하나: start_day부터 interval 간격으로 freq마다 반복 (until/count가 있으면 거기까지)"""
+
+    __slots__ = ('id', 'start', 'freq', 'interval', 'until', 'count', 'schedule_value', 'btn_color', 'row')
+
+    def __init__(self, row):
+        self.row = row  # 서버 행 그대로 (캐시에 저장할 때 사용)
+        self.id = row.get('id')
+        self.start = _parse_day(row['start_day'])
+        self.freq = row.get('freq') or 'weekly'
+        if self.freq not in FREQUENCIES:
+            raise ValueError(f"지원하지 않는 반복 주기입니다: {self.freq}")
+        self.interval = max(int(row.get('repeat_interval') or 1), 1)
+        self.until = _parse_day(row['until_day']) if row.get('until_day') else None
+        self.count = int(row['count']) if row.get('count') else None
+        self.schedule_value = row.get('schedule_value') or ''
+        self.btn_color = row.get('btn_color') or None
+
+    def _last_day(self):
+        """마지막 반복 날짜 (끝이 없으면 None)"""
+        last = self.until
+        if self.count is not None and self.freq in ('daily', 'weekly'):
+            step = self.interval * (7 if self.freq == 'weekly' else 1)
+            by_count = self.start + timedelta(days=step * (self.count - 1))
+            last = by_count if last is None else min(last, by_count)
+        return last
+
+    def occurrences(self, first, last):
+        """first~last(포함, date) 사이의 반복 날짜를 순서대로 반환 (앞부분을 하나씩 세지 않고 바로 건너뜀)"""
+        end = self._last_day()
+        last = last if end is None else min(last, end)
+        if last < self.start or last < first:
+            return
+        if self.freq in ('daily', 'weekly'):
+            step = self.interval * (7 if self.freq == 'weekly' else 1)
+            skip = max((first - self.start).days, 0)
+            day = self.start + timedelta(days=-(-skip // step) * step)  # first 이상인 첫 반복 날짜
+            while day <= last:
+                yield day
+                day += timedelta(days=step)
+            return
+        # 매달/매년: 일자가 없는 달(31일, 2월 29일)은 건너뜀 (건너뛴 회차도 count에 포함)
+        step = self.interval * (12 if self.freq == 'yearly' else 1)
+        months_to_first = max((first.year - self.start.year) * 12 + first.month - self.start.month, 0)
+        index = months_to_first // step  # first가 있는 달 근처의 반복 회차부터
+        while True:
+            if self.count is not None and index >= self.count:
+                return
+            day = _add_months(self.start, index * step, self.start.day)
+            index += 1
+            if day is None:
+                continue
+            if day > last:
+                return
+            if day >= first:
+                yield day
+
+    def event_for(self, day):
+        """펼친 날짜 하나를 일반 일정 행과 같은 모양으로 반환"""
+        return {
+            'schedule_day': day.isoformat(),
+            'schedule_value': self.schedule_value,
+            'btn_color': self.btn_color,
+            'rule_id': self.id,
+        }
+
+
+class RecurrenceIndex:
+    """반복 규칙 목록과, 달 단위로 펼친 결과 캐시"""
+
+    def __init__(self, rows=None):
+        self.rules = {}  # 규칙 id -> RecurrenceRule
+        self.month_events = {}  # (연도, 월) -> {'YYYY-MM-DD': [펼친 일정, ...]}
+        self.listener = None  # 규칙이 바뀌면 listener() 호출 (화면 캐시 무효화용)
+        if rows:
+            self.replace(rows)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def rows(self):
+        return [rule.row for rule in self.rules.values()]
+
+    def replace(self, rows):
+        """규칙 목록 전체를 교체"""
+        self.rules = {}
+        for row in rows:
+            try:
+                rule = RecurrenceRule(row)
+            except (KeyError, ValueError) as e:
+                print(f"잘못된 반복 규칙을 건너뜁니다: {row} ({e})")
+                continue
+            self.rules[rule.id] = rule
+        self._changed()
+
+    def upsert(self, row):
+        """규칙 하나 추가/교체"""
+        rule = RecurrenceRule(row)
+        self.rules[rule.id] = rule
+        self._changed()
+
+    def remove(self, rule_id):
+        if self.rules.pop(rule_id, None) is not None:
+            self._changed()
+
+    def _changed(self):
+        self.month_events = {}
+        if self.listener is not None:
+            self.listener()
+
+    def events_for_month(self, year, month):
+        """해당 달에 펼쳐지는 반복 일정 {날짜: 일정 리스트} (처음 요청할 때만 계산)"""
+        key = (year, month)
+        events = self.month_events.get(key)
+        if events is None:
+            first = _parse_day(month_start(year, month))
+            last = first.replace(day=calendar.monthrange(year, month)[1])
+            events = {}
+            for rule in self.rules.values():
+                for day in rule.occurrences(first, last):
+                    events.setdefault(day.isoformat(), []).append(rule.event_for(day))
+            if len(self.month_events) >= MAX_CACHED_MONTHS:
+                self.month_events.pop(next(iter(self.month_events)))  # 가장 먼저 펼친 달부터 버림
+            self.month_events[key] = events
+        return events
+
+    def events_for_day(self, schedule_day):
+        day = day_key(schedule_day)
+        return self.events_for_month(int(day[:4]), int(day[5:7])).get(day, [])
@@ -0,0 +1,184 @@
+# 네트워크 호출 보호 (시간 제한, 재시도, 서킷 브레이커)
+# supabase_helper의 모든 요청은 _execute를 거쳐 이 모듈의 call()로 실행된다.
+# - 요청마다 CALL_TIMEOUT 안에 끝나지 않으면 기다리지 않고 CallTimeout을 낸다 (요청 스레드는 따로 돌다 끝남).
+# - 조회처럼 여러 번 보내도 되는 요청은 네트워크 오류나 서버 오류(5xx/408/429)일 때 지터를 넣은 지수 백오프로 다시 시도한다.
+# - 네트워크/서버 오류가 연달아 BREAKER_FAILURES번 나면 회로를 열어 BREAKER_RESET초 동안 요청을 보내지 않고
+#   바로 BackendUnavailable을 낸다. 그동안 화면은 로컬 캐시로 그리고, 저장은 아웃박스에 쌓인다.
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import instrumentation
+
+CALL_TIMEOUT = 10  # 요청 하나의 제한 시간(초)
+READ_ATTEMPTS = 3  # 조회 요청의 최대 시도 횟수 (첫 시도 포함)
+BACKOFF_BASE = 0.2  # 첫 재시도 전 대기 시간(초), 시도마다 두 배
+BACKOFF_MAX = 2.0  # 재시도 대기 시간 상한(초)
+BREAKER_FAILURES = 5  # 연속으로 이만큼 실패하면 회로를 엶
+BREAKER_RESET = 30  # 회로를 연 뒤 시험 요청을 보내기까지 기다리는 시간(초)
+CALL_WORKERS = 8  # 요청을 실행하는 스레드 수 (시간 제한을 넘긴 요청이 스레드를 잡고 있을 수 있어 넉넉히)
+
+# 일시적인 네트워크 오류로 보는 예외 이름 (httpx를 import하지 않고 이름으로 확인)
+TRANSIENT_ERROR_NAMES = {'TransportError', 'TimeoutException', 'NetworkError', 'RemoteProtocolError'}
+# 다시 보내면 성공할 수 있는 HTTP 상태 코드 (5xx 전체와 함께): 요청 시간 초과, 요청 과다
+TRANSIENT_STATUS_CODES = {408, 429}
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class BackendUnavailable(ConnectionError):
+    """회로가 열려 있어 요청을 보내지 않았을 때"""
+
+
+class CallTimeout(TimeoutError):
+    """요청이 제한 시간 안에 끝나지 않았을 때"""
+
+
+def status_code(error):
+    """예외에 담긴 HTTP 상태 코드 (없으면 None)
+    httpx.HTTPStatusError는 response.status_code, postgrest APIError는 JSON이 아닌 응답(게이트웨이 5xx 등)일 때
+    code에 상태 코드 문자열을 담는다. PostgREST 오류 코드(PGRST...)나 SQLSTATE(5자리)는 상태 코드가 아님."""
+    for value in (getattr(error, 'status_code', None),
+                  getattr(getattr(error, 'response', None), 'status_code', None),
+                  getattr(error, 'code', None)):
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str) and len(value) == 3 and value.isdigit():
+            return int(value)
+    return None
+
+
+def is_transient(error):
+    """다시 시도하거나 회로 상태에 반영할 오류인지: 네트워크 오류와 서버 오류(5xx/408/429)
+    (잘못된 쿼리/권한 같은 4xx 오류는 아님)"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    code = status_code(error)
+    return code is not None and (code >= 500 or code in TRANSIENT_STATUS_CODES)
+
+
+class CircuitBreaker:
+    """연속 실패 횟수로 열리고, 일정 시간 뒤 시험 요청 하나로 닫히는 회로 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, failures=BREAKER_FAILURES, reset_after=BREAKER_RESET, clock=time.monotonic):
+        self.failure_limit = failures
+        self.reset_after = reset_after
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0  # 연속 실패 횟수
+        self.opened_at = None
+        self.trial_running = False  # 반쯤 열린 상태에서 시험 요청이 진행 중인지
+        self.listeners = []  # 상태가 바뀌면 listener(이전 상태, 새 상태) 호출 (호출한 스레드에서)
+
+    def allow(self):
+        """지금 요청을 보내도 되는지 (열린 지 reset_after가 지났으면 시험 요청 하나만 허용)"""
+        with self.lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_after:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.trial_running = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def release_trial(self):
+        """시험 요청이 연결 상태를 판단할 수 없는 오류(4xx 등)로 끝났을 때, 상태는 그대로 두고 다음 시험 요청을 허용"""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_limit):
+                self.opened_at = self.clock()
+                self._set_state(OPEN)
+
+    def reset(self):
+        with self.lock:
+            self.failures = 0
+            self.trial_running = False
+            self.opened_at = None
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def _set_state(self, state):
+        """상태 변경 (lock 안에서 호출)"""
+        previous, self.state = self.state, state
+        instrumentation.count(f"supabase.breaker_{state}")
+        logging.warning(f"Supabase 회로 상태: {previous} -> {state} (연속 실패 {self.failures}회)")
+        for listener in list(self.listeners):
+            listener(previous, state)
+
+    def snapshot(self):
+        """현재 상태 요약 (화면 표시/계측용)"""
+        with self.lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(self.reset_after - (self.clock() - self.opened_at), 0)
+            return {'state': self.state, 'failures': self.failures, 'retry_in': retry_in}
+
+
+breaker = CircuitBreaker()
+_executor = ThreadPoolExecutor(max_workers=CALL_WORKERS, thread_name_prefix="supabase_call")
+
+
+def backoff_delay(attempt):
+    """attempt번째 재시도 전 대기 시간 (0~지수 백오프 사이 무작위, 여러 기기가 동시에 다시 보내지 않도록)"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _call_once(func, timeout):
+    future = _executor.submit(func)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        future.cancel()
+        instrumentation.count('supabase.timeouts')
+        raise CallTimeout(f"요청이 {timeout}초 안에 끝나지 않았습니다.") from None
+
+
+def call(func, idempotent=False, timeout=None, attempts=None):
+    """func()를 제한 시간과 회로 상태를 지키며 실행 (idempotent면 네트워크/서버 오류 시 다시 시도)"""
+    timeout = CALL_TIMEOUT if timeout is None else timeout
+    attempts = (READ_ATTEMPTS if idempotent else 1) if attempts is None else attempts
+    for attempt in range(attempts):
+        if not breaker.allow():
+            instrumentation.count('supabase.rejected')
+            raise BackendUnavailable("Supabase 연결이 불안정해 잠시 요청을 보내지 않습니다.")
+        try:
+            result = _call_once(func, timeout)
+        except Exception as e:
+            if not is_transient(e):
+                breaker.release_trial()  # 요청 자체의 문제(4xx 등)는 연결 상태와 무관하므로 회로 상태에 반영하지 않음
+                raise
+            breaker.record_failure()
+            if attempt + 1 >= attempts:
+                raise
+            instrumentation.count('supabase.retries')
+            delay = backoff_delay(attempt)
+            logging.info(f"요청 실패, {delay:.2f}초 후 다시 시도 ({attempt + 1}/{attempts - 1}): {e}")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def accepting_requests():
+    """지금 요청을 보낼 수 있는 상태인지 (회로가 열려 있고 시험 요청 시간이 아직 안 됐으면 False)"""
+    state = breaker.snapshot()
+    return state['state'] != OPEN or state['retry_in'] == 0
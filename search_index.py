@@ -0,0 +1,103 @@
+# 일정 내용 검색 인덱스
+# schedule_value를 글자 2개씩 자른 바이그램(bigram) -> 날짜 집합으로 보관하는 역색인.
+# 한국어는 띄어쓰기로 단어를 나누기 어려우므로 글자 n-gram을 쓰고, 공백/대소문자는 무시한다.
+# EventIndex의 변경 알림(listener)을 받아 바뀐 날짜/달만 다시 색인하므로 전체를 다시 만들 일이 없다.
+import heapq
+
+import instrumentation
+from event_index import month_of
+
+GRAM_SIZE = 2  # n-gram 길이 (한 글자 검색은 날짜별 본문에서 직접 찾음)
+MAX_RESULTS = 200  # 검색 결과 최대 개수
+
+
+def normalize(text):
+    """검색용 문자열: 공백을 없애고 소문자로 (한글은 그대로)"""
+    return ''.join((text or '').split()).lower()
+
+
+def grams(text):
+    """정규화한 문자열의 n-gram 집합"""
+    return {text[index:index + GRAM_SIZE] for index in range(len(text) - GRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """날짜별 일정 내용의 n-gram 역색인"""
+
+    def __init__(self):
+        self.postings = {}  # n-gram -> 해당 n-gram이 들어 있는 날짜 집합
+        self.texts = {}  # 'YYYY-MM-DD' -> 정규화한 일정 내용 (후보 확인과 재색인에 사용)
+        self.days_by_month = {}  # (연도, 월) -> 색인된 날짜 집합 (달 단위 교체용)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def clear(self):
+        self.postings = {}
+        self.texts = {}
+        self.days_by_month = {}
+
+    def _remove(self, day):
+        text = self.texts.pop(day, None)
+        if text is None:
+            return
+        for gram in grams(text):
+            days = self.postings.get(gram)
+            if days is not None:
+                days.discard(day)
+                if not days:
+                    del self.postings[gram]
+        month_days = self.days_by_month.get(month_of(day))
+        if month_days is not None:
+            month_days.discard(day)
+            if not month_days:
+                del self.days_by_month[month_of(day)]
+
+    def set_day(self, day, events):
+        """해당 날짜의 색인을 주어진 일정 리스트 내용으로 교체 (빈 리스트면 제거)"""
+        self._remove(day)
+        text = normalize(' '.join(event.get('schedule_value') or '' for event in events))
+        if not text:
+            return
+        self.texts[day] = text
+        self.days_by_month.setdefault(month_of(day), set()).add(day)
+        for gram in grams(text):
+            self.postings.setdefault(gram, set()).add(day)
+
+    @instrumentation.timed('search.rebuild')
+    def rebuild(self, by_day):
+        """{날짜: 일정 리스트} 전체로 색인을 새로 만듦"""
+        self.clear()
+        for day, events in by_day.items():
+            self.set_day(day, events)
+
+    def sync(self, event_index, days=None, months=None):
+        """EventIndex 변경 알림에 맞춰 바뀐 날짜/달만 다시 색인 (둘 다 None이면 전체)"""
+        if days is None and months is None:
+            self.rebuild(event_index.by_day)
+            return
+        for day in days or ():
+            self.set_day(day, event_index.events_for_day(day))
+        for month in months or ():
+            for day in list(self.days_by_month.get(month, ())):
+                self._remove(day)
+            for day, events in event_index.events_for_month(*month).items():
+                self.set_day(day, events)
+
+    @instrumentation.timed('search.query')
+    def search(self, query, limit=MAX_RESULTS):
+        """query가 들어 있는 날짜를 최근 날짜부터 반환"""
+        query = normalize(query)
+        if not query:
+            return []
+        if len(query) < GRAM_SIZE:
+            candidates = self.texts.keys()
+        else:
+            # 가장 짧은 posting부터 교집합 (하나라도 없으면 결과 없음)
+            postings = sorted((self.postings.get(gram, ()) for gram in grams(query)), key=len)
+            if not postings[0]:
+                return []
+            candidates = set(postings[0]).intersection(*postings[1:])
+        # n-gram이 모두 있어도 순서가 다를 수 있으므로 본문에서 한 번 더 확인
+        texts = self.texts
+        return heapq.nlargest(limit, (day for day in candidates if query in texts[day]))
@@ -0,0 +1,7 @@
+# 테스트 공통 설정: 저장소 최상위 모듈을 import할 수 있게 하고, Kivy가 명령줄 인자/콘솔 로그를 건드리지 않게 함
+import os
+import sys
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
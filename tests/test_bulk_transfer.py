@@ -0,0 +1,103 @@
+# 일괄 내보내기/가져오기: CSV/ICS 왕복, iCalendar 이스케이프/줄 접기, 청크 재시도 (fake_supabase 사용)
+import pytest
+
+import bulk_transfer
+import fake_supabase
+import resilience
+import supabase_helper
+from resilience import CircuitBreaker
+
+TRICKY_ROWS = [
+    {'schedule_day': "2024-01-01", 'schedule_value': "새해, 첫날", 'btn_color': "#FF0000FF"},
+    {'schedule_day': "2024-01-02", 'schedule_value': '따옴표 "안" 내용', 'btn_color': None},
+    {'schedule_day': "2024-01-03", 'schedule_value': "여러 줄\n두 번째 줄", 'btn_color': None},
+    {'schedule_day': "2024-01-04", 'schedule_value': "세미콜론; 역슬래시 \\ 쉼표,", 'btn_color': "#00FF00FF"},
+    {'schedule_day': "2024-02-29", 'schedule_value': "긴 한글 일정 " * 20, 'btn_color': None},
+]
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch):
+    monkeypatch.setattr(resilience, 'breaker', CircuitBreaker())
+    monkeypatch.setattr(resilience, 'backoff_delay', lambda attempt: 0)
+
+
+def _backend(rows=()):
+    fake = fake_supabase.FakeSupabase()
+    if rows:
+        fake.table('minsik_calender').upsert([dict(row) for row in rows]).execute()
+    return fake
+
+
+def _stored(fake):
+    return [{key: row.get(key) for key in bulk_transfer.CSV_FIELDS}
+            for day, row in sorted(fake.tables['minsik_calender'].rows.items())]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ics"])
+def test_export_import_export_round_trip(tmp_path, fmt):
+    source = _backend(TRICKY_ROWS)
+    first = tmp_path / f"first.{fmt}"
+    assert bulk_transfer.export_events(str(first), source, page_size=2) == len(TRICKY_ROWS)
+
+    target = _backend()
+    assert bulk_transfer.import_events(str(first), target, batch_size=2, workers=2) == len(TRICKY_ROWS)
+    assert _stored(target) == _stored(source)
+
+    second = tmp_path / f"second.{fmt}"
+    bulk_transfer.export_events(str(second), target, page_size=3)
+    assert second.read_bytes() == first.read_bytes()
+
+
+def test_export_does_not_select_id(tmp_path, monkeypatch):
+    requested = []
+    get_page = supabase_helper.get_calendar_page
+    monkeypatch.setattr(supabase_helper, 'get_calendar_page',
+                        lambda client, after, page_size, columns: requested.append(columns) or get_page(client, after, page_size, columns))
+    bulk_transfer.export_events(str(tmp_path / "out.csv"), _backend(TRICKY_ROWS))
+    assert requested and all('id' not in columns.split(',') for columns in requested)
+
+
+def test_ics_escape_round_trip():
+    text = "a;b,c\\d\n둘째 줄"
+    escaped = bulk_transfer._ics_escape(text)
+    assert escaped == "a\\;b\\,c\\\\d\\n둘째 줄"
+    assert bulk_transfer._ics_unescape(escaped) == text
+
+
+def test_ics_long_lines_fold_without_splitting_characters():
+    line = "SUMMARY:" + "가나다라마" * 30
+    folded = bulk_transfer._ics_fold(line)
+    parts = folded.split("\r\n")[:-1]
+    assert len(parts) > 1
+    assert all(len(part.encode('utf-8')) <= bulk_transfer.ICS_LINE_LIMIT for part in parts)
+    assert all(part.startswith(" ") for part in parts[1:])
+    assert parts[0] + "".join(part[1:] for part in parts[1:]) == line
+
+
+def test_read_ics_parses_folded_and_parameterised_lines(tmp_path):
+    path = tmp_path / "in.ics"
+    path.write_text(
+        "BEGIN:VCALENDAR\r\n"
+        "BEGIN:VEVENT\r\n"
+        "DTSTART;VALUE=DATE:20240305\r\n"
+        "SUMMARY:접힌\r\n"
+        "  일정\\, 계속\r\n"
+        "X-BTN-COLOR:#123456FF\r\n"
+        "END:VEVENT\r\n"
+        "BEGIN:VEVENT\r\n"
+        "SUMMARY:날짜 없는 일정\r\n"
+        "END:VEVENT\r\n"
+        "END:VCALENDAR\r\n", encoding="utf-8", newline="")
+    assert list(bulk_transfer.read_events(str(path))) == [
+        {'schedule_day': "2024-03-05", 'schedule_value': "접힌 일정, 계속", 'btn_color': "#123456FF"}]
+
+
+def test_import_retries_failed_chunk(tmp_path):
+    path = tmp_path / "in.csv"
+    bulk_transfer.export_events(str(path), _backend(TRICKY_ROWS))
+    target = _backend()
+    target.inject_faults(errors=2)  # 첫 청크 요청이 두 번 실패해도 다시 보내서 저장
+    assert bulk_transfer.import_events(str(path), target, batch_size=2, workers=1) == len(TRICKY_ROWS)
+    assert target.fault_count == 2
+    assert len(target.tables['minsik_calender'].rows) == len(TRICKY_ROWS)
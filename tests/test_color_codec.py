@@ -0,0 +1,60 @@
+# 색상 코덱: '#RRGGBBAA' 왕복, DB에 남아 있는 예전 repr 문자열 읽기, 파생 색상
+import pytest
+
+import color_codec
+from color_codec import DEFAULT_COLOR, decode_color, encode_color
+
+
+@pytest.mark.parametrize("text", ["#000000FF", "#FFFFFFFF", "#B3B3B3FF", "#12AB9C80", "#00000000"])
+def test_hex_strings_round_trip_exactly(text):
+    assert encode_color(decode_color(text)) == text
+
+
+def test_every_channel_value_round_trips():
+    for value in range(256):
+        text = f"#{value:02X}{255 - value:02X}{value // 2:02X}{value:02X}"
+        assert encode_color(decode_color(text)) == text
+
+
+def test_encode_fills_alpha_and_clamps():
+    assert encode_color((1, 0, 0)) == "#FF0000FF"
+    assert encode_color([1.5, -0.2, 0.5, 1]) == "#FF0080FF"
+    assert encode_color((0.2, 0.4, 0.6, 1, 0.3)) == "#336699FF"  # 다섯 번째 값은 무시
+    assert decode_color("#FF0000") == (1.0, 0.0, 0.0, 1.0)  # 알파가 없는 16진수
+
+
+@pytest.mark.parametrize("stored, expected", [
+    ("(0.7, 0.7, 0.7, 1)", (0.7, 0.7, 0.7, 1)),
+    ("[0.1, 0.2, 0.3, 0.5]", (0.1, 0.2, 0.3, 0.5)),
+    ("(1, 0, 0)", (1, 0, 0, 1)),
+    (" (0.2, 0.4, 0.6, 1.0) ", (0.2, 0.4, 0.6, 1.0)),
+])
+def test_legacy_literal_strings_from_db(stored, expected):
+    assert decode_color(stored) == expected
+    # 예전 값을 읽어서 다시 저장하면 16진수 형식이 되고, 그 뒤로는 같은 값으로 왕복
+    migrated = encode_color(decode_color(stored))
+    assert migrated.startswith("#") and len(migrated) == 9
+    assert encode_color(decode_color(migrated)) == migrated
+    assert decode_color(migrated) == pytest.approx(expected, abs=1 / 255)
+
+
+@pytest.mark.parametrize("stored", ["", "red", "#GGHHII", "#12345", "(1, 2)", "{'r': 1}", "__import__('os')", "None"])
+def test_unreadable_values_fall_back_to_default(stored):
+    assert decode_color(stored) == DEFAULT_COLOR
+
+
+def test_decode_passes_through_none_and_sequences():
+    assert decode_color(None) is None
+    assert decode_color([0.1, 0.2, 0.3, 1]) == (0.1, 0.2, 0.3, 1)
+
+
+def test_color_style_derives_text_dim_and_border_colors():
+    dark = color_codec.color_style(decode_color("#000000FF"))
+    assert dark.text_color == (1, 1, 1, 1)
+    assert dark.border == (1.0, 1.0, 1.0, 1.0)
+
+    light = color_codec.color_style([1, 1, 1])
+    assert light.background == (1, 1, 1, 1)
+    assert light.text_color == (0, 0, 0, 1)
+    assert light.dimmed == pytest.approx((0.7, 0.7, 0.7, 0.7))
+    assert color_codec.color_style((1, 1, 1, 1)) is light  # 같은 색은 한 번만 계산
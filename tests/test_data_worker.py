@@ -0,0 +1,32 @@
+import time
+
+from kivy.clock import Clock
+
+import data_worker
+
+
+def _tick_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        Clock.tick()
+        time.sleep(0.01)
+
+
+def test_result_is_delivered_to_on_success():
+    results = []
+    data_worker.run_in_background(lambda a, b: a + b, 1, 2, on_success=results.append)
+    _tick_until(lambda: results)
+    assert results == [3]
+
+
+def test_failing_job_is_delivered_to_on_error():
+    errors = []
+
+    def fail():
+        raise ValueError("boom")
+
+    data_worker.run_in_background(fail, on_success=lambda result: None, on_error=errors.append)
+    _tick_until(lambda: errors)
+    assert len(errors) == 1
+    assert isinstance(errors[0], ValueError)
+    assert str(errors[0]) == "boom"
@@ -0,0 +1,59 @@
+# 기본 키(id)만 담긴 실시간 DELETE를 날짜로 찾을 수 있는지 (기본 replica identity에서는 old_record에 id만 옴)
+import fake_supabase
+import supabase_helper
+from event_index import EventIndex
+from local_cache import LocalCache
+
+
+def _server_rows(fake):
+    return supabase_helper.get_calendar_data_range(fake, "2024-03-01", "2024-04-01")
+
+
+def test_fetched_rows_keep_id_for_delete_lookup():
+    fake = fake_supabase.FakeSupabase()
+    fake.seed_events(10, "2024-03-01")
+    rows = _server_rows(fake)
+    assert all(row['id'] is not None for row in rows)
+
+    index = EventIndex()
+    index.replace_months([(2024, 3)], rows)
+    target = next(row for row in rows if row['schedule_day'] == "2024-03-05")
+    assert index.day_of_id(target['id']) == "2024-03-05"
+    assert index.events_for_day("2024-03-05")[0].as_row()['id'] == target['id']
+
+
+def test_ids_survive_local_cache_round_trip(tmp_path):
+    fake = fake_supabase.FakeSupabase()
+    fake.seed_events(3, "2024-03-01")
+    rows = _server_rows(fake)
+    cache = LocalCache(path=str(tmp_path / "cache.db"))
+    try:
+        cache.store_months([(2024, 3)], rows)
+        cached_rows, cached_months = cache.load_months([(2024, 3)])
+    finally:
+        cache.close()
+    assert cached_months == [(2024, 3)]
+
+    index = EventIndex(cached_rows)
+    for row in rows:
+        assert index.day_of_id(row['id']) == row['schedule_day']
+
+
+def test_removed_or_replaced_days_forget_their_ids():
+    index = EventIndex([
+        {'id': 1, 'schedule_day': "2024-03-01", 'schedule_value': "a"},
+        {'id': 2, 'schedule_day': "2024-03-02", 'schedule_value': "b"},
+        {'id': 3, 'schedule_day': "2024-04-01", 'schedule_value': "c"},
+    ])
+    index.remove_day("2024-03-01")
+    assert index.day_of_id(1) is None
+
+    index.replace_months([(2024, 3)], [{'id': 4, 'schedule_day': "2024-03-09", 'schedule_value': "d"}])
+    assert index.day_of_id(2) is None
+    assert index.day_of_id(4) == "2024-03-09"
+    assert index.day_of_id(3) == "2024-04-01"
+
+    # 같은 날짜를 새 id로 upsert하면 이전 id는 더 이상 그 날짜를 가리키지 않음
+    index.upsert({'id': 5, 'schedule_day': "2024-04-01", 'schedule_value': "e"})
+    assert index.day_of_id(3) is None
+    assert index.day_of_id(5) == "2024-04-01"
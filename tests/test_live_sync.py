@@ -0,0 +1,211 @@
+# LiveSync를 로컬 웹소켓 서버(Phoenix/realtime 프로토콜 흉내)에 붙여서 확인
+import asyncio
+import json
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("realtime")
+from websockets.asyncio.server import serve  # noqa: E402
+
+import live_sync  # noqa: E402
+from live_sync import LiveSync, normalize_change  # noqa: E402
+
+TABLE = "minsik_calender"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("제한 시간 안에 조건을 만족하지 못했습니다.")
+        time.sleep(0.01)
+
+
+class RealtimeStandIn:
+    """Supabase Realtime 서버 대신 쓰는 로컬 웹소켓 서버
+    phx_join에 구독 id를 붙여 응답하고, heartbeat에 응답하고, push()로 postgres_changes 메시지를 보낸다."""
+
+    def __init__(self, port):
+        self.port = port
+        self.url = f"ws://127.0.0.1:{port}/realtime/v1"
+        self.joins = []  # 받은 phx_join 메시지
+        self.connections = set()
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._thread_main, daemon=True)
+        self.thread.start()
+        assert self.ready.wait(5)
+
+    def _thread_main(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self._serve())
+        self.loop.close()
+
+    async def _serve(self):
+        self.closed = asyncio.Event()
+        async with serve(self._handler, "127.0.0.1", self.port) as self.server:
+            self.ready.set()
+            await self.closed.wait()
+
+    async def _handler(self, websocket):
+        self.connections.add(websocket)
+        try:
+            async for text in websocket:
+                message = json.loads(text)
+                if message['event'] == 'phx_join':
+                    self.joins.append(message)
+                    bindings = message['payload']['config']['postgres_changes']
+                    response = {'postgres_changes': [dict(binding, id=index + 1)
+                                                     for index, binding in enumerate(bindings)]}
+                    await websocket.send(json.dumps({
+                        'event': 'phx_reply', 'topic': message['topic'], 'ref': message['ref'],
+                        'payload': {'status': 'ok', 'response': response}}))
+                elif message['event'] == 'heartbeat':
+                    await websocket.send(json.dumps({
+                        'event': 'phx_reply', 'topic': 'phoenix', 'ref': message['ref'],
+                        'payload': {'status': 'ok', 'response': {}}}))
+        except Exception:
+            pass
+        finally:
+            self.connections.discard(websocket)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def push(self, event_type, record=None, old_record=None):
+        """구독 중인 모든 연결에 테이블 변경 메시지를 보냄"""
+        join = self.joins[-1]
+        message = json.dumps({
+            'event': 'postgres_changes', 'topic': join['topic'], 'ref': None,
+            'payload': {'ids': [1], 'data': {
+                'schema': 'public', 'table': TABLE, 'commit_timestamp': '2024-03-01T00:00:00Z',
+                'type': event_type, 'errors': None, 'columns': [],
+                'record': record or {}, 'old_record': old_record or {}}}})
+
+        async def send_all():
+            for websocket in list(self.connections):
+                await websocket.send(message)
+
+        self._run(send_all())
+
+    def drop(self):
+        """열린 연결을 모두 끊음 (네트워크가 끊긴 것처럼)"""
+        async def close_all():
+            for websocket in list(self.connections):
+                await websocket.close(code=1011)
+
+        self._run(close_all())
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.closed.set)
+            self.thread.join(5)
+
+
+@pytest.fixture
+def stand_in():
+    server = RealtimeStandIn(_free_port())
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """재연결 대기 시간: 지터 없이 상한값을 쓰고 기록"""
+    recorded = []
+
+    def uniform(low, high):
+        recorded.append(high)
+        return high
+
+    monkeypatch.setattr(live_sync, 'random', SimpleNamespace(uniform=uniform))
+    return recorded
+
+
+def _live_sync(url, changes, **kwargs):
+    return LiveSync(lambda *change: changes.append(change), url=url, token="test-token", table=TABLE, **kwargs)
+
+
+def test_changes_reach_on_change(stand_in):
+    changes = []
+    sync = _live_sync(stand_in.url, changes)
+    sync.start()
+    try:
+        _wait_for(lambda: stand_in.joins and sync.connected)
+        assert stand_in.joins[0]['topic'] == f"realtime:public:{TABLE}"
+
+        row = {'id': 7, 'schedule_day': "2024-03-05", 'schedule_value': "회의", 'btn_color': None}
+        stand_in.push('INSERT', record=row)
+        stand_in.push('UPDATE', record=dict(row, schedule_value="점심"), old_record={'id': 7})
+        stand_in.push('DELETE', old_record={'id': 7})
+        _wait_for(lambda: len(changes) == 3)
+    finally:
+        sync.stop()
+        sync.thread.join(5)
+
+    assert changes[0] == ('INSERT', row, None)
+    assert changes[1][0] == 'UPDATE' and changes[1][1]['schedule_value'] == "점심"
+    assert changes[2] == ('DELETE', None, {'id': 7})
+
+
+def test_reconnects_with_growing_backoff(delays):
+    port = _free_port()  # 아직 서버가 없어 연결이 계속 실패함
+    changes = []
+    sync = _live_sync(f"ws://127.0.0.1:{port}/realtime/v1", changes, min_backoff=0.02, max_backoff=0.16)
+    sync.start()
+    server = RealtimeStandIn(port)
+    try:
+        _wait_for(lambda: sync.reconnect_count >= 5)
+        assert delays[:5] == [0.02, 0.04, 0.08, 0.16, 0.16]
+
+        # 서버가 뜨면 다시 붙고, 연결에 성공한 뒤 끊기면 대기 시간이 처음으로 돌아감
+        server.start()
+        _wait_for(lambda: sync.connected and server.joins)
+        delays.clear()
+        joins = len(server.joins)
+        server.drop()
+        _wait_for(lambda: len(server.joins) > joins)
+        assert delays[0] == 0.02
+        server.push('DELETE', old_record={'id': 1})
+        _wait_for(lambda: changes == [('DELETE', None, {'id': 1})])
+    finally:
+        sync.stop()
+        sync.thread.join(5)
+        server.stop()
+    assert not sync.thread.is_alive()
+
+
+def test_stop_interrupts_backoff_sleep():
+    port = _free_port()
+    sync = _live_sync(f"ws://127.0.0.1:{port}/realtime/v1", [], min_backoff=30, max_backoff=60)
+    sync.start()
+    _wait_for(lambda: sync._wake is not None and not sync.connected and sync.client is not None)
+    time.sleep(0.2)  # 첫 연결 실패 뒤 30초 대기에 들어감
+    started = time.monotonic()
+    sync.stop()
+    sync.thread.join(5)
+    assert not sync.thread.is_alive()
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.parametrize("payload", [
+    {'data': {'type': 'UPDATE', 'record': {'id': 1}, 'old_record': {'id': 1}}},  # realtime 2.x
+    {'eventType': 'UPDATE', 'new': {'id': 1}, 'old': {'id': 1}},  # 예전 모양
+])
+def test_normalize_change_accepts_both_payload_shapes(payload):
+    assert normalize_change(payload) == ('UPDATE', {'id': 1}, {'id': 1})
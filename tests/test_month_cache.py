@@ -0,0 +1,70 @@
+# 달력 화면 모델 LRU 캐시: 최근에 본 달 유지, 바뀐 날짜/달만 무효화, 날짜가 바뀌면 다시 계산
+from datetime import date
+
+from month_cache import CellState, MonthCache, MonthModel
+from month_layout import month_layout
+
+TODAY = date(2024, 3, 15)
+
+
+def _model(year, month, today=TODAY):
+    """month_layout으로 실제 화면과 같은 칸(앞뒤 달 칸 포함)을 가진 모델"""
+    layout = month_layout(year, month)
+    cells = [CellState(cell.date_str, cell.day_number, cell.in_month, "", None, None, None) for cell in layout.cells]
+    return MonthModel((year, month), cells, layout.months, today)
+
+
+def test_least_recently_viewed_month_is_evicted():
+    cache = MonthCache(max_size=3)
+    for month in (1, 2, 3):
+        cache.put(_model(2024, month))
+    assert cache.get((2024, 1), TODAY) is not None  # 1월을 다시 봐서 가장 최근이 됨
+    cache.put(_model(2024, 4))
+    assert list(cache.models) == [(2024, 3), (2024, 1), (2024, 4)]
+    assert (2024, 2) not in cache
+    assert cache.get((2024, 2), TODAY) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_putting_same_month_replaces_without_growing():
+    cache = MonthCache(max_size=2)
+    cache.put(_model(2024, 1))
+    newer = _model(2024, 1)
+    cache.put(newer)
+    assert len(cache) == 1
+    assert cache.get((2024, 1), TODAY) is newer
+
+
+def test_changed_day_invalidates_every_month_showing_it():
+    cache = MonthCache()
+    for month in (2, 3, 4, 6):
+        cache.put(_model(2024, month))
+    # 2024-03-31은 3월 화면과, 앞 달 칸을 보여주는 4월 화면(4월 1일이 월요일)에 모두 걸쳐 있음
+    cache.invalidate(days=["2024-03-31"])
+    assert set(cache.models) == {(2024, 2), (2024, 6)}
+
+
+def test_changed_month_invalidates_models_spanning_it():
+    cache = MonthCache()
+    for month in (1, 3, 5):
+        cache.put(_model(2024, month))
+    # 1월 화면은 2월 초를, 3월 화면은 2월 말을 보여주므로 2월이 바뀌면 함께 지움
+    cache.invalidate(months={(2024, 2)})
+    assert set(cache.models) == {(2024, 5)}
+
+
+def test_unrelated_changes_keep_models_and_full_invalidate_clears():
+    cache = MonthCache()
+    cache.put(_model(2024, 3))
+    cache.invalidate(days=["2023-01-01"], months={(2022, 5)})
+    cache.invalidate(days=[], months=set())
+    assert (2024, 3) in cache
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_model_from_previous_day_is_not_reused():
+    cache = MonthCache()
+    cache.put(_model(2024, 3, today=date(2024, 3, 14)))
+    assert cache.get((2024, 3), TODAY) is None  # 오늘 테두리가 바뀌어야 하므로 다시 계산
+    assert cache.get((2024, 3), date(2024, 3, 14)) is not None
@@ -0,0 +1,58 @@
+import calendar
+from datetime import date, timedelta
+
+import pytest
+
+from month_layout import GRID_CELLS, month_layout
+
+SUNDAY_FIRST = calendar.Calendar(firstweekday=calendar.SUNDAY)  # 달력 화면과 같은 요일 순서 (calendar.monthcalendar는 월요일 시작)
+MONTHS = [(year, month) for year in range(1999, 2031) for month in range(1, 13)]
+
+
+def _grid_dates(layout):
+    return [date.fromisoformat(cell.date_str) for cell in layout.cells]
+
+
+@pytest.mark.parametrize("year, month", MONTHS)
+def test_layout_matches_monthcalendar(year, month):
+    layout = month_layout(year, month)
+    assert len(layout.cells) == GRID_CELLS
+
+    # 달력 모듈의 주(일요일 시작)가 앞에서부터 그대로 들어가고, 나머지는 이어지는 날짜로 6주를 채움
+    weeks = SUNDAY_FIRST.monthdatescalendar(year, month)
+    dates = _grid_dates(layout)
+    assert dates[:len(weeks) * 7] == [day for week in weeks for day in week]
+    assert all(later - earlier == timedelta(days=1) for earlier, later in zip(dates, dates[1:]))
+
+    # 이번 달 여부와 일자는 monthcalendar의 0(다른 달)/일자와 같음
+    numbers = [day for week in SUNDAY_FIRST.monthdayscalendar(year, month) for day in week]
+    assert [cell.day_number if cell.in_month else 0 for cell in layout.cells[:len(numbers)]] == numbers
+    assert not any(cell.in_month for cell in layout.cells[len(numbers):])
+    assert all(cell.day_number == day.day for cell, day in zip(layout.cells, dates))
+
+
+@pytest.mark.parametrize("year, month", MONTHS)
+def test_layout_bounds_and_months(year, month):
+    layout = month_layout(year, month)
+    dates = _grid_dates(layout)
+    assert layout.first_date == dates[0].isoformat()
+    assert layout.end_date == (dates[-1] + timedelta(days=1)).isoformat()
+    assert layout.months == tuple(sorted({(day.year, day.month) for day in dates}))
+
+
+@pytest.mark.parametrize("year, month, weeks", [
+    (2015, 2, 4),  # 일요일에 시작하는 28일짜리 2월: 이번 달만으로는 4주
+    (2023, 12, 6),  # 금요일에 시작하는 31일: 6주가 필요
+    (2024, 3, 6),
+    (2020, 2, 5),  # 윤년 2월
+])
+def test_six_week_grid_covers_every_month_shape(year, month, weeks):
+    assert len(SUNDAY_FIRST.monthdayscalendar(year, month)) == weeks
+    layout = month_layout(year, month)
+    in_month = [cell for cell in layout.cells if cell.in_month]
+    assert len(in_month) == calendar.monthrange(year, month)[1]
+    assert len(layout.cells) == 42
+
+
+def test_layout_is_cached():
+    assert month_layout(2024, 5) is month_layout(2024, 5)
@@ -0,0 +1,157 @@
+import pytest
+
+import fake_supabase
+import outbox
+import supabase_helper
+from outbox import MAX_REJECTIONS, Outbox
+
+
+class FakeServer:
+    """send_batch 자리에 넣는 가짜 서버 (받은 행을 기록하고, 지정한 값이 있으면 묶음 전체를 거부)"""
+
+    def __init__(self):
+        self.saved = {}
+        self.deleted = []
+        self.calls = 0
+        self.offline = False
+        self.poison = set()
+
+    def send_batch(self, upserts, deletes):
+        self.calls += 1
+        if self.offline:
+            raise ConnectionError("오프라인")
+        if any(row['schedule_value'] in self.poison for row in upserts):
+            raise ValueError("check constraint violated")
+        for row in upserts:
+            self.saved[row['schedule_day']] = row
+        self.deleted.extend(deletes)
+        return upserts, deletes
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def box(tmp_path, server):
+    queue = Outbox(server.send_batch, path=str(tmp_path / "outbox.db"))
+    yield queue
+    queue.close()
+
+
+def _row(day, value):
+    return {'schedule_day': day, 'schedule_value': value, 'btn_color': None}
+
+
+def test_edits_to_same_day_are_coalesced_and_acked(box, server):
+    box.put_upsert(_row("2024-03-01", "첫 번째"))
+    box.put_upsert(_row("2024-03-01", "두 번째"))
+    box.put_delete("2024-03-02")
+    assert box.pending_count() == 2
+
+    assert box.flush() == 2
+    assert server.calls == 1
+    assert server.saved["2024-03-01"]['schedule_value'] == "두 번째"
+    assert server.deleted == ["2024-03-02"]
+    assert box.pending_count() == 0
+    assert box.take_batch() == []
+
+
+def test_ack_keeps_edit_made_while_sending(box):
+    box.put_upsert(_row("2024-03-01", "보내는 중"))
+    batch = box.take_batch()
+    box.put_upsert(_row("2024-03-01", "그 사이 수정"))
+    box.ack(batch)
+    assert "2024-03-01" in box
+    assert box.pending()["2024-03-01"][1]['schedule_value'] == "그 사이 수정"
+
+
+def test_network_error_backs_off_whole_batch(box, server):
+    box.put_upsert(_row("2024-03-01", "a"))
+    box.put_upsert(_row("2024-03-02", "b"))
+    server.offline = True
+    with pytest.raises(ConnectionError):
+        box.flush()
+    assert box.pending_count() == 2
+    assert box.take_batch() == []  # 백오프 시간이 지나기 전에는 다시 보내지 않음
+    assert box.quarantined() == []
+
+
+def test_rejected_batch_is_split_and_poison_row_quarantined(box, server, monkeypatch):
+    monkeypatch.setattr(outbox, '_retry_delay', lambda attempts: 0)
+    server.poison = {"잘못된 값"}
+    for day in range(1, 6):
+        box.put_upsert(_row(f"2024-03-0{day}", f"일정 {day}"))
+    box.put_upsert(_row("2024-03-06", "잘못된 값"))
+
+    assert box.flush() == 5
+    assert sorted(server.saved) == [f"2024-03-0{day}" for day in range(1, 6)]
+    assert box.pending_count() == 0
+    quarantined = box.quarantined()
+    assert [(day, op) for day, op, row, error in quarantined] == [("2024-03-06", 'upsert')]
+    assert "check constraint" in quarantined[0][3]
+    # 한 건씩 보낸 뒤 MAX_REJECTIONS번 거부되면 더는 보내지 않음
+    calls = server.calls
+    assert box.flush() == 0
+    assert server.calls == calls
+
+
+def test_reject_counts_single_row_rejections(box):
+    box.put_upsert(_row("2024-03-01", "a"))
+    batch = box.take_batch()
+    for _ in range(MAX_REJECTIONS - 1):
+        assert box.reject(batch, ValueError("거부")) == []
+    assert box.reject(batch, ValueError("거부")) == [("2024-03-01", 'upsert', batch[0][2])]
+    assert "2024-03-01" not in box
+
+
+def test_editing_quarantined_day_queues_it_again(box, server, monkeypatch):
+    monkeypatch.setattr(outbox, '_retry_delay', lambda attempts: 0)
+    server.poison = {"잘못된 값"}
+    box.put_upsert(_row("2024-03-01", "잘못된 값"))
+    box.flush()
+    assert box.quarantined()
+
+    box.put_upsert(_row("2024-03-01", "고친 값"))
+    assert box.quarantined() == []
+    assert box.flush() == 1
+    assert server.saved["2024-03-01"]['schedule_value'] == "고친 값"
+
+
+def test_pending_writes_survive_restart_without_quarantined(tmp_path, server, monkeypatch):
+    monkeypatch.setattr(outbox, '_retry_delay', lambda attempts: 0)
+    path = str(tmp_path / "outbox.db")
+    server.poison = {"잘못된 값"}
+    first = Outbox(server.send_batch, path=path)
+    first.put_upsert(_row("2024-03-01", "잘못된 값"))
+    first.flush()
+    server.offline = True
+    first.put_upsert(_row("2024-03-02", "남은 값"))
+    with pytest.raises(ConnectionError):
+        first.flush()
+    first.close()
+
+    second = Outbox(server.send_batch, path=path)
+    try:
+        assert list(second.pending()) == ["2024-03-02"]
+        assert [day for day, op, row, error in second.quarantined()] == ["2024-03-01"]
+    finally:
+        second.close()
+
+
+def test_delete_replacing_pending_upsert_removes_server_row(tmp_path):
+    fake = fake_supabase.FakeSupabase()
+    fake.seed_events(1, "2024-03-01", value="x", btn_color="#CCCCCCFF")
+    queue = Outbox(lambda upserts, deletes: supabase_helper.apply_event_batch(upserts, deletes, fake),
+                   path=str(tmp_path / "outbox.db"))
+    try:
+        queue.put_upsert(_row("2024-03-01", "x"))  # 색상 초기화
+        queue.put_delete("2024-03-01")  # 내용도 비워서 삭제 (앞의 저장을 대체)
+        batch = queue.take_batch()
+        saved_rows, deleted_rows = queue.send(batch)
+        queue.ack(batch)
+    finally:
+        queue.close()
+    assert [row['schedule_day'] for row in deleted_rows] == ["2024-03-01"]
+    assert "2024-03-01" not in fake.tables['minsik_calender'].rows
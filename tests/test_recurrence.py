@@ -0,0 +1,135 @@
+# 반복 규칙 펼치기: 한 달만 펼치기, 달/해 경계, 윤일, 매주/매달 규칙, 잘못된 규칙 처리
+from datetime import date, timedelta
+
+import pytest
+
+import recurrence
+from recurrence import RecurrenceIndex, RecurrenceRule
+
+
+def _rule(start_day, freq='weekly', **fields):
+    return dict({'id': fields.pop('id', 1), 'start_day': start_day, 'freq': freq, 'schedule_value': "반복"}, **fields)
+
+
+def _days(index, year, month):
+    return sorted(index.events_for_month(year, month))
+
+
+def _naive(rule, first, last):
+    """처음부터 회차를 하나씩 세며 펼친 기준 결과"""
+    result, index = [], 0
+    while True:
+        if rule.count is not None and index >= rule.count:
+            break
+        if rule.freq in ('daily', 'weekly'):
+            day = rule.start + timedelta(days=index * rule.interval * (7 if rule.freq == 'weekly' else 1))
+        else:
+            day = recurrence._add_months(rule.start, index * rule.interval * (12 if rule.freq == 'yearly' else 1), rule.start.day)
+        index += 1
+        if day is None:
+            continue
+        if day > last or (rule.until and day > rule.until):
+            break
+        if day >= first:
+            result.append(day)
+    return result
+
+
+def test_weekly_rule_expands_only_requested_month():
+    index = RecurrenceIndex([_rule("2024-01-03")])  # 수요일마다
+    assert _days(index, 2024, 3) == ["2024-03-06", "2024-03-13", "2024-03-20", "2024-03-27"]
+    assert list(index.month_events) == [(2024, 3)]
+    assert index.events_for_day("2024-03-13")[0] == {
+        'schedule_day': "2024-03-13", 'schedule_value': "반복", 'btn_color': None, 'rule_id': 1}
+    assert index.events_for_day("2024-03-14") == []
+
+
+def test_rule_does_not_expand_before_start():
+    index = RecurrenceIndex([_rule("2024-03-15", 'daily')])
+    assert _days(index, 2024, 2) == []
+    assert _days(index, 2024, 3)[0] == "2024-03-15"
+
+
+def test_interval_continues_across_month_and_year_ends():
+    index = RecurrenceIndex([_rule("2023-12-30", 'daily', repeat_interval=2)])
+    assert _days(index, 2023, 12) == ["2023-12-30"]
+    assert _days(index, 2024, 1)[:2] == ["2024-01-01", "2024-01-03"]
+    assert _days(index, 2024, 1)[-1] == "2024-01-31"
+    assert _days(index, 2024, 2)[0] == "2024-02-02"
+
+
+def test_monthly_rule_on_31st_skips_short_months_and_counts_them():
+    index = RecurrenceIndex([_rule("2024-01-31", 'monthly', count=4)])
+    found = [day for month in range(1, 13) for day in _days(index, 2024, month)]
+    # 2월(29일까지)과 4월(30일까지)은 31일이 없어 건너뛰지만 회차로는 셈: 1, (2), 3, (4)월
+    assert found == ["2024-01-31", "2024-03-31"]
+
+
+def test_leap_day_rules():
+    yearly = RecurrenceIndex([_rule("2024-02-29", 'yearly')])
+    assert [year for year in range(2024, 2033) if _days(yearly, year, 2)] == [2024, 2028, 2032]
+
+    monthly = RecurrenceIndex([_rule("2023-01-29", 'monthly')])
+    assert _days(monthly, 2023, 2) == []
+    assert _days(monthly, 2024, 2) == ["2024-02-29"]
+
+
+def test_weekly_rule_with_interval_count_and_until():
+    counted = RecurrenceIndex([_rule("2024-01-01", 'weekly', repeat_interval=2, count=3)])
+    assert _days(counted, 2024, 1) == ["2024-01-01", "2024-01-15", "2024-01-29"]
+    assert _days(counted, 2024, 2) == []
+
+    until = RecurrenceIndex([_rule("2024-01-01", 'weekly', until_day="2024-01-22")])
+    assert _days(until, 2024, 1) == ["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-22"]
+
+
+@pytest.mark.parametrize("row", [
+    _rule("2020-01-01", 'daily', repeat_interval=3),
+    _rule("2020-02-29", 'weekly', repeat_interval=5, count=40),
+    _rule("2019-08-31", 'monthly', repeat_interval=2, until_day="2024-12-31"),
+    _rule("2016-02-29", 'yearly', count=5),
+    _rule("2021-05-30", 'monthly', count=30),
+])
+def test_skip_ahead_matches_counting_from_start(row):
+    rule = RecurrenceRule(row)
+    first, last = date(2023, 11, 1), date(2024, 4, 30)
+    assert list(rule.occurrences(first, last)) == _naive(rule, first, last)
+
+
+def test_invalid_rules_are_rejected_or_skipped(capsys):
+    with pytest.raises(ValueError):
+        RecurrenceRule(_rule("2024-01-01", 'hourly'))
+    assert RecurrenceRule(_rule("2024-01-01", repeat_interval=0)).interval == 1
+
+    index = RecurrenceIndex([
+        _rule("2024-01-01", 'hourly', id=1),
+        {'id': 2, 'freq': 'weekly'},  # start_day 없음
+        _rule("2024-01-01", 'daily', id=3),
+    ])
+    assert list(index.rules) == [3]
+    assert "잘못된 반복 규칙" in capsys.readouterr().out
+
+
+def test_rule_changes_drop_expanded_months_and_notify():
+    calls = []
+    index = RecurrenceIndex([_rule("2024-01-01", 'daily')])
+    index.listener = lambda: calls.append(True)
+    _days(index, 2024, 1)
+
+    index.upsert(_rule("2024-01-01", 'weekly'))
+    assert index.month_events == {} and len(calls) == 1
+    assert len(_days(index, 2024, 1)) == 5
+
+    index.remove(1)
+    index.remove(1)  # 없는 규칙을 지우면 알리지 않음
+    assert len(calls) == 2
+    assert _days(index, 2024, 1) == []
+
+
+def test_expanded_months_are_capped():
+    index = RecurrenceIndex([_rule("2020-01-01", 'monthly')])
+    for offset in range(recurrence.MAX_CACHED_MONTHS + 3):
+        year, month = divmod(offset, 12)
+        index.events_for_month(2020 + year, month + 1)
+    assert len(index.month_events) == recurrence.MAX_CACHED_MONTHS
+    assert (2020, 1) not in index.month_events
@@ -0,0 +1,121 @@
+import pytest
+
+import resilience
+from resilience import CircuitBreaker
+
+
+class APIError(Exception):
+    """postgrest APIError와 같은 모양의 오류 (code에 상태 코드 또는 PostgREST/SQLSTATE 코드)"""
+
+    def __init__(self, code, message="오류"):
+        super().__init__(message)
+        self.code = code
+
+
+class HTTPStatusError(Exception):
+    """httpx.HTTPStatusError와 같은 모양의 오류 (response.status_code)"""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = type("Response", (), {"status_code": status})()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    fresh = CircuitBreaker(failures=3, reset_after=30, clock=clock)
+    monkeypatch.setattr(resilience, 'breaker', fresh)
+    monkeypatch.setattr(resilience, 'backoff_delay', lambda attempt: 0)
+    return fresh
+
+
+def _raising(error):
+    calls = []
+
+    def func():
+        calls.append(1)
+        raise error
+
+    return func, calls
+
+
+@pytest.mark.parametrize("error", [
+    APIError("503"), APIError("502"), APIError("429"), APIError("408"), HTTPStatusError(500),
+    ConnectionError("끊김"), resilience.CallTimeout("시간 초과"),
+])
+def test_server_and_network_errors_are_transient(error):
+    assert resilience.is_transient(error)
+
+
+@pytest.mark.parametrize("error", [
+    APIError("400"), APIError("404"), APIError("PGRST116"), APIError("23505"), HTTPStatusError(403), ValueError("x"),
+])
+def test_client_errors_are_not_transient(error):
+    assert not resilience.is_transient(error)
+
+
+def test_repeated_5xx_opens_breaker(breaker):
+    func, calls = _raising(APIError("503", "Service Unavailable"))
+    for _ in range(3):
+        with pytest.raises(APIError):
+            resilience.call(func, attempts=1)
+    assert breaker.state == resilience.OPEN
+    with pytest.raises(resilience.BackendUnavailable):
+        resilience.call(func, attempts=1)
+    assert len(calls) == 3  # 열린 뒤에는 요청을 보내지 않음
+
+
+def test_idempotent_call_retries_5xx(breaker):
+    results = iter([APIError("503"), APIError("429"), "ok"])
+
+    def func():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert resilience.call(func, idempotent=True) == "ok"
+    assert breaker.state == resilience.CLOSED
+    assert breaker.failures == 0
+
+
+def test_client_error_is_not_retried_and_leaves_breaker_untouched(breaker):
+    server_error, _ = _raising(APIError("503"))
+    with pytest.raises(APIError):
+        resilience.call(server_error, attempts=1)
+    assert breaker.failures == 1
+
+    client_error, calls = _raising(APIError("400", "잘못된 요청"))
+    with pytest.raises(APIError):
+        resilience.call(client_error, idempotent=True)
+    assert len(calls) == 1
+    assert breaker.failures == 1  # 성공으로 보지 않으므로 연속 실패 횟수가 초기화되지 않음
+    assert breaker.state == resilience.CLOSED
+
+
+def test_client_error_during_trial_allows_next_trial(breaker, clock):
+    server_error, _ = _raising(APIError("500"))
+    for _ in range(3):
+        with pytest.raises(APIError):
+            resilience.call(server_error, attempts=1)
+    clock.now += 30
+
+    client_error, _ = _raising(APIError("404"))
+    with pytest.raises(APIError):
+        resilience.call(client_error, attempts=1)
+    assert breaker.state == resilience.HALF_OPEN
+
+    assert resilience.call(lambda: "ok", attempts=1) == "ok"
+    assert breaker.state == resilience.CLOSED
@@ -0,0 +1,164 @@
+# 시작/대기열 전송/일정 저장/새로고침이 액션별 왕복 횟수 허용치(ROUND_TRIP_BUDGETS) 안에서 끝나는지
+# fake_supabase로 CalendarLayout을 창 없이 띄우고 strict 모드로 확인 (허용치를 넘으면 RoundTripBudgetExceeded)
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")  # dummy 드라이버는 OpenGL 컨텍스트를 만들지 못함
+pytest.importorskip("kivy")
+
+from kivy.clock import Clock  # noqa: E402
+
+import fake_supabase  # noqa: E402
+import supabase_helper  # noqa: E402
+from supabase_helper import RoundTripBudgetExceeded, within_budget  # noqa: E402
+
+USERNAME = "tester"
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FALLBACK_FONT = "data/fonts/Roboto-Regular.ttf"  # 한글 글꼴 파일이 없을 때 쓸 Kivy 기본 글꼴
+
+
+def _drain(until, timeout=10):
+    """Clock을 직접 돌려서 백그라운드 결과 콜백을 처리 (until이 참이 될 때까지)"""
+    deadline = time.perf_counter() + timeout
+    while not until():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("백그라운드 작업이 제한 시간 안에 끝나지 않았습니다.")
+        Clock.tick()
+        time.sleep(0.001)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def calendar_kv():
+    """benchmark.py처럼 calendar.kv와 글꼴을 한 번만 등록"""
+    from kivy.core.text import LabelBase
+    from kivy.lang import Builder
+    from kivy.resources import resource_add_path, resource_find
+    from cell_text import CELL_FONT_NAME
+    resource_add_path(REPO_DIR)
+    if resource_find(CELL_FONT_NAME) is None:
+        LabelBase.register(CELL_FONT_NAME, resource_find(FALLBACK_FONT))
+    path = os.path.join(REPO_DIR, "calendar.kv")
+    Builder.load_file(path)
+    yield
+    Builder.unload_file(path)
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    import main
+    monkeypatch.chdir(tmp_path)  # 로그인 정보/로컬 캐시/대기열 파일이 임시 폴더에 만들어지게 함
+    with open(main.LOGIN_FILE, "w") as f:
+        json.dump({"username": USERNAME, "last_login": datetime.now().isoformat()}, f)
+    backend = fake_supabase.FakeSupabase()
+    backend.add_user(USERNAME, global_color="#B3B3B3FF")
+    now = datetime.now()
+    backend.seed_events(90, f"{now.year}-{now.month:02}-01")
+    previous_client = supabase_helper.session._client
+    fake_supabase.install(backend)
+    monkeypatch.setattr(supabase_helper.session, 'strict', True)
+    yield backend
+    supabase_helper.session._client = previous_client
+
+
+@pytest.fixture
+def layout(fake):
+    import main
+    calendar = main.CalendarLayout()
+    _drain(lambda: calendar.sync_watermark is not None and not calendar.pending_months)
+    yield calendar
+    _drain(lambda: not calendar.outbox_flushing)
+    calendar.outbox.close()
+    calendar.local_cache.close()
+
+
+def _round_trips(func, *args):
+    """func가 현재 스레드에서 보낸 요청 수와 결과"""
+    start = supabase_helper.session.round_trips
+    result = func(*args)
+    return supabase_helper.session.round_trips - start, result
+
+
+def test_startup_snapshot_within_budget(layout):
+    layout.user_session.settings_fetched_at = None  # 로그인 직후가 아닌 시작처럼 글로벌 설정도 다시 받음
+    used, snapshot = _round_trips(within_budget, 'startup', layout._fetch_snapshot, layout.visible_months())
+    assert used <= supabase_helper.ROUND_TRIP_BUDGETS['startup']
+    assert snapshot[3]  # 보이는 달의 일정을 받아옴
+
+
+def test_submit_only_queues_and_flush_within_budget(layout, fake):
+    import main
+    day = f"{layout.year}-{layout.month:02}-03"
+    popup = main.EventPopup()
+    popup.selected_date = day
+    popup.set_parent_layout(layout)
+    with supabase_helper.session.round_trip_budget('submit_event', limit=0):  # 저장은 대기열에만 넣음
+        popup.submit_event("새 일정")
+        layout.queue_event_delete(f"{layout.year}-{layout.month:02}-04")
+    _drain(lambda: not layout.outbox_flushing)
+
+    batch = layout.outbox.take_batch()
+    if batch:  # 주기 전송이 먼저 보냈으면 이미 비어 있음
+        used, _ = _round_trips(within_budget, 'flush', layout.outbox.send, batch)
+        assert used <= supabase_helper.ROUND_TRIP_BUDGETS['flush']
+        layout.outbox.ack(batch)
+    assert fake.tables['minsik_calender'].rows[day]['schedule_value'] == "새 일정"
+    assert f"{layout.year}-{layout.month:02}-04" not in fake.tables['minsik_calender'].rows
+
+
+def test_refresh_changes_within_budget(layout, fake):
+    day = f"{layout.year}-{layout.month:02}-05"
+    fake.edit_events([day], "다른 기기에서 수정")
+    layout.user_session.settings_fetched_at = None  # TTL이 지나 글로벌 설정도 다시 확인하는 경우
+    used, changes = _round_trips(
+        within_budget, 'refresh', layout._fetch_changes, layout.sync_watermark, set(layout.loaded_months))
+    assert used <= supabase_helper.ROUND_TRIP_BUDGETS['refresh']
+    assert "다른 기기에서 수정" in [row['schedule_value'] for row in changes[1]]
+
+
+def test_going_over_budget_raises_in_strict_mode(layout):
+    with pytest.raises(RoundTripBudgetExceeded):
+        within_budget('save_color', lambda: [supabase_helper.get_user_setting(USERNAME, layout.get_supabase_client())
+                                             for _ in range(2)])
+
+
+def _refresh(layout):
+    """refresh_calendar의 변경분 조회와 반영을 현재 스레드에서 차례로 실행"""
+    synced_months = set(layout.loaded_months)
+    changes = within_budget('refresh', layout._fetch_changes, layout.sync_watermark, synced_months)
+    layout._apply_changes(layout.load_generation, synced_months, synced_months, changes)
+    return changes
+
+
+def test_refresh_takes_deletions_from_tombstones(layout, fake):
+    deleted_day = f"{layout.year}-{layout.month:02}-06"
+    recreated_day = f"{layout.year}-{layout.month:02}-07"
+    assert layout.event_index.events_for_day(deleted_day)
+    fake.delete_events([deleted_day, recreated_day])
+    fake.edit_events([recreated_day], "삭제 후 다시 저장")
+
+    changes = _refresh(layout)
+    assert changes[3] is None  # 날짜 목록은 받지 않음
+    assert not layout.event_index.events_for_day(deleted_day)
+    assert layout.event_index.events_for_day(recreated_day)[0]['schedule_value'] == "삭제 후 다시 저장"
+    assert layout.sync_watermark >= fake.tables['minsik_calender_deleted'].rows[deleted_day]['deleted_at']
+
+
+def test_refresh_without_tombstones_scans_only_loaded_months(layout, fake, monkeypatch):
+    def missing_table(client, since):
+        raise ValueError("relation \"minsik_calender_deleted\" does not exist")
+    scanned = []
+    get_days = supabase_helper.get_calendar_days
+    monkeypatch.setattr(supabase_helper, 'get_deleted_days_since', missing_table)
+    monkeypatch.setattr(supabase_helper, 'get_calendar_days',
+                        lambda client, start, end: scanned.append((start, end)) or get_days(client, start, end))
+    deleted_day = f"{layout.year}-{layout.month:02}-08"
+    fake.delete_events([deleted_day])
+
+    _refresh(layout)
+    assert not layout.event_index.events_for_day(deleted_day)
+    assert scanned and all(start and end for start, end in scanned)  # 전체 날짜 목록은 받지 않음
@@ -0,0 +1,100 @@
+# 일정 내용 바이그램 검색 색인: 한국어 검색, 한 글자 검색, EventIndex 변경 알림에 따른 증분 갱신
+import random
+
+from event_index import EventIndex
+from search_index import SearchIndex
+
+
+def _row(day, value):
+    return {'schedule_day': day, 'schedule_value': value, 'btn_color': None}
+
+
+def _linked(rows=()):
+    """main.CalendarLayout처럼 EventIndex 변경 알림으로 검색 색인을 갱신하도록 연결"""
+    events, search = EventIndex(), SearchIndex()
+    events.listener = lambda days, months: search.sync(events, days, months)
+    events.build(rows)
+    return events, search
+
+
+def _assert_consistent(events, search):
+    """증분으로 갱신한 색인이 현재 일정으로 새로 만든 색인과 같은지"""
+    fresh = SearchIndex()
+    fresh.rebuild(events.by_day)
+    assert search.postings == fresh.postings
+    assert search.texts == fresh.texts
+    assert search.days_by_month == fresh.days_by_month
+
+
+def test_korean_queries_ignore_spacing_and_case():
+    events, search = _linked([
+        _row("2024-03-01", "팀 회의 (Zoom)"),
+        _row("2024-03-02", "회의록 정리"),
+        _row("2024-03-03", "의회 방청"),  # 같은 글자, 다른 순서
+        _row("2024-04-10", "팀회의"),
+    ])
+    assert search.search("팀 회의") == ["2024-04-10", "2024-03-01"]  # 최근 날짜부터
+    assert search.search("회의") == ["2024-04-10", "2024-03-02", "2024-03-01"]
+    assert search.search("zoom") == ["2024-03-01"]
+    assert search.search("회의실") == []
+    assert search.search("  ") == []
+
+
+def test_single_character_queries_scan_texts():
+    events, search = _linked([
+        _row("2024-03-01", "병원"),
+        _row("2024-03-02", "은행"),
+        _row("2024-03-03", "병"),
+    ])
+    assert search.search("병") == ["2024-03-03", "2024-03-01"]
+    assert search.search("x") == []
+
+
+def test_results_are_limited_to_most_recent_days():
+    events, search = _linked([_row(f"2024-03-{day:02}", "운동") for day in range(1, 29)])
+    assert search.search("운동", limit=3) == ["2024-03-28", "2024-03-27", "2024-03-26"]
+
+
+def test_upsert_and_delete_keep_postings_consistent():
+    events, search = _linked([_row("2024-03-01", "치과 예약"), _row("2024-03-02", "치과")])
+    events.upsert(_row("2024-03-01", "안과 예약"))
+    assert search.search("치과") == ["2024-03-02"]
+    assert search.search("안과") == ["2024-03-01"]
+    assert "치과" in search.postings and "과예" in search.postings
+
+    events.remove_day("2024-03-02")
+    assert search.search("치과") == []
+    assert "치과" not in search.postings  # 마지막 날짜가 빠진 posting은 지움
+    _assert_consistent(events, search)
+
+    events.upsert(_row("2024-03-01", ""))  # 내용이 빈 일정은 색인하지 않음
+    assert len(search) == 0 and search.postings == {} and search.days_by_month == {}
+
+
+def test_replacing_months_reindexes_only_those_months():
+    events, search = _linked([_row("2024-03-01", "3월 일정"), _row("2024-04-01", "4월 일정")])
+    events.replace_months([(2024, 3)], [_row("2024-03-05", "새 3월 일정")])
+    assert search.search("일정") == ["2024-04-01", "2024-03-05"]
+    assert "2024-03-01" not in search.texts
+    _assert_consistent(events, search)
+
+
+def test_random_edits_match_full_rebuild():
+    rng = random.Random(7)
+    words = ["회의", "점심", "생일", "운동", "병원", "여행", "마감", "a", "B"]
+    events, search = _linked()
+    for _ in range(500):
+        day = f"2024-{rng.randint(1, 3):02}-{rng.randint(1, 28):02}"
+        action = rng.random()
+        if action < 0.6:
+            events.upsert(_row(day, " ".join(rng.sample(words, rng.randint(0, 3)))))
+        elif action < 0.8:
+            events.remove_day(day)
+        else:
+            month = (2024, rng.randint(1, 3))
+            events.replace_months([month], [_row(f"2024-{month[1]:02}-{rng.randint(1, 28):02}", rng.choice(words))])
+    _assert_consistent(events, search)
+    for word in words:
+        expected = sorted((day for day, day_events in events.by_day.items()
+                           if any(word.lower() in event['schedule_value'].lower() for event in day_events)), reverse=True)
+        assert search.search(word) == expected
@@ -0,0 +1,120 @@
+# 사용자 세션: global_setting 행의 TTL (settings_fresh, 만료 후 global_color 다시 조회)
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import fake_supabase
+import resilience
+import user_session
+from resilience import CircuitBreaker
+from user_session import UserSession
+
+USERNAME = "tester"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch):
+    monkeypatch.setattr(resilience, 'breaker', CircuitBreaker())
+    monkeypatch.setattr(resilience, 'backoff_delay', lambda attempt: 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(user_session.time, 'monotonic', fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def backend():
+    fake = fake_supabase.FakeSupabase()
+    fake.add_user(USERNAME, password="pw", global_color="#112233FF")
+    return fake
+
+
+@pytest.fixture
+def session(tmp_path):
+    path = tmp_path / "login_info.json"
+    path.write_text(json.dumps({"username": USERNAME, "last_login": datetime.now().isoformat()}))
+    return UserSession(login_file=str(path), ttl=60)
+
+
+def _set_server_color(backend, color):
+    backend.table('global_setting').update({'global_color': color}).eq('user_name', USERNAME).execute()
+
+
+def test_settings_are_not_fresh_before_first_fetch(session, clock):
+    assert not session.settings_fresh()
+    assert session.global_color() is None  # 클라이언트가 없으면 서버에 묻지 않음
+
+
+def test_global_color_is_reused_within_ttl_and_refetched_after(session, backend, clock):
+    assert session.global_color(backend) == "#112233FF"
+    requests = backend.request_count
+
+    _set_server_color(backend, "#445566FF")  # 다른 기기에서 바꿈
+    clock.now += 59
+    assert session.settings_fresh()
+    assert session.global_color(backend) == "#112233FF"
+    assert backend.request_count == requests + 1  # 위의 update 한 번뿐
+
+    clock.now += 1
+    assert not session.settings_fresh()
+    assert session.global_color(backend) == "#445566FF"
+    assert session.settings_fresh()
+
+
+def test_max_age_overrides_ttl(session, backend, clock):
+    session.global_color(backend)
+    clock.now += 10
+    assert session.settings_fresh()
+    assert not session.settings_fresh(max_age=5)
+    _set_server_color(backend, "#000000FF")
+    assert session.global_color(backend, max_age=5) == "#000000FF"
+
+
+def test_login_counts_as_fresh_fetch(session, backend, clock):
+    assert session.verify_login(USERNAME, "pw", backend)
+    requests = backend.request_count
+    assert session.global_color(backend) == "#112233FF"
+    assert backend.request_count == requests
+
+
+def test_failed_refetch_keeps_previous_row(session, backend, clock, capsys):
+    session.global_color(backend)
+    clock.now += 61
+    backend.inject_faults(errors=10)
+    assert session.global_color(backend) == "#112233FF"  # 오류면 보관 중인 값을 그대로 사용
+    assert not session.settings_fresh()  # 다음 호출에서 다시 시도
+    assert "오류" in capsys.readouterr().out
+
+
+def test_saving_color_refreshes_row_and_timestamp(session, backend, clock):
+    session.global_color(backend)
+    clock.now += 61
+    assert session.save_global_color("#ABCDEFFF", backend)
+    assert session.settings_fresh()
+    assert session.global_color() == "#ABCDEFFF"
+
+
+def test_switching_user_drops_cached_settings(session, backend, clock):
+    session.global_color(backend)
+    session.remember_login("someone-else")
+    assert not session.settings_fresh()
+    assert session.global_color() is None
+
+
+def test_login_expires_after_valid_days(tmp_path):
+    path = tmp_path / "login_info.json"
+    old = datetime.now() - timedelta(days=user_session.LOGIN_VALID_DAYS + 1)
+    path.write_text(json.dumps({"username": USERNAME, "last_login": old.isoformat()}))
+    assert not UserSession(login_file=str(path)).login_valid()
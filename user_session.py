@@ -0,0 +1,131 @@
+# 사용자 세션 (로그인 정보와 사용자 설정)
+# login_info.json과 global_setting 행을 한 번만 읽어서 메모리에 들고 있고,
+# 설정은 SETTINGS_TTL이 지나면 서버에서 다시 확인한다. 바꾼 값은 파일/Supabase에 바로 쓴다(write-through).
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import supabase_helper
+
+LOGIN_FILE = "login_info.json"  # 로그인 정보를 저장할 파일
+LOGIN_VALID_DAYS = 90  # 마지막 로그인 후 이 기간이 지나면 다시 로그인
+SETTINGS_TTL = 300  # global_setting 행을 서버에서 다시 확인하기까지의 시간(초)
+
+
+class UserSession:
+    """로그인한 사용자 이름과 global_setting 행을 보관하는 세션 (여러 스레드에서 호출 가능)"""
+
+    def __init__(self, login_file=LOGIN_FILE, ttl=SETTINGS_TTL):
+        self.login_file = login_file
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.login_loaded = False
+        self.username = None
+        self.last_login = None
+        self.login_error = False  # 로그인 정보 파일이 손상되었는지 여부
+        self.settings_row = None  # global_setting 행
+        self.settings_fetched_at = None  # 행을 서버에서 받은 시각 (time.monotonic 기준)
+
+    # 로그인 정보
+    def _load_login(self):
+        """login_info.json을 처음 필요할 때 한 번만 읽음 (lock 안에서 호출)"""
+        if self.login_loaded:
+            return
+        self.login_loaded = True
+        if not os.path.exists(self.login_file):
+            return
+        try:
+            with open(self.login_file, "r") as f:
+                login_data = json.load(f)
+            self.username = login_data.get("username", None)
+            self.last_login = datetime.fromisoformat(login_data["last_login"])
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError):
+            print("로그인 정보 파일이 손상되었거나 비어 있습니다.")
+            self.login_error = True
+            self.last_login = None
+
+    def get_username(self):
+        """로그인한 사용자 이름 (파일은 처음 한 번만 읽음)"""
+        with self.lock:
+            self._load_login()
+            return self.username
+
+    def login_valid(self):
+        """마지막 로그인이 LOGIN_VALID_DAYS 이내인지 여부"""
+        with self.lock:
+            self._load_login()
+            return self.last_login is not None and datetime.now() < self.last_login + timedelta(days=LOGIN_VALID_DAYS)
+
+    def remember_login(self, username):
+        """로그인 성공을 메모리와 파일에 함께 기록"""
+        login_data = {
+            "last_login": datetime.now().isoformat(),
+            "username": username  # 사용자 이름 저장
+        }
+        with self.lock:
+            with open(self.login_file, "w") as f:
+                json.dump(login_data, f)
+            if self.settings_row and self.settings_row.get('user_name') != username:
+                self.settings_row = None  # 다른 사용자의 설정은 버림
+                self.settings_fetched_at = None
+            self.login_loaded = True
+            self.login_error = False
+            self.username = username
+            self.last_login = datetime.fromisoformat(login_data["last_login"])
+
+    def verify_login(self, username, password, supabase_client):
+        """서버에서 사용자 행을 받아 비밀번호를 확인하고, 받은 행은 설정으로 그대로 보관 (왕복 1회)"""
+        try:
+            user_data = supabase_helper.get_user_setting(username, supabase_client)  # 로그인은 항상 서버에서 확인
+        except Exception as e:
+            print(f"로그인 중 오류 발생: {e}")
+            return False
+        if not user_data:
+            print("사용자 이름을 찾을 수 없습니다.")
+            return False
+        if user_data.get('password') != password:
+            return False
+        self._store_settings(user_data)
+        return True
+
+    # 사용자 설정
+    def _store_settings(self, row):
+        with self.lock:
+            self.settings_row = row
+            self.settings_fetched_at = time.monotonic()
+
+    def settings_fresh(self, max_age=None):
+        """보관 중인 설정 행이 max_age(기본 TTL)초 이내에 받은 것인지 여부"""
+        max_age = self.ttl if max_age is None else max_age
+        with self.lock:
+            return self.settings_fetched_at is not None and time.monotonic() - self.settings_fetched_at < max_age
+
+    def settings(self, supabase_client=None, max_age=None):
+        """global_setting 행 반환: 오래됐으면 서버에서 다시 받음 (supabase_client가 없으면 메모리 값만 사용)"""
+        if supabase_client is not None and not self.settings_fresh(max_age):
+            username = self.get_username()
+            try:
+                row = supabase_helper.get_user_setting(username, supabase_client)
+            except Exception as e:
+                print(f"글로벌 세팅값을 가져오는데 오류가 발생: {e}")
+                row = None
+            if row:
+                self._store_settings(row)
+            else:
+                print("사용자 정보에 해당하는 글로벌 세팅값을 찾을 수 없습니다.")
+        with self.lock:
+            return self.settings_row
+
+    def global_color(self, supabase_client=None, max_age=None):
+        """저장된 글로벌 색상 문자열 (없으면 None)"""
+        row = self.settings(supabase_client, max_age)
+        return (row.get('global_color') or None) if row else None
+
+    def save_global_color(self, color_value, supabase_client):
+        """글로벌 색상을 Supabase에 저장하고, 서버가 돌려준 행으로 메모리 값도 교체"""
+        row = supabase_helper.save_global_color(self.get_username(), color_value, supabase_client)
+        if row:
+            self._store_settings(row)
+        return bool(row)
@@ -0,0 +1,118 @@
+# 연간 일정 한눈에 보기 (히트맵)
+# 1년 365일을 날짜 칸 위젯 없이 하나의 위젯 canvas에 사각형으로 그린다.
+# 같은 색의 날짜를 모아 Color 하나 뒤에 사각형들을 이어 그리므로 색 전환이 색상 종류 수만큼만 일어나고,
+# 터치는 위젯 하나에서 좌표를 날짜로 바꿔 처리한다. 주(週)가 열, 요일(일~토)이 행이다.
+from datetime import date, timedelta
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Line, Rectangle
+from kivy.properties import NumericProperty
+from kivy.uix.widget import Widget
+
+import cell_text
+import color_codec
+import instrumentation
+
+CELL_GAP = 2  # 날짜 사각형 사이 간격
+MONTH_LABEL_HEIGHT = 24  # 위쪽 월 표시 줄 높이
+EMPTY_DAY_COLOR = (0.25, 0.25, 0.25, 1)  # 일정이 없는 날짜 색
+TODAY_BORDER_COLOR = (1, 1, 1, 1)
+
+
+def _sunday_index(day):
+    """일요일=0 ... 토요일=6 (달력 화면과 같은 요일 순서)"""
+    return (day.weekday() + 1) % 7
+
+
+class YearHeatmap(Widget):
+    """한 해의 날짜를 일정 유무/색상으로 칠한 격자 (탭하면 해당 날짜 일정 팝업)"""
+
+    year = NumericProperty(date.today().year)
+
+    def __init__(self, calendar_layout, **kwargs):
+        super().__init__(**kwargs)
+        self.calendar_layout = calendar_layout
+        self.redraw_trigger = Clock.create_trigger(self.redraw)  # 여러 변경을 한 프레임에 한 번만 다시 그림
+        self.origin = (0, 0)  # 격자 왼쪽 위 좌표
+        self.cell = 0  # 날짜 사각형 한 변 길이 (간격 포함)
+        self.bind(size=self.redraw_trigger, pos=self.redraw_trigger, year=self.redraw_trigger)
+
+    @property
+    def first_day(self):
+        return date(int(self.year), 1, 1)
+
+    def _week_count(self):
+        last = date(int(self.year), 12, 31)
+        return ((last - self.first_day).days + _sunday_index(self.first_day)) // 7 + 1
+
+    def _grid_position(self, day):
+        """날짜의 (열, 행)"""
+        offset = (day - self.first_day).days + _sunday_index(self.first_day)
+        return offset // 7, offset % 7
+
+    def _day_color(self, day_str, style):
+        """일정이 있으면 일정 색(없으면 글로벌 색), 없으면 빈 날짜 색"""
+        layout = self.calendar_layout
+        day_events = layout.event_index.events_for_day(day_str) or layout.recurrence.events_for_day(day_str)
+        if not day_events:
+            return EMPTY_DAY_COLOR
+        btn_color = day_events[0].get('btn_color')
+        decoded = color_codec.decode_color(btn_color) if btn_color else None
+        return tuple(decoded) if decoded else style.background
+
+    @instrumentation.timed('year_view.redraw')
+    def redraw(self, *args):
+        """1년치 사각형을 색상별로 묶어서 canvas에 다시 그림"""
+        self.canvas.clear()
+        weeks = self._week_count()
+        self.cell = max(min(self.width / weeks, (self.height - MONTH_LABEL_HEIGHT) / 7), 1)
+        left = self.x + (self.width - self.cell * weeks) / 2
+        self.origin = (left, self.top - MONTH_LABEL_HEIGHT)
+        size = (max(self.cell - CELL_GAP, 1),) * 2
+        style = color_codec.color_style(self.calendar_layout.selected_color)
+        today = date.today()
+
+        rects_by_color = {}
+        day, last = self.first_day, date(int(self.year), 12, 31)
+        while day <= last:
+            column, row = self._grid_position(day)
+            color = self._day_color(day.isoformat(), style)
+            rects_by_color.setdefault(color, []).append(
+                (left + column * self.cell, self.origin[1] - (row + 1) * self.cell))
+            day += timedelta(days=1)
+
+        with self.canvas:
+            for color, positions in rects_by_color.items():
+                Color(*color)
+                for pos in positions:
+                    Rectangle(pos=pos, size=size)
+            # 월 표시: 각 달 1일이 있는 열 위에 (텍스처는 cell_text 캐시를 재사용)
+            Color(1, 1, 1, 1)
+            for month in range(1, 13):
+                column, row = self._grid_position(date(int(self.year), month, 1))
+                texture = cell_text.text_texture(f"{month}월", self.cell * 4, MONTH_LABEL_HEIGHT, (1, 1, 1, 1))
+                Rectangle(texture=texture, size=texture.size,
+                          pos=(left + column * self.cell, self.top - texture.height))
+            if today.year == int(self.year):
+                column, row = self._grid_position(today)
+                Color(*TODAY_BORDER_COLOR)
+                Line(rectangle=(left + column * self.cell, self.origin[1] - (row + 1) * self.cell) + size, width=1.5)
+
+    def date_at(self, x, y):
+        """화면 좌표의 날짜 (격자 밖이거나 다른 해의 칸이면 None)"""
+        if self.cell <= 0:
+            return None
+        column = int((x - self.origin[0]) // self.cell)
+        row = int((self.origin[1] - y) // self.cell)
+        if column < 0 or not 0 <= row < 7:
+            return None
+        day = self.first_day + timedelta(days=column * 7 + row - _sunday_index(self.first_day))
+        return day if day.year == int(self.year) else None
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        day = self.date_at(*touch.pos)
+        if day is not None:
+            self.calendar_layout.show_event_popup(day.isoformat())
+        return True